@@ -1,8 +1,13 @@
 import jwt
+import os
 from datetime import datetime, timedelta
 import secrets
+from typing import Optional
+from fastapi import Header, HTTPException
 SECRET_KEY = secrets.token_hex(32)
 ALGORITHM = "HS256"
+# 관리자 API(/admin/...) 용 토큰. 설정하지 않으면 관리자 API는 모두 거부
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
 
 def create_jwt_token(sub: str, token_type: str, expires_delta: int):
     expire = datetime.utcnow() + timedelta(days=expires_delta)
@@ -27,3 +32,13 @@ def verify_refresh_token(token: str):
     if payload.get("type") != "refresh":
         raise ValueError("Invalid token type.")
     return payload
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    return bool(ADMIN_TOKEN and token and secrets.compare_digest(token.encode(), ADMIN_TOKEN.encode()))
+
+
+# 관리자 API 의존성: X-Admin-Token 헤더가 ADMIN_TOKEN 과 같아야 함
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
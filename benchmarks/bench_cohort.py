@@ -0,0 +1,57 @@
+"""
+코호트 일괄 졸업요건(학점) 검사 처리량 (학생/초)
+
+  - per-student : 학생마다 따로 summarize (학생별로 f_result 를 부르는 것과 같은 구조)
+  - batch       : views.cohort.audit_cohort (코호트 전체 groupby 한 번, --workers 개 프로세스로 분할)
+
+DB 조회 시간은 빼고 성적 DataFrame 을 받은 뒤부터 JSON lines 를 다 만들 때까지를 잽니다.
+
+    python -m benchmarks.bench_cohort --students 2000 --workers 1,2,4
+"""
+import argparse
+import os
+import time
+
+from benchmarks.synthetic import SYNTHETIC_STANDARD, make_cohort_frame
+from views.cohort import audit_cohort, iter_jsonl, split_students, summarize
+
+
+def per_student(frame, standard, changed):
+    lines = 0
+    for chunk in split_students(frame, 1):
+        lines += sum(1 for _ in iter_jsonl(summarize(chunk, standard, changed)))
+    return lines
+
+
+def batch(frame, standard, changed, workers, chunk_size):
+    return sum(1 for _ in iter_jsonl(audit_cohort(frame, standard, changed, workers=workers, chunk_size=chunk_size)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=50, help="학생당 성적 행 수")
+    parser.add_argument("--workers", default="1,2,4", help="쉼표로 구분한 프로세스 수 목록")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--per-student-sample", type=int, default=200, help="per-student 는 이 수만큼만 측정")
+    args = parser.parse_args()
+
+    frame = make_cohort_frame(args.students, args.rows)
+    changed = {}
+    print(f"cpus={os.cpu_count()}  students={args.students}  rows/student={args.rows}")
+
+    sample = frame[frame["student_id"].isin(frame["student_id"].unique()[:args.per_student_sample])]
+    started = time.perf_counter()
+    count = per_student(sample, SYNTHETIC_STANDARD, changed)
+    elapsed = time.perf_counter() - started
+    print(f"{'per-student':>14}: {count / elapsed:10.0f} students/s  ({count} students)")
+
+    for workers in [int(value) for value in args.workers.split(",")]:
+        started = time.perf_counter()
+        count = batch(frame, SYNTHETIC_STANDARD, changed, workers, args.chunk_size)
+        elapsed = time.perf_counter() - started
+        print(f"{f'batch w={workers}':>14}: {count / elapsed:10.0f} students/s  ({count} students, {elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
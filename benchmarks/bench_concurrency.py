@@ -0,0 +1,69 @@
+"""
+느린 쿼리 N개를 동시에 보냈을 때의 처리량 비교
+
+  - blocking : async 핸들러 안에서 커서를 바로 호출 (기존 방식)
+  - run_db   : database.executor.run_db 로 DB 전용 스레드 풀에 넘김
+
+기본은 time.sleep 으로 느린 쿼리를 흉내내고, --mysql 을 주면 .env 의 DB에 SELECT SLEEP(...) 을 보냅니다.
+
+    python -m benchmarks.bench_concurrency --concurrency 1 10 50 --delay 0.05
+"""
+import argparse
+import asyncio
+import time
+
+from database.connect import pool
+from database.executor import DB_WORKERS, run_db
+
+
+def fake_slow_query(delay):
+    time.sleep(delay)
+    return [{"ok": 1}]
+
+
+def mysql_slow_query(delay):
+    connection = pool.acquire()
+    try:
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT SLEEP(%s)", (delay,))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+    finally:
+        pool.release(connection)
+
+
+async def blocking_handler(query, delay):
+    return query(delay)
+
+
+async def run_db_handler(query, delay):
+    return await run_db(query, delay)
+
+
+async def measure(handler, query, concurrency, delay):
+    started = time.perf_counter()
+    await asyncio.gather(*(handler(query, delay) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return elapsed, concurrency / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--delay", type=float, default=0.05, help="쿼리 1개가 걸리는 시간(초)")
+    parser.add_argument("--mysql", action="store_true", help="실제 DB에 SELECT SLEEP 실행")
+    args = parser.parse_args()
+
+    query = mysql_slow_query if args.mysql else fake_slow_query
+    print(f"delay={args.delay}s  db_workers={DB_WORKERS}  backend={'mysql' if args.mysql else 'sleep'}")
+    print(f"{'N':>5} {'blocking req/s':>16} {'run_db req/s':>14} {'speedup':>9}")
+    for n in args.concurrency:
+        _, blocking_rps = asyncio.run(measure(blocking_handler, query, n, args.delay))
+        _, offloop_rps = asyncio.run(measure(run_db_handler, query, n, args.delay))
+        print(f"{n:>5} {blocking_rps:>16.1f} {offloop_rps:>14.1f} {offloop_rps / blocking_rps:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+f_en_result 의 기초설계~종합설계 구간 추출 비교
+
+  - legacy : 한 행 지울 때마다 reset_index 후 처음부터 다시 도는 while/for 루프 (기존 코드 그대로)
+  - mask   : views.grade_frame.design_window (조건 마스크 한 번)
+
+시간만 잽니다. 두 결과가 같은지는 tests/test_grade_frame.py 에서 확인합니다 (legacy_design_window, make_case 공유).
+
+    python -m benchmarks.bench_design_window --rows 60,200
+"""
+import argparse
+import random
+import statistics
+import time
+
+import pandas as pd
+
+from views.grade_frame import design_window
+
+BUILD_START = "9001"
+BUILD_END = "9002"
+_SEMESTERS = ["1학기", "여름학기", "2학기", "겨울학기"]
+
+
+def legacy_design_window(data, build_start, build_end):
+    df_e = data[data['학수번호'] == build_start]
+    if not df_e.empty:
+        num_df_e = df_e['년도'].sum()
+    df_e2 = data[data['학수번호'] == build_end]
+    num_df_e2 = df_e2['년도'].sum()
+
+    data2 = data
+    n = data2.shape[0]
+    flag = 0
+    while (True):
+        for i in range(n):
+            if i == n - 1:
+                flag = 1
+            if not df_e.empty:
+                if data2['년도'][i] < num_df_e:
+                    data2 = data2.drop(data2.index[i])
+                    n -= 1
+                    data2.reset_index(inplace=True, drop=True)
+                    break
+                elif data2['년도'][i] == num_df_e and data2['학기'][i] == "1학기":
+                    data2 = data2.drop(data2.index[i])
+                    n -= 1
+                    data2.reset_index(inplace=True, drop=True)
+                    break
+            if not df_e2.empty:
+                if data2['년도'][i] > num_df_e2:
+                    data2 = data2.drop(data2.index[i])
+                    n -= 1
+                    data2.reset_index(inplace=True, drop=True)
+                    break
+        if flag == 1:
+            break
+    return data2
+
+
+def make_case(rng, rows):
+    """
+    user_grade 처럼 년도는 문자열. 설계 과목은 없음/1번/재수강 중 하나
+    """
+    records = []
+    for i in range(rows):
+        records.append({
+            "년도": str(2016 + rng.randrange(8)),
+            "학기": rng.choice(_SEMESTERS),
+            "학수번호": str(1000 + rng.randrange(200)),
+            "학점": float(rng.choice([1, 2, 3])),
+        })
+    for code in (BUILD_START, BUILD_END):
+        for _ in range(rng.choice([0, 1, 1, 1, 2])):
+            if records:
+                rng.choice(records)["학수번호"] = code
+    rng.shuffle(records)
+    return pd.DataFrame(records, columns=["년도", "학기", "학수번호", "학점"])
+
+
+def measure(function, data, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(data, BUILD_START, BUILD_END)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="60,200", help="시간 측정할 성적표 행 수 목록")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    for rows in [int(value) for value in args.rows.split(",")]:
+        data = make_case(rng, rows)
+        # 구간 밖 행이 많을수록 기존 루프가 느려지므로 설계 과목을 가운데 년도에 둠
+        data.loc[0, ["학수번호", "년도", "학기"]] = [BUILD_START, "2019", "2학기"]
+        data.loc[1, ["학수번호", "년도", "학기"]] = [BUILD_END, "2021", "2학기"]
+        legacy = measure(legacy_design_window, data, args.repeat)
+        mask = measure(design_window, data, args.repeat)
+        kept = len(design_window(data, BUILD_START, BUILD_END))
+        print(f"rows={rows:>4} kept={kept:>4}  legacy: {legacy * 1000:8.2f} ms  mask: {mask * 1000:6.2f} ms  "
+              f"speedup={legacy / mask:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
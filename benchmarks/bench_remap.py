@@ -0,0 +1,82 @@
+"""
+f_result 의 이수구분 변경(ChangedClassification) 반영 구간 비교 (합성 성적표 60행)
+
+  - per-row query : 행마다 ChangedClassification 조회 1번 + data.at 수정 (기존 방식, --rtt 초씩 대기)
+  - per-row dict  : 조회는 메모리 dict 로 바꿨지만 iterrows 는 그대로
+  - vectorized    : views.grade_frame.remap_classification (map + fillna 한 번)
+
+결과가 같은지는 tests/test_grade_frame.py 에서 확인합니다.
+
+    python -m benchmarks.bench_remap --rows 60 --rtt 0.0005
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.synthetic import make_grade_frame
+from views.grade_frame import remap_classification
+
+_CLASSIFICATIONS = ["전필", "전선", "교필", "교선1", "균필"]
+
+
+def make_changed(data, ratio, seed=0):
+    rng = random.Random(seed)
+    return {s_num: rng.choice(_CLASSIFICATIONS) for s_num in data["학수번호"] if rng.random() < ratio}
+
+
+def per_row_query(data, changed, rtt):
+    for i, row in data.iterrows():
+        time.sleep(rtt)  # ChangedClassification.objects.filter(...) 왕복
+        changed_classification = changed.get(row["학수번호"])
+        if changed_classification is not None and row["이수구분"] != changed_classification:
+            data.at[i, "이수구분"] = changed_classification
+    return data
+
+
+def per_row_dict(data, changed, rtt):
+    for i, row in data.iterrows():
+        changed_classification = changed.get(row["학수번호"])
+        if changed_classification is not None and row["이수구분"] != changed_classification:
+            data.at[i, "이수구분"] = changed_classification
+    return data
+
+
+def vectorized(data, changed, rtt):
+    data["이수구분"] = remap_classification(data, changed)
+    return data
+
+
+def run(strategy, frame, changed, rtt, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        data = frame.copy()
+        started = time.perf_counter()
+        result = strategy(data, changed, rtt)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=60)
+    parser.add_argument("--ratio", type=float, default=0.2, help="이수구분이 바뀐 과목 비율")
+    parser.add_argument("--rtt", type=float, default=0.0005, help="기존 방식의 조회 1회 지연(초)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    frame = make_grade_frame(args.rows)
+    changed = make_changed(frame, args.ratio)
+
+    print(f"rows={args.rows}  changed={len(changed)}  rtt={args.rtt * 1000:.2f}ms")
+    baseline = None
+    for name, strategy in [("per-row query", per_row_query), ("per-row dict", per_row_dict), ("vectorized", vectorized)]:
+        elapsed, _ = run(strategy, frame, changed, args.rtt, args.repeat)
+        if baseline is None:
+            baseline = elapsed
+        print(f"{name:>13}: {elapsed * 1000:8.3f} ms/audit  speedup={baseline / elapsed:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
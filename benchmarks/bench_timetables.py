@@ -0,0 +1,57 @@
+"""
+/generate-timetable 탐색 처리량을 워커 프로세스 수별로 측정 (실제로 돌려준 추천 시간표/초)
+
+  - workers=1 : 요청 스레드에서 recommend_timetables 그대로 실행
+  - workers=N : functions.parallel.TimetableWorkers 로 탐색 공간을 N 조각으로 나눠 프로세스마다 탐색
+
+워커 시작과 강의 목록 파싱은 측정 전에 끝내 두므로 요청 한 번의 탐색+병합 시간만 잽니다.
+
+    python -m benchmarks.bench_timetables --workers 1,2,4 --count 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from functions.catalog import COURSE_FILE
+from functions.parallel import TimetableWorkers
+
+
+def run(workers, args):
+    runner = TimetableWorkers(args.file, workers=workers, min_count=1)
+    runner.start()
+    try:
+        timings = []
+        found = 0
+        for i in range(args.repeat):
+            started = time.perf_counter()
+            result = asyncio.run(runner.recommend(args.count, seed=args.seed + i))
+            timings.append(time.perf_counter() - started)
+            found = len(result)
+        return statistics.median(timings), found
+    finally:
+        runner.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file", default=COURSE_FILE)
+    parser.add_argument("--workers", default="1,2,4", help="쉼표로 구분한 워커 수 목록")
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"cpus={os.cpu_count()}  count={args.count}")
+    baseline = None
+    for workers in [int(value) for value in args.workers.split(",")]:
+        elapsed, found = run(workers, args)
+        baseline = baseline or elapsed
+        print(f"workers={workers:>2}: {elapsed * 1000:8.1f} ms  "
+              f"{found / elapsed:10.0f} timetables/s  "
+              f"returned={found}  speedup={baseline / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+/upload-excel 의 DB 저장 구간 비교 (합성 성적표 200행)
+
+  - per-row   : 행마다 cursor.execute (기존 방식, 행 수만큼 왕복)
+  - batched   : database.course_data.insert_course_data (UPLOAD_BATCH_SIZE 단위 executemany)
+
+기본은 왕복 1번마다 --rtt 초를 쉬는 가짜 커서를 쓰고, --mysql 을 주면 .env 의 DB에 실제로 넣은 뒤 롤백합니다.
+
+    python -m benchmarks.bench_upload --rows 200 --rtt 0.001
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.synthetic import make_transcript_rows
+from database.course_data import INSERT_COURSE_DATA_SQL, course_data_params, insert_course_data
+
+
+class RoundTripCursor:
+    """
+    execute/executemany 한 번을 네트워크 왕복 한 번으로 치는 가짜 커서
+    """
+
+    def __init__(self, rtt):
+        self.rtt = rtt
+        self.round_trips = 0
+
+    def execute(self, sql, params=None):
+        self.round_trips += 1
+        time.sleep(self.rtt)
+
+    def executemany(self, sql, seq_params):
+        self.round_trips += 1
+        time.sleep(self.rtt)
+
+
+def per_row_insert(cursor, student_id, rows):
+    for row in rows:
+        cursor.execute(INSERT_COURSE_DATA_SQL, course_data_params(student_id, row))
+    return len(rows)
+
+
+def run(strategy, make_cursor, rows, repeat):
+    timings = []
+    round_trips = 0
+    for _ in range(repeat):
+        cursor, finish = make_cursor()
+        started = time.perf_counter()
+        strategy(cursor, "00000000", rows)
+        timings.append(time.perf_counter() - started)
+        round_trips = finish(cursor)
+    return statistics.median(timings), round_trips
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--rtt", type=float, default=0.001, help="가짜 커서의 왕복 1회 지연(초)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mysql", action="store_true", help="실제 DB에 넣고 롤백")
+    args = parser.parse_args()
+
+    rows = make_transcript_rows(args.rows)
+
+    if args.mysql:
+        from database.connect import pool
+
+        def make_cursor():
+            connection = pool.acquire()
+            return connection.cursor(), lambda cursor: finish_mysql(connection, cursor)
+
+        def finish_mysql(connection, cursor):
+            cursor.close()
+            connection.rollback()
+            pool.release(connection)
+            return "-"
+    else:
+        def make_cursor():
+            return RoundTripCursor(args.rtt), lambda cursor: cursor.round_trips
+
+    print(f"rows={args.rows}  backend={'mysql' if args.mysql else f'fake rtt={args.rtt * 1000:.1f}ms'}")
+    old_time, old_trips = run(per_row_insert, make_cursor, rows, args.repeat)
+    new_time, new_trips = run(insert_course_data, make_cursor, rows, args.repeat)
+    print(f"{'per-row':>8}: {old_time * 1000:8.2f} ms  round trips={old_trips}")
+    print(f"{'batched':>8}: {new_time * 1000:8.2f} ms  round trips={new_trips}")
+    print(f"speedup: {old_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
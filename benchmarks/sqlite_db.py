@@ -0,0 +1,162 @@
+"""
+벤치마크용 SQLite 대역: database.connect 의 풀이 MySQL 대신 메모리 SQLite 연결을 빌려주게 합니다.
+
+앱 코드가 쓰는 mysql.connector 기능(cursor(dictionary=True), %s 파라미터, executemany, column_names,
+lastrowid, in_transaction, start_transaction, ping, GET_LOCK/RELEASE_LOCK)만 흉내 내므로 라우트/모듈 코드는 그대로 둔 채 오프라인으로 돌릴 수 있습니다.
+"""
+import sqlite3
+import threading
+
+from database import connect
+
+# 벤치마크 시나리오와 앱 시작(lifespan)이 건드리는 테이블만
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS course_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT, year INTEGER, semester TEXT, course_code TEXT, course_name TEXT,
+    course_type TEXT, credit REAL, grade REAL, choice TEXT, grade_detail TEXT
+);
+CREATE INDEX IF NOT EXISTS course_data_user ON course_data (user_id);
+CREATE TABLE IF NOT EXISTS Course (
+    course_id INTEGER PRIMARY KEY,
+    course_name TEXT, professor TEXT, avg_rating REAL,
+    rating_sum INTEGER NOT NULL DEFAULT 0, rating_count INTEGER NOT NULL DEFAULT 0,
+    assignment_sum INTEGER NOT NULL DEFAULT 0, group_work_sum INTEGER NOT NULL DEFAULT 0,
+    grading_sum INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS Course_Review (
+    review_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    course_id INTEGER, user_id TEXT, comment TEXT,
+    rating INTEGER, assignment INTEGER, group_work INTEGER, grading INTEGER
+);
+CREATE TABLE IF NOT EXISTS Questions (
+    question_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT, firstQ INTEGER, secondQ INTEGER, thirdQ INTEGER, fourthQ INTEGER, fifthQ INTEGER,
+    sixthQ INTEGER, seventhQ INTEGER, eighthQ INTEGER, ninthQ INTEGER, tenthQ INTEGER
+);
+-- 앱 시작 시 reference_data 가 읽는 기준 테이블 (비어 있어도 됨)
+CREATE TABLE IF NOT EXISTS all_lecture (subject_num TEXT PRIMARY KEY, subject_name TEXT, classification TEXT,
+    selection TEXT, grade REAL);
+CREATE TABLE IF NOT EXISTS new_lecture (subject_num TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS subject_group (subject_num TEXT PRIMARY KEY, group_num TEXT);
+CREATE TABLE IF NOT EXISTS changed_classification (`index` INTEGER PRIMARY KEY, year INTEGER, subject_num TEXT,
+    classification TEXT);
+CREATE TABLE IF NOT EXISTS standard (`index` INTEGER PRIMARY KEY, user_dep TEXT, user_year INTEGER);
+CREATE TABLE IF NOT EXISTS major (`index` INTEGER PRIMARY KEY, major TEXT);
+"""
+
+
+def _translate(sql):
+    # mysql.connector 의 %s 자리표시자 -> sqlite3 의 ?
+    return sql.replace("%s", "?")
+
+
+class SQLiteCursor:
+    def __init__(self, connection, dictionary=False):
+        self._cursor = connection.cursor()
+        self.dictionary = dictionary
+
+    @property
+    def column_names(self):
+        return tuple(column[0] for column in self._cursor.description or ())
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(_translate(sql), tuple(params or ()))
+
+    def executemany(self, sql, seq_params):
+        self._cursor.executemany(_translate(sql), [tuple(params) for params in seq_params])
+
+    def _row(self, row):
+        if row is None or not self.dictionary:
+            return row
+        return dict(zip(self.column_names, row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+
+# MySQL 이름 잠금 흉내: 이름 -> 잡고 있는 연결 (프로세스 안 모든 대역 연결이 공유, 기다리지 않음)
+_named_locks = {}
+_named_locks_lock = threading.Lock()
+
+
+class SQLiteConnection:
+    def __init__(self, uri):
+        self._connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._connection.create_function("GET_LOCK", 2, self._get_lock)
+        self._connection.create_function("RELEASE_LOCK", 1, self._release_lock)
+
+    def _get_lock(self, name, timeout):
+        with _named_locks_lock:
+            if _named_locks.setdefault(name, self) is not self:
+                return 0
+            return 1
+
+    def _release_lock(self, name):
+        with _named_locks_lock:
+            owner = _named_locks.get(name)
+            if owner is None:
+                return None
+            if owner is not self:
+                return 0
+            del _named_locks[name]
+            return 1
+
+    @property
+    def in_transaction(self):
+        return self._connection.in_transaction
+
+    def cursor(self, dictionary=False, **kwargs):
+        return SQLiteCursor(self._connection, dictionary=dictionary)
+
+    def start_transaction(self):
+        self._connection.execute("BEGIN")
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def ping(self, **kwargs):
+        pass
+
+    def close(self):
+        # MySQL 처럼 세션이 끝나면 잡고 있던 이름 잠금도 풀림
+        with _named_locks_lock:
+            for name in [name for name, owner in _named_locks.items() if owner is self]:
+                del _named_locks[name]
+        self._connection.close()
+
+
+_counter = 0
+_counter_lock = threading.Lock()
+
+
+def install(pool_size=connect.DB_POOL_SIZE):
+    """
+    새 메모리 DB(연결끼리 공유)를 만들고 database.connect.pool 을 그 DB를 쓰는 풀로 교체.
+    DB가 사라지지 않도록 잡아 두는 연결을 반환합니다.
+    """
+    global _counter
+    with _counter_lock:
+        _counter += 1
+        uri = f"file:bench{_counter}?mode=memory&cache=shared"
+    keeper = SQLiteConnection(uri)
+    keeper._connection.executescript(SCHEMA)
+    connect.pool = connect.ConnectionPool(factory=lambda: SQLiteConnection(uri), size=pool_size)
+    return keeper
@@ -0,0 +1,279 @@
+"""
+MySQL 없이 돌아가는 핫패스 벤치마크 모음 (합성 데이터 + 메모리 SQLite 대역)
+
+시나리오마다 p50/p95 지연(ms)과 초당 처리 수를 출력하고, 결과를 JSON 으로 저장해 다음 실행과 비교합니다.
+
+    python -m benchmarks.suite run --save benchmarks/baseline.json
+    python -m benchmarks.suite run --only upload_roundtrip,make_recommend_list
+    python -m benchmarks.suite compare benchmarks/baseline.json            # 지금 다시 돌려서 비교
+    python -m benchmarks.suite compare benchmarks/baseline.json new.json   # 저장된 두 결과 비교
+
+compare 는 p50 이 --threshold 비율 이상 느려진 시나리오가 있으면 종료 코드 1 을 돌려줍니다.
+기준 결과는 기계마다 다르므로 저장소에 넣지 않습니다. compare 전에 run --save 로 먼저 만들어 두세요.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from io import BytesIO
+from types import SimpleNamespace
+
+from benchmarks import sqlite_db
+from benchmarks.synthetic import (
+    make_lecture_reference, make_review_rows, make_transcript_rows, write_course_file, write_transcript_xlsx,
+)
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    """
+    setup(ctx) -> 반복해서 잴 함수. ctx.stack 에 등록한 정리 작업은 시나리오가 끝나면 실행됩니다.
+    """
+    def register(setup):
+        SCENARIOS[name] = setup
+        return setup
+    return register
+
+
+def _upload(data, filename="transcript.xlsx"):
+    # UploadFile 대신: .file 과 .filename 만 있으면 됨
+    return SimpleNamespace(file=BytesIO(data), filename=filename)
+
+
+def _transcript_bytes(rows):
+    buffer = BytesIO()
+    write_transcript_xlsx(rows, buffer)
+    return buffer.getvalue()
+
+
+@scenario("generate_timetables")
+def setup_generate_timetables(ctx):
+    from functions.test import generate_timetables
+
+    counter = iter(range(10 ** 9))
+    generate_timetables(ctx.course_file, 3, seed=0)  # 강의 목록 파싱은 측정에서 제외
+    return lambda: generate_timetables(ctx.course_file, 3, seed=next(counter))
+
+
+@scenario("recommend_timetables")
+def setup_recommend_timetables(ctx):
+    from database.connect import pooled_connection
+    from functions.catalog import get_catalog
+    from functions.scoring import recommend_timetables, review_stats_from_rows
+
+    names = [course["course_name"] for course in get_catalog(ctx.course_file).courses]
+    courses, _ = make_review_rows(sorted(set(names)))
+    with pooled_connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        columns = list(courses[0])
+        cursor.execute("DELETE FROM Course")
+        cursor.executemany(
+            f"INSERT INTO Course ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+            [[course[column] for column in columns] for course in courses],
+        )
+        connection.commit()
+        cursor.execute("SELECT * FROM Course")
+        review_stats = review_stats_from_rows(cursor.fetchall())
+        cursor.close()
+
+    answers = [5, 1, 4, 2, 3, 5, 4, 1, 2, 5]
+    counter = iter(range(10 ** 9))
+    return lambda: recommend_timetables(ctx.course_file, 3, answers, review_stats, seed=next(counter))
+
+
+@scenario("iter_transcript_rows")
+def setup_iter_transcript_rows(ctx):
+    from views.get_csv import iter_transcript_rows
+
+    data = ctx.transcript
+    return lambda: sum(1 for _ in iter_transcript_rows(_upload(data)))
+
+
+@scenario("make_recommend_list")
+def setup_make_recommend_list(ctx):
+    from database.reference_data import ReferenceData
+    from views.calculate import make_dic, make_recommend_list
+
+    subject_nums, subject_groups, new_lectures = make_lecture_reference()
+    lectures = {s_num: {"subject_num": s_num, "classification": "전필", "selection": None} for s_num in subject_nums}
+    index = ReferenceData(0, lectures, new_lectures, subject_groups, {}, {}, {})
+    rng = random.Random(0)
+    cases = [(rng.sample(subject_nums, 60), rng.sample(subject_nums, 12)) for _ in range(50)]
+    counter = iter(range(10 ** 9))
+
+    def run():
+        taken, standard = cases[next(counter) % len(cases)]
+        return make_recommend_list(make_dic(list(taken), index), make_dic(list(standard), index), index)
+    return run
+
+
+@scenario("upload_roundtrip")
+def setup_upload_roundtrip(ctx):
+    from fastapi.testclient import TestClient
+    import main
+
+    client = ctx.stack.enter_context(TestClient(main.app))
+    data = ctx.transcript
+    counter = iter(range(10 ** 9))
+
+    def run():
+        student_id = f"9{next(counter):07d}"
+        response = client.post(
+            "/upload-excel", params={"student_id": student_id},
+            files={"file": ("transcript.xlsx", data, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")},
+        )
+        assert response.status_code == 200, response.text
+        response = client.get("/get-course-data", params={"student_id": student_id})
+        assert response.status_code == 200, response.text
+    return run
+
+
+def percentile(sorted_values, p):
+    # nearest-rank
+    index = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def measure(op, min_seconds, min_iterations, warmup):
+    for _ in range(warmup):
+        op()
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < min_iterations or time.perf_counter() - started < min_seconds:
+        t0 = time.perf_counter()
+        op()
+        timings.append(time.perf_counter() - t0)
+    total = time.perf_counter() - started
+    timings.sort()
+    return {
+        "iterations": len(timings),
+        "p50_ms": round(percentile(timings, 50) * 1000, 4),
+        "p95_ms": round(percentile(timings, 95) * 1000, 4),
+        "ops_per_sec": round(len(timings) / total, 2),
+    }
+
+
+def run_suite(names, min_seconds, min_iterations, warmup, transcript_rows):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        shared = SimpleNamespace(
+            course_file=write_course_file(os.path.join(workdir, "course.txt")),
+            transcript=_transcript_bytes(make_transcript_rows(transcript_rows)),
+        )
+        for name in names:
+            keeper = sqlite_db.install()
+            with contextlib.ExitStack() as stack:
+                stack.callback(keeper.close)
+                ctx = SimpleNamespace(stack=stack, **vars(shared))
+                try:
+                    op = SCENARIOS[name](ctx)
+                except ModuleNotFoundError as e:
+                    # 선택 의존성(포털 로그인 모듈 등)이 없는 환경
+                    print(f"{name:>22}: skipped ({e})")
+                    continue
+                results[name] = measure(op, min_seconds, min_iterations, warmup)
+            print_result(name, results[name])
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "transcript_rows": transcript_rows,
+        },
+        "scenarios": results,
+    }
+
+
+def print_result(name, result):
+    print(f"{name:>22}: p50 {result['p50_ms']:9.3f} ms  p95 {result['p95_ms']:9.3f} ms  "
+          f"{result['ops_per_sec']:10.1f} ops/s  (n={result['iterations']})")
+
+
+def compare(baseline, current, threshold):
+    """
+    시나리오별 변화율을 출력하고 p50 이 threshold 이상 느려진 시나리오 이름 목록을 반환
+    """
+    if baseline["meta"].get("platform") != current["meta"].get("platform") or \
+            baseline["meta"].get("cpus") != current["meta"].get("cpus"):
+        print("note: baseline was recorded on a different machine "
+              f"({baseline['meta'].get('platform')}, {baseline['meta'].get('cpus')} cpus)")
+    regressions = []
+    print(f"{'scenario':>22}  {'p50 base':>10} {'p50 now':>10} {'change':>8}  {'p95 change':>10}  {'ops/s change':>12}")
+    for name, now in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            print(f"{name:>22}  (no baseline)")
+            continue
+        p50 = now["p50_ms"] / base["p50_ms"] - 1
+        p95 = now["p95_ms"] / base["p95_ms"] - 1
+        ops = now["ops_per_sec"] / base["ops_per_sec"] - 1
+        flag = "  REGRESSION" if p50 > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:>22}  {base['p50_ms']:10.3f} {now['p50_ms']:10.3f} {p50:+8.1%}  {p95:+10.1%}  {ops:+12.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_run_options(p):
+        p.add_argument("--only", help=f"쉼표로 구분한 시나리오 ({', '.join(SCENARIOS)})")
+        p.add_argument("--seconds", type=float, default=1.0, help="시나리오별 최소 측정 시간")
+        p.add_argument("--iterations", type=int, default=20, help="시나리오별 최소 반복 수")
+        p.add_argument("--warmup", type=int, default=3)
+        p.add_argument("--transcript-rows", type=int, default=60)
+
+    run = sub.add_parser("run", help="벤치마크 실행")
+    add_run_options(run)
+    run.add_argument("--save", help="결과 JSON 경로")
+
+    cmp = sub.add_parser("compare", help="저장된 결과와 비교")
+    cmp.add_argument("baseline", help="run --save 로 저장한 기준 결과 JSON")
+    cmp.add_argument("current", nargs="?", help="없으면 지금 다시 실행")
+    cmp.add_argument("--threshold", type=float, default=0.15, help="p50 이 이 비율 이상 느려지면 회귀")
+    add_run_options(cmp)
+
+    args = parser.parse_args()
+    names = args.only.split(",") if args.only else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+    if args.command == "compare":
+        # 벤치마크를 다 돌린 뒤에 실패하지 않도록 미리 확인
+        for path in (args.baseline, args.current):
+            if path is not None and not os.path.exists(path):
+                parser.error(f"{path} not found; record one first with "
+                             f"'python -m benchmarks.suite run --save {path}'")
+
+    if args.command == "run" or args.current is None:
+        result = run_suite(names, args.seconds, args.iterations, args.warmup, args.transcript_rows)
+    else:
+        with open(args.current, encoding="utf-8") as file:
+            result = json.load(file)
+
+    if args.command == "run":
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as file:
+                json.dump(result, file, ensure_ascii=False, indent=2)
+            print(f"saved {args.save}")
+        return
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    regressions = compare(baseline, result, args.threshold)
+    if regressions:
+        print(f"regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
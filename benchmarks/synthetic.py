@@ -0,0 +1,173 @@
+"""
+벤치마크용 결정적(seed 고정) 합성 데이터
+"""
+import random
+
+# 성적표 엑셀의 13개 열 (views/get_csv.py 와 같은 순서)
+TRANSCRIPT_COLUMNS = [
+    "학기순번", "년도", "학기", "과목코드", "과목명", "이수구분", "비고1",
+    "비고2", "학점", "성적유형", "성적등급", "평점", "학과코드",
+]
+
+_CLASSIFICATIONS = ["전필", "전선", "교필", "교선1", "균필", "기필", "일선"]
+_GRADES = [("A+", 4.5), ("A0", 4.0), ("B+", 3.5), ("B0", 3.0), ("C+", 2.5), ("P", 0)]
+
+
+def make_transcript_rows(n, seed=0, first_year=2019):
+    """
+    n개의 성적표 행(dict). 학기당 7과목씩 연도/학기가 증가합니다.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        term = i // 7
+        grade, point = rng.choice(_GRADES)
+        rows.append({
+            "학기순번": term + 1,
+            "년도": first_year + term // 2,
+            "학기": "1학기" if term % 2 == 0 else "2학기",
+            "과목코드": str(1000 + rng.randrange(9000)),
+            "과목명": f"합성과목{i:03d}",
+            "이수구분": rng.choice(_CLASSIFICATIONS),
+            "비고1": "",
+            "비고2": rng.choice(["", "재수강"]),
+            "학점": float(rng.choice([1, 2, 3, 3, 3])),
+            "성적유형": "GRADE" if point else "P/F",
+            "성적등급": grade,
+            "평점": point,
+            "학과코드": "CSE",
+        })
+    return rows
+
+
+def write_transcript_xlsx(rows, target):
+    """
+    학사시스템에서 내려받은 것과 같은 배치의 xlsx 를 target(경로 또는 BytesIO)에 씁니다.
+    1행 제목 + 3행 머리말(학생정보, 빈 줄, 열 이름) 뒤에 성적 행이 옵니다.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["기이수성적"] + [None] * (len(TRANSCRIPT_COLUMNS) - 1))
+    sheet.append(["학번", "00000000", "이름", "홍길동"] + [None] * (len(TRANSCRIPT_COLUMNS) - 4))
+    sheet.append([None] * len(TRANSCRIPT_COLUMNS))
+    sheet.append(TRANSCRIPT_COLUMNS)
+    for row in rows:
+        sheet.append([row[column] for column in TRANSCRIPT_COLUMNS])
+    workbook.save(target)
+
+
+def make_grade_frame(n, seed=0, first_year=2019):
+    """
+    졸업요건 검사가 user_grade 에서 만드는 것과 같은 열 이름의 DataFrame
+    (학수번호, 교과목명, 이수구분, 선택영역, 학점, 년도, 학기)
+    """
+    import pandas as pd
+
+    rows = make_transcript_rows(n, seed=seed, first_year=first_year)
+    return pd.DataFrame({
+        "학수번호": [row["과목코드"] for row in rows],
+        "교과목명": [row["과목명"] for row in rows],
+        "이수구분": [row["이수구분"] for row in rows],
+        "선택영역": ["" for _ in rows],
+        "학점": [row["학점"] for row in rows],
+        "년도": [row["년도"] for row in rows],
+        "학기": [row["학기"] for row in rows],
+    })
+
+
+def make_cohort_frame(students, rows_per_student=50, seed=0):
+    """
+    views.cohort.fetch_cohort 와 같은 열의 코호트 DataFrame. 학생 10명 중 1명은 복수전공
+    """
+    import pandas as pd
+
+    records = []
+    for s in range(students):
+        student_id = f"20{s:06d}"
+        status = "복수전공" if s % 10 == 0 else "해당없음"
+        for row in make_transcript_rows(rows_per_student, seed=seed * 100003 + s):
+            records.append((student_id, f"학생{s}", status, row["과목코드"], row["이수구분"], row["학점"]))
+    return pd.DataFrame(records, columns=["student_id", "name", "major_status", "학수번호", "이수구분", "학점"])
+
+
+# 벤치마크용 Standard 행 (views.cohort 가 쓰는 컬럼만)
+SYNTHETIC_STANDARD = {
+    "major_essential": 18, "major_selection": 45, "core_selection": 12,
+    "la_balance": 6, "sum_score": 130,
+}
+
+
+# txt/course.txt 와 같은 학과 구성 (solve_timetables 의 기본 할당량이 채워지도록)
+CATALOG_DEPARTMENTS = ["대양휴머니티칼리지", "경영학부", "컴퓨터공학과", "소프트웨어학과"]
+_COURSE_TYPES = {
+    "대양휴머니티칼리지": ["공통교양필수", "균형교양필수", "교양선택"],
+}
+_DAY_PAIRS = ["월", "화", "수", "목", "금", "월 수", "화 목"]
+_STARTS = ["09:00", "10:30", "12:00", "13:30", "15:00", "16:30", "18:00"]
+
+
+def make_course_lines(per_department=30, seed=0):
+    """
+    course.txt 형식("학과 : " 제목 줄 + "학과,강의명,이수구분,학점,시간,강의실,교수") 줄 목록
+    """
+    rng = random.Random(seed)
+    lines = []
+    for department in CATALOG_DEPARTMENTS:
+        lines.append(f"{department} : ")
+        for i in range(per_department):
+            start = rng.choice(_STARTS)
+            hours, minutes = map(int, start.split(":"))
+            end_minutes = hours * 60 + minutes + 90
+            time_text = f"{rng.choice(_DAY_PAIRS)} {start}~{end_minutes // 60:02d}:{end_minutes % 60:02d}"
+            course_type = rng.choice(_COURSE_TYPES.get(department, ["전공필수", "전공선택", "전공기초"]))
+            lines.append(",".join([
+                department, f"{department[:2]}합성강의{i:03d}", course_type, "3.0",
+                time_text, f"합{rng.randrange(100, 600)}", f"교수{rng.randrange(50):02d}",
+            ]))
+        lines.append("")
+    return lines
+
+
+def write_course_file(path, per_department=30, seed=0):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("\n".join(make_course_lines(per_department, seed)) + "\n")
+    return path
+
+
+def make_review_rows(course_names, reviews_per_course=20, seed=0):
+    """
+    (Course 행 목록, Course_Review 행 목록). Course 의 누적값은 리뷰와 맞춰 둡니다.
+    """
+    rng = random.Random(seed)
+    courses, reviews = [], []
+    for course_id, name in enumerate(course_names, start=1):
+        sums = {"rating": 0, "assignment": 0, "group_work": 0, "grading": 0}
+        count = rng.randrange(reviews_per_course + 1)
+        for r in range(count):
+            review = {key: rng.randint(1, 5) for key in sums}
+            for key, value in review.items():
+                sums[key] += value
+            reviews.append({"course_id": course_id, "user_id": f"2{r:07d}", "comment": "합성 리뷰", **review})
+        courses.append({
+            "course_id": course_id, "course_name": name, "professor": f"교수{course_id % 50:02d}",
+            "avg_rating": sums["rating"] / count if count else None,
+            "rating_sum": sums["rating"], "rating_count": count,
+            "assignment_sum": sums["assignment"], "group_work_sum": sums["group_work"],
+            "grading_sum": sums["grading"],
+        })
+    return courses, reviews
+
+
+def make_lecture_reference(subjects=2000, group_size=3, seed=0):
+    """
+    make_dic / make_recommend_list 용 (전체 학수번호, 학수번호 -> 그룹번호, 개설 학수번호 집합).
+    절반 정도가 동일과목 그룹에 묶이고 80%가 현재 개설
+    """
+    rng = random.Random(seed)
+    subject_nums = [str(1000 + i) for i in range(subjects)]
+    grouped = rng.sample(subject_nums, subjects // 2)
+    subject_groups = {s_num: f"G{i // group_size:05d}" for i, s_num in enumerate(grouped)}
+    new_lectures = {s_num for s_num in subject_nums if rng.random() < 0.8}
+    return subject_nums, subject_groups, new_lectures
@@ -0,0 +1,106 @@
+"""
+졸업요건/공학인증 검사 결과를 new_user_info.result_json / en_result_json 에 저장해 두고 재사용
+
+저장 형식: {"reference": 기준 데이터 digest, "inputs": 성적+학생정보 해시, "result": 검사 결과}
+조회할 때 new_user_info 한 행을 읽으면서 같은 쿼리 안에서 user_grade 해시와 학생정보(학번 년도, 전공,
+고전독서, 영어 등) 해시도 계산하고, 기준 데이터 digest 와 입력 해시가 둘 다 저장된 값과 같을 때만
+저장된 결과를 돌려줍니다. 성적을 올리거나 학생정보를 바꾸거나 기준 데이터를 다시 읽으면 자동으로 다시 계산됩니다.
+"""
+import json
+
+from database.connect import pooled_connection
+from database.reference_data import reference_data
+
+RESULT_COLUMNS = {
+    "graduation": "result_json",
+    "engineering": "en_result_json",
+}
+
+# 학생의 user_grade 행 전체에 대한 순서 무관 해시 (행 수 + CRC32 합 + SHA1 앞 16자리 XOR)
+_GRADE_ROW = (
+    "CONCAT_WS('|', g.year, g.semester, g.subject_num, g.subject_name, g.classification, "
+    "COALESCE(g.selection, ''), g.grade, COALESCE(g.major, ''))"
+)
+GRADE_HASH_SQL = f"""
+    SELECT CONCAT_WS(':',
+               COUNT(*),
+               COALESCE(SUM(CRC32({_GRADE_ROW})), 0),
+               COALESCE(BIT_XOR(CAST(CONV(LEFT(SHA1({_GRADE_ROW}), 16), 16, 10) AS UNSIGNED)), 0))
+    FROM user_grade g
+    WHERE g.student_id = u.student_id
+"""
+
+SELECT_RESULT_SQL = """
+    SELECT u.{column},
+           CONCAT_WS('/',
+               ({grade_hash}),
+               SHA1(CONCAT_WS('|', u.name, u.year, u.major, COALESCE(u.sub_major, ''), u.major_status, u.book, u.eng))
+           ) AS inputs
+    FROM new_user_info u
+    WHERE u.student_id = %s
+"""
+
+UPDATE_RESULT_SQL = "UPDATE new_user_info SET {column} = %s WHERE student_id = %s"
+
+
+def _json_default(value):
+    # pandas 합계로 나온 numpy 숫자 등
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _load(stored):
+    if stored is None:
+        return None
+    if isinstance(stored, (bytes, bytearray)):
+        stored = stored.decode("utf-8")
+    if isinstance(stored, str):
+        try:
+            stored = json.loads(stored)
+        except ValueError:
+            return None
+    return stored if isinstance(stored, dict) else None
+
+
+def cached_audit(student_id, kind, compute):
+    """
+    kind("graduation" / "engineering") 검사 결과. 저장된 결과가 유효하면 new_user_info 한 행 조회로 끝나고,
+    아니면 compute(student_id, reference) 로 다시 계산해 저장합니다.
+    결과 dict 와 저장된 결과를 썼는지 여부를 반환
+    """
+    column = RESULT_COLUMNS[kind]
+    reference = reference_data.get()
+
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(SELECT_RESULT_SQL.format(column=column, grade_hash=GRADE_HASH_SQL), (str(student_id),))
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+    if row is None:
+        raise LookupError(f"Unknown student: {student_id}")
+
+    stored, inputs = _load(row[0]), row[1]
+    if stored and stored.get("reference") == reference.digest and stored.get("inputs") == inputs:
+        return stored["result"], True
+
+    # 계산 전에 읽은 입력 해시로 저장 -> 계산 도중 성적이 바뀌면 다음 조회 때 다시 계산됨
+    result = compute(student_id, reference)
+    body = json.dumps(
+        {"reference": reference.digest, "inputs": inputs, "result": result},
+        ensure_ascii=False,
+        default=_json_default,
+    )
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(UPDATE_RESULT_SQL.format(column=column), (body, str(student_id)))
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    return json.loads(body)["result"], False
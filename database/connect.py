@@ -1,6 +1,11 @@
 import mysql.connector
 import os
+import threading
+import time
+from contextlib import contextmanager
 from dotenv import load_dotenv, find_dotenv
+from fastapi import HTTPException
+from database.instrumentation import instrument
 
 # 환경 변수 로드
 load_dotenv(find_dotenv(), override=True)
@@ -11,6 +16,13 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 DB_PORT = int(os.getenv("DB_PORT", 3306))  # 기본 포트는 3306
+
+# 연결 풀 설정
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))            # 최대 연결 수
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 5))     # 빈 연결을 기다리는 최대 시간(초)
+DB_POOL_RECYCLE = float(os.getenv("DB_POOL_RECYCLE", 300))   # 이 시간(초) 이상 쉬던 연결은 재사용 전에 ping
+
+
 def get_db_connection():
     """
     MySQL 데이터베이스 연결을 생성합니다.
@@ -26,3 +38,152 @@ def get_db_connection():
         return connection
     except mysql.connector.Error as err:
         raise RuntimeError(f"Database connection failed: {err}")
+
+
+class PoolExhaustedError(RuntimeError):
+    """
+    풀의 모든 연결이 사용 중이고 timeout 안에 반납되지 않은 경우
+    """
+
+
+class ConnectionPool:
+    """
+    최대 size개의 연결을 재사용하는 풀.
+    연결은 처음 필요할 때 만들어지고, 모두 사용 중이면 timeout 동안 반납(또는 버려져서 생긴 빈자리)을 기다립니다.
+    """
+
+    def __init__(self, factory=get_db_connection, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT, recycle=DB_POOL_RECYCLE):
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self._idle = []  # (connection, 반납 시각). 마지막에 반납된 연결부터 재사용
+        self._lock = threading.Lock()
+        # release() 와 _discard() 가 깨움: 쉬는 연결이 생겼거나 새로 만들 자리가 생김
+        self._available = threading.Condition(self._lock)
+        self._created = 0
+        self._in_use = 0
+        self._counters = {"checkouts": 0, "waits": 0, "exhausted": 0, "created": 0, "discarded": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def acquire(self):
+        """
+        풀에서 연결 하나를 빌려옵니다. 반드시 release()로 돌려줘야 합니다.
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            connection, released_at = self._checkout(deadline)
+            if connection is None:
+                connection = self._create()
+                break
+            # 오래 쉬던 연결은 서버 wait_timeout으로 끊겼을 수 있음 (기다려서 받은 연결도 똑같이 검사)
+            if time.monotonic() - released_at <= self.recycle:
+                break
+            try:
+                connection.ping(reconnect=True, attempts=1, delay=0)
+                break
+            except Exception:
+                self._discard(connection)
+
+        with self._lock:
+            self._counters["checkouts"] += 1
+            self._in_use += 1
+        return connection
+
+    def _checkout(self, deadline):
+        """
+        (쉬는 연결, 반납 시각) 또는 새로 만들 자리를 잡았으면 (None, None). deadline 까지 둘 다 없으면 PoolExhaustedError
+        """
+        with self._available:
+            waited = False
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    return None, None
+                # 풀이 가득 찼으면 다른 요청이 반납하거나 연결을 버릴 때까지 대기
+                if not waited:
+                    self._counters["waits"] += 1
+                    waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["exhausted"] += 1
+                    raise PoolExhaustedError(
+                        f"No database connection available within {self.timeout}s (pool size {self.size})")
+                self._available.wait(remaining)
+
+    def _create(self):
+        try:
+            connection = self.factory()
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+        self._count("created")
+        return connection
+
+    def release(self, connection):
+        """
+        빌린 연결을 풀에 돌려줍니다. 커밋되지 않은 트랜잭션은 롤백합니다.
+        """
+        with self._lock:
+            self._in_use -= 1
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except Exception:
+            # 끊어진 연결은 버리고 다음 요청에서 새로 만든다
+            self._discard(connection)
+            return
+        with self._available:
+            self._idle.append((connection, time.monotonic()))
+            self._available.notify()
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._available:
+            self._created -= 1
+            self._counters["discarded"] += 1
+            self._available.notify()
+
+    def stats(self):
+        """
+        풀 상태와 누적 카운터
+        """
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": self._created,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                **self._counters,
+            }
+
+
+pool = ConnectionPool()
+
+
+@contextmanager
+def pooled_connection():
+    """
+    with 문으로 풀 연결을 빌려 쓰고 블록이 끝나면 반납합니다.
+    외부 호출(포털 로그인, GPT)처럼 오래 걸리는 작업 뒤에 DB를 쓸 때 사용합니다.
+    """
+    try:
+        connection = pool.acquire()
+    except PoolExhaustedError as err:
+        raise HTTPException(status_code=503, detail=str(err))
+    except RuntimeError as err:
+        raise HTTPException(status_code=500, detail=str(err))
+    try:
+        yield instrument(connection)
+    finally:
+        pool.release(connection)
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+from fastapi.encoders import jsonable_encoder
+
+from database.review_stats import AGGREGATE_COLUMNS
+
+# 다른 워커가 쓴 변경이 보이기까지의 최대 시간(초)
+COURSE_CACHE_TTL = float(os.getenv("COURSE_CACHE_TTL", 30))
+
+# version: 이 프로세스에서 스냅샷이 바뀔 때마다 1씩 증가
+# rows: Course 행 목록 (읽기 전용으로 사용, 시간표 점수 계산용 누적값 컬럼 포함)
+# body: GET /courses 응답 본문을 미리 직렬화한 JSON bytes (누적값 컬럼은 뺌)
+CourseSnapshot = namedtuple("CourseSnapshot", ["version", "count", "rows", "body", "etag", "loaded_at"])
+
+
+def public_columns(row):
+    return {column: value for column, value in row.items() if column not in AGGREGATE_COLUMNS}
+
+
+class CourseCatalogCache:
+    """
+    Course 테이블 전체를 메모리에 들고 있는 스냅샷.
+    읽기는 락 없이 현재 스냅샷을 돌려주고, TTL이 지나면 한 스레드만 DB에서 다시 읽습니다.
+    """
+
+    def __init__(self, ttl=COURSE_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._rows = None
+        self._snapshot = None
+        self._version = 0
+
+    def get(self):
+        """
+        TTL 안의 스냅샷이 있으면 반환, 없으면 None
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl:
+            return snapshot
+        return None
+
+    def refresh(self, load):
+        """
+        load()로 Course 행 목록을 읽어 스냅샷을 새로 만듭니다.
+        동시에 여러 요청이 들어와도 DB 조회는 한 번만 합니다.
+        """
+        with self._lock:
+            snapshot = self.get()
+            if snapshot is not None:
+                return snapshot
+            return self._store(load())
+
+    def patch(self, row):
+        """
+        리뷰 작성 등으로 바뀐 Course 행 하나를 스냅샷에 반영합니다.
+        """
+        with self._lock:
+            if self._rows is None:
+                return
+            rows = [row if str(r["course_id"]) == str(row["course_id"]) else r for r in self._rows]
+            self._store(rows, loaded_at=self._snapshot.loaded_at)
+
+    def invalidate(self):
+        with self._lock:
+            self._rows = None
+            self._snapshot = None
+
+    def _store(self, rows, loaded_at=None):
+        body = json.dumps(
+            {"status": "success", "data": jsonable_encoder([public_columns(row) for row in rows])},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        self._version += 1
+        self._rows = rows
+        self._snapshot = CourseSnapshot(
+            version=self._version,
+            count=len(rows),
+            rows=rows,
+            body=body,
+            etag='"' + hashlib.md5(body).hexdigest() + '"',
+            loaded_at=time.monotonic() if loaded_at is None else loaded_at,
+        )
+        return self._snapshot
+
+
+course_cache = CourseCatalogCache()
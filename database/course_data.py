@@ -0,0 +1,45 @@
+import os
+from itertools import islice
+
+# executemany 한 번에 보낼 최대 행 수 (mysql.connector 는 INSERT 를 다중 VALUES 한 문장으로 합쳐 보냄)
+UPLOAD_BATCH_SIZE = int(os.getenv("UPLOAD_BATCH_SIZE", 500))
+
+INSERT_COURSE_DATA_SQL = """
+    INSERT INTO course_data (
+        user_id, year, semester, course_code,
+        course_name, course_type, credit, grade, choice, grade_detail
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def course_data_params(student_id, row):
+    """
+    성적표 한 행(학기순번…학과코드 dict)을 course_data INSERT 파라미터로 변환
+    """
+    return (
+        student_id,  # request에서 받은 학번
+        row['년도'],
+        row['학기'],
+        row['과목코드'],
+        row['과목명'],
+        row['이수구분'],
+        row['학점'],
+        row['평점'],
+        row['비고2'],
+        row['성적등급'],
+    )
+
+
+def insert_course_data(cursor, student_id, rows, batch_size=UPLOAD_BATCH_SIZE):
+    """
+    성적표 행들을 batch_size 단위 다중 행 INSERT 로 넣습니다. 커밋은 호출한 쪽에서 합니다.
+    rows 는 리스트든 제너레이터든 상관없고, 넣은 행 수를 반환합니다.
+    """
+    params = (course_data_params(student_id, row) for row in rows)
+    inserted = 0
+    while True:
+        batch = list(islice(params, batch_size))
+        if not batch:
+            return inserted
+        cursor.executemany(INSERT_COURSE_DATA_SQL, batch)
+        inserted += len(batch)
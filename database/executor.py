@@ -0,0 +1,24 @@
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from database.connect import DB_POOL_SIZE
+
+# DB 작업 전용 스레드 수 (기본값: 연결 풀 크기와 동일)
+# 연결은 run_db 로 넘긴 함수 안에서만 빌리므로(pooled_connection) 스레드보다 먼저 연결을 잡고 기다리는 요청이 없음
+DB_WORKERS = int(os.getenv("DB_WORKERS", DB_POOL_SIZE))
+
+_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="db")
+
+
+async def run_db(func, *args, **kwargs):
+    """
+    mysql.connector 처럼 블로킹되는 DB 작업을 DB 전용 스레드 풀에서 실행하고 결과를 기다립니다.
+    이벤트 루프는 그동안 다른 요청을 처리합니다. 요청의 contextvars 도 함께 넘어갑니다.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(_executor, call)
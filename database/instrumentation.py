@@ -0,0 +1,82 @@
+import time
+
+# 쿼리 하나가 끝날 때마다 observer(sql, seconds) 로 호출됨 (metrics 등이 등록)
+_query_observers = []
+
+
+def add_query_observer(observer):
+    if observer not in _query_observers:
+        _query_observers.append(observer)
+
+
+def remove_query_observer(observer):
+    if observer in _query_observers:
+        _query_observers.remove(observer)
+
+
+def _notify(sql, seconds):
+    for observer in _query_observers:
+        try:
+            observer(sql, seconds)
+        except Exception:
+            # 관측 실패가 쿼리 결과를 망치면 안 됨
+            pass
+
+
+class InstrumentedCursor:
+    """
+    execute / executemany 시간을 재서 observer 에게 알리는 커서 래퍼. 나머지는 원래 커서 그대로
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, operation, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, *args, **kwargs)
+        finally:
+            _notify(operation, time.perf_counter() - started)
+
+    def executemany(self, operation, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, *args, **kwargs)
+        finally:
+            _notify(operation, time.perf_counter() - started)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """
+    cursor() 가 InstrumentedCursor 를 돌려주는 연결 래퍼. 풀에는 원래 연결이 반납됩니다.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def instrument(connection):
+    """
+    등록된 observer 가 없으면 연결을 그대로 돌려줘서 계측 비용이 없게 합니다.
+    """
+    if not _query_observers:
+        return connection
+    return InstrumentedConnection(connection)
@@ -0,0 +1,201 @@
+"""
+user_grade 에서 (전공, 이수구분, 학수번호)별 수강 횟수를 미리 세어 둔 subject_popularity 테이블 관리
+
+졸업요건 검사의 '많이 듣는 과목' 추천(make_recommend_list_other)은 검사마다 user_grade 전체를
+GROUP BY 하던 것을 이 테이블 + 메모리 캐시 조회로 대신합니다. 배포 전에 한 번 실행:
+
+    python -m database.popularity --migrate --backfill
+
+user_grade 는 이 서버 밖(성적 입력 쪽)에서 채워지고 수정/삭제도 되므로 증분 대신 전체를 다시 셉니다.
+서버의 워커들이 POPULARITY_REFRESH_INTERVAL 초 경계마다 refresh() 를 부르지만 GET_LOCK 을 잡은
+한 곳만 계산하고 나머지는 건너뜁니다. 바로 맞추고 싶으면 --backfill 을 직접 실행하면 됩니다.
+"""
+import argparse
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+from database.connect import pooled_connection
+
+# '커스텀' 년도는 사용자가 직접 추가한 과목이라 인기 집계에서 제외
+CUSTOM_YEAR = "커스텀"
+# 메모리에 들고 있는 시간(초)
+POPULARITY_TTL = float(os.getenv("POPULARITY_TTL", 300))
+# subject_popularity 를 user_grade 기준으로 다시 계산하는 주기(초). 0 이면 끔
+POPULARITY_REFRESH_INTERVAL = float(os.getenv("POPULARITY_REFRESH_INTERVAL", 3600))
+
+MIGRATE_SQL = """
+    CREATE TABLE IF NOT EXISTS subject_popularity (
+        major VARCHAR(45) NOT NULL,
+        classification VARCHAR(45) NOT NULL,
+        subject_num VARCHAR(10) NOT NULL,
+        count INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (major, classification, subject_num)
+    )
+"""
+
+# Django 의 exclude(year='커스텀') 와 같게 year 가 NULL 인 행은 포함
+BACKFILL_DELETE_SQL = "DELETE FROM subject_popularity"
+BACKFILL_SQL = """
+    INSERT INTO subject_popularity (major, classification, subject_num, count)
+    SELECT COALESCE(major, ''), classification, subject_num, COUNT(*)
+    FROM user_grade
+    WHERE (year IS NULL OR year <> %s)
+      AND classification IS NOT NULL
+      AND subject_num IS NOT NULL
+    GROUP BY COALESCE(major, ''), classification, subject_num
+"""
+
+SELECT_SQL = "SELECT major, classification, subject_num, count FROM subject_popularity"
+
+# 다시 계산하는 쪽을 하나로 (MySQL 세션 단위 이름 잠금, 기다리지 않음)
+REFRESH_LOCK = "subject_popularity_refresh"
+GET_LOCK_SQL = "SELECT GET_LOCK(%s, 0)"
+RELEASE_LOCK_SQL = "SELECT RELEASE_LOCK(%s)"
+
+
+def fetch_popularity():
+    """
+    (전공, 이수구분) -> {학수번호: 수강 횟수}
+    """
+    counts = defaultdict(dict)
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(SELECT_SQL)
+            for major, classification, subject_num, count in cursor.fetchall():
+                counts[(major, classification)][subject_num] = count
+        finally:
+            cursor.close()
+    return dict(counts)
+
+
+class PopularitySnapshot:
+    def __init__(self, counts):
+        self.counts = counts
+        self.loaded_at = time.monotonic()
+        self._top = {}
+
+    def top(self, major, *classifications):
+        """
+        수강 횟수 내림차순 (학수번호, 횟수) 전체 목록. major 가 None 이면 전체 전공 합산.
+        이수구분을 여러 개 주면 합산 (교선1 + 중선)
+        추천은 이미 들은 과목/없어진 과목을 빼고 앞에서부터 고르므로 자르지 않음 (GROUP BY 결과와 같은 후보)
+        """
+        key = (major, classifications)
+        ranked = self._top.get(key)
+        if ranked is None:
+            total = Counter()
+            for (row_major, classification), subjects in self.counts.items():
+                if classification in classifications and (major is None or row_major == major):
+                    total.update(subjects)
+            ranked = sorted(total.items(), key=lambda item: (-item[1], item[0]))
+            self._top[key] = ranked
+        return ranked
+
+
+class PopularityCache:
+    """
+    subject_popularity 전체를 TTL 동안 메모리에 두고, 키별 순위 목록은 처음 조회할 때 만들어 재사용
+    """
+
+    def __init__(self, ttl=POPULARITY_TTL, load=fetch_popularity):
+        self.ttl = ttl
+        self.load = load
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def get(self):
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or time.monotonic() - snapshot.loaded_at >= self.ttl:
+                snapshot = self._snapshot = PopularitySnapshot(self.load())
+            return snapshot
+
+    def top(self, major, *classifications):
+        return self.get().top(major, *classifications)
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+
+popularity = PopularityCache()
+
+
+def migrate(connection):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(MIGRATE_SQL)
+        connection.commit()
+    finally:
+        cursor.close()
+
+
+def backfill(connection):
+    """
+    user_grade 전체를 한 번 GROUP BY 해서 subject_popularity 를 다시 만듭니다. 만든 행 수 반환.
+    다른 연결이 이미 계산 중이면 아무것도 하지 않고 None 반환
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(GET_LOCK_SQL, (REFRESH_LOCK,))
+        (locked,) = cursor.fetchone()
+        if not locked:
+            return None
+        try:
+            # DELETE 와 INSERT 를 한 트랜잭션으로: 커밋 전까지 다른 연결은 빈 테이블이 아닌 이전 카운트를 봄
+            connection.commit()  # 잠금 SELECT 로 열린 트랜잭션 정리 (이름 잠금은 세션에 남음)
+            connection.start_transaction()
+            cursor.execute(BACKFILL_DELETE_SQL)
+            cursor.execute(BACKFILL_SQL, (CUSTOM_YEAR,))
+            created = cursor.rowcount
+            connection.commit()
+            return created
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            cursor.execute(RELEASE_LOCK_SQL, (REFRESH_LOCK,))
+            cursor.fetchone()
+    finally:
+        cursor.close()
+
+
+def refresh():
+    """
+    subject_popularity 를 다시 계산하고 이 프로세스의 캐시를 비웁니다. 만든 행 수 반환
+    (다른 워커가 계산 중이라 건너뛰었으면 None. 다른 워커 프로세스는 POPULARITY_TTL 이 지나면 새 카운트를 읽음)
+    """
+    with pooled_connection() as connection:
+        created = backfill(connection)
+    popularity.invalidate()
+    return created
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--migrate", action="store_true", help="subject_popularity 테이블 생성")
+    parser.add_argument("--backfill", action="store_true", help="user_grade 기준으로 카운트 재계산")
+    args = parser.parse_args()
+    if not (args.migrate or args.backfill):
+        parser.error("--migrate 또는 --backfill 중 하나 이상을 지정하세요.")
+
+    with pooled_connection() as connection:
+        if args.migrate:
+            migrate(connection)
+            print("subject_popularity 테이블을 만들었습니다.")
+        if args.backfill:
+            created = backfill(connection)
+            if created is None:
+                print("다른 곳에서 이미 다시 계산하고 있습니다.")
+            else:
+                print(f"{created}개 (전공, 이수구분, 학수번호) 카운트를 다시 계산했습니다.")
+
+
+if __name__ == "__main__":
+    main()
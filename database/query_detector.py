@@ -0,0 +1,188 @@
+"""
+개발/스테이징용 N+1 / 느린 쿼리 탐지기 (QUERY_DETECTOR=1 일 때만 켜짐)
+
+요청 하나 동안 실행된 쿼리를 정규화한 SQL(문자열/숫자/자리표시자 -> ?, IN (...) 목록 축약) 기준으로 세고,
+같은 문장이 QUERY_DETECTOR_REPEAT 번보다 많이 반복되거나 QUERY_DETECTOR_SLOW_MS 보다 오래 걸리면 표시합니다.
+응답에는 X-Query-Summary (및 걸린 게 있으면 X-Query-Flags) 헤더가 붙고, 걸린 요청은 경고 로그를 남깁니다.
+executemany 는 한 번으로 셉니다 (묶음 INSERT 가 N+1 해결책이므로).
+
+    X-Query-Summary: queries=34; time_ms=12.8; repeated=1; slow=0
+    X-Query-Flags: repeat 30x 5f1c2a9e
+"""
+import contextvars
+import functools
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from database.instrumentation import add_query_observer, remove_query_observer
+
+QUERY_DETECTOR = os.getenv("QUERY_DETECTOR", "").lower() in ("1", "true", "yes", "on")
+QUERY_DETECTOR_REPEAT = int(os.getenv("QUERY_DETECTOR_REPEAT", 5))       # 같은 문장이 이보다 많이 반복되면 N+1 의심
+QUERY_DETECTOR_SLOW_MS = float(os.getenv("QUERY_DETECTOR_SLOW_MS", 200))  # 이보다 오래 걸린 쿼리는 느린 쿼리
+
+logger = logging.getLogger(__name__)
+
+_COMMENTS = re.compile(r"/\*.*?\*/|--[^\n]*|#[^\n]*", re.S)
+_STRINGS = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"%s|%\(\w+\)s")
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+")
+_SPACES = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """
+    값만 다른 문장이 같은 문자열이 되도록 정규화한 SQL
+    """
+    if isinstance(sql, (bytes, bytearray)):
+        sql = sql.decode("utf-8", "replace")
+    sql = _STRINGS.sub("?", sql)  # 문자열 안의 '#', '--' 가 주석으로 잘리지 않도록 먼저
+    sql = _COMMENTS.sub(" ", sql)
+    sql = _PLACEHOLDERS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _LISTS.sub("(?+)", sql)
+    sql = _ROWS.sub("(?+)", sql)
+    return _SPACES.sub(" ", sql).strip().lower()
+
+
+def fingerprint_id(normalized):
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:8]
+
+
+class QueryLog:
+    """
+    요청 하나(또는 with track_queries() 블록 하나) 동안의 쿼리 기록
+    statements: 정규화 SQL -> [실행 횟수, 총 시간, 최대 시간]
+    """
+
+    def __init__(self, repeat_limit=None, slow_ms=None):
+        self.repeat_limit = QUERY_DETECTOR_REPEAT if repeat_limit is None else repeat_limit
+        self.slow_seconds = (QUERY_DETECTOR_SLOW_MS if slow_ms is None else slow_ms) / 1000
+        self.statements = {}
+        self.queries = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, sql, seconds):
+        normalized = fingerprint(sql)
+        with self._lock:
+            self.queries += 1
+            self.seconds += seconds
+            stat = self.statements.get(normalized)
+            if stat is None:
+                self.statements[normalized] = [1, seconds, seconds]
+            else:
+                stat[0] += 1
+                stat[1] += seconds
+                stat[2] = max(stat[2], seconds)
+
+    def repeated(self):
+        """
+        (정규화 SQL, 횟수) 목록, 많이 반복된 순
+        """
+        with self._lock:
+            found = [(sql, stat[0]) for sql, stat in self.statements.items() if stat[0] > self.repeat_limit]
+        return sorted(found, key=lambda item: -item[1])
+
+    def slow(self):
+        """
+        (정규화 SQL, 최대 시간) 목록, 느린 순
+        """
+        with self._lock:
+            found = [(sql, stat[2]) for sql, stat in self.statements.items() if stat[2] > self.slow_seconds]
+        return sorted(found, key=lambda item: -item[1])
+
+    def summary(self):
+        return (f"queries={self.queries}; time_ms={self.seconds * 1000:.1f}; "
+                f"repeated={len(self.repeated())}; slow={len(self.slow())}")
+
+    def flags(self):
+        flags = [f"repeat {count}x {fingerprint_id(sql)}" for sql, count in self.repeated()]
+        flags += [f"slow {seconds * 1000:.0f}ms {fingerprint_id(sql)}" for sql, seconds in self.slow()]
+        return flags
+
+    def report(self, label):
+        """
+        걸린 문장이 있으면 경고 로그 한 줄 (없으면 아무것도 안 함)
+        """
+        repeated, slow = self.repeated(), self.slow()
+        if not repeated and not slow:
+            return
+        parts = [f"{count}x [{fingerprint_id(sql)}] {sql[:200]}" for sql, count in repeated]
+        parts += [f"slow {seconds * 1000:.0f}ms [{fingerprint_id(sql)}] {sql[:200]}" for sql, seconds in slow]
+        logger.warning("query detector %s: %s | %s", label, self.summary(), " | ".join(parts))
+
+
+current_log = contextvars.ContextVar("current_query_log", default=None)
+
+
+def _observe(sql, seconds):
+    log = current_log.get()
+    if log is not None:
+        log.record(sql, seconds)
+    elif seconds * 1000 > QUERY_DETECTOR_SLOW_MS:
+        # 요청 밖(시작 시 기준 데이터 적재, 배치 등)의 느린 쿼리
+        logger.warning("query detector: slow %.0fms %s", seconds * 1000, fingerprint(sql)[:200])
+
+
+def enable():
+    add_query_observer(_observe)
+
+
+def disable():
+    remove_query_observer(_observe)
+
+
+@contextmanager
+def track_queries(repeat_limit=None, slow_ms=None):
+    """
+    with track_queries() as log: ... 블록 안에서 실행된 쿼리를 log 에 모읍니다 (스크립트/벤치마크에서도 사용)
+    """
+    log = QueryLog(repeat_limit, slow_ms)
+    token = current_log.set(log)
+    try:
+        yield log
+    finally:
+        current_log.reset(token)
+
+
+class QueryDetectorMiddleware:
+    """
+    요청마다 QueryLog 를 만들고 응답 헤더에 요약을 붙이는 ASGI 미들웨어.
+    헤더는 응답 시작 시점까지의 쿼리 기준, 로그는 (스트리밍 응답이면 끝까지 보낸 뒤) 전체 기준입니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        enable()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as log:
+            started = time.perf_counter()
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-query-summary", log.summary().encode("latin-1")))
+                    flags = log.flags()
+                    if flags:
+                        headers.append((b"x-query-flags", ", ".join(flags).encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                elapsed = (time.perf_counter() - started) * 1000
+                log.report(f"{scope['method']} {scope['path']} ({elapsed:.0f}ms)")
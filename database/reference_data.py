@@ -0,0 +1,185 @@
+import hashlib
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+from database.connect import pooled_connection
+
+# 졸업요건 검사 기준 테이블 (학기마다 한 번 정도 바뀜)
+REFERENCE_TABLES = {
+    "lectures": "all_lecture",
+    "new_lectures": "new_lecture",
+    "subject_groups": "subject_group",
+    "changed_classifications": "changed_classification",
+    "standards": "standard",
+    "majors": "major",
+}
+
+
+class ReferenceData:
+    """
+    AllLecture, NewLecture, SubjectGroup, ChangedClassification, Standard, Major 를
+    한 번에 읽어 만든 읽기 전용 색인. 만든 뒤에는 바꾸지 않고 통째로 교체합니다.
+    version 은 이 프로세스 안에서의 교체 순번, digest 는 내용 해시 (재시작/다른 워커에서도 같은 내용이면 같음)
+
+    - lectures                : 학수번호 -> AllLecture 행(dict)
+    - new_lectures            : 현재 열리는 강의의 학수번호 frozenset
+    - subject_groups          : 학수번호 -> 동일과목 그룹번호
+    - group_subjects          : 그룹번호 -> 학수번호 tuple
+    - changed_classifications : (학번 년도, 학수번호) -> 바뀐 이수구분
+    - changed_by_year         : 학번 년도 -> {학수번호: 바뀐 이수구분}
+    - standards               : (학과, 학번 년도) -> Standard 행(namedtuple)
+    - majors                  : 전공명 -> Major 행(namedtuple)
+    """
+
+    def __init__(self, version, lectures, new_lectures, subject_groups, changed_classifications,
+                 standards, majors):
+        self.version = version
+        self.loaded_at = time.time()
+        self.lectures = lectures
+        self.new_lectures = frozenset(new_lectures)
+        self.subject_groups = subject_groups
+        group_subjects = defaultdict(list)
+        for s_num, g_num in subject_groups.items():
+            group_subjects[g_num].append(s_num)
+        self.group_subjects = {g_num: tuple(members) for g_num, members in group_subjects.items()}
+        self.changed_classifications = changed_classifications
+        changed_by_year = defaultdict(dict)
+        for (year, s_num), classification in changed_classifications.items():
+            changed_by_year[year][s_num] = classification
+        self.changed_by_year = dict(changed_by_year)
+        self.standards = standards
+        self.majors = majors
+
+        by_classification = defaultdict(list)
+        for row in lectures.values():
+            by_classification[row["classification"]].append(row)
+        self._by_classification = dict(by_classification)
+
+        self.digest = hashlib.sha1(repr([
+            sorted(lectures.items(), key=repr),
+            sorted(self.new_lectures, key=repr),
+            sorted(subject_groups.items(), key=repr),
+            sorted(changed_classifications.items(), key=repr),
+            sorted(standards.items(), key=repr),
+            sorted(majors.items(), key=repr),
+        ]).encode("utf-8")).hexdigest()[:16]
+
+    def lecture_rows(self, subject_nums):
+        """
+        AllLecture.objects.filter(subject_num__in=...).values() 와 같은 결과 (학수번호 순)
+        """
+        return [self.lectures[s_num] for s_num in sorted(set(subject_nums)) if s_num in self.lectures]
+
+    def lectures_by_classification(self, classification, selections=None):
+        rows = self._by_classification.get(classification, [])
+        if selections is None:
+            return list(rows)
+        return [row for row in rows if row["selection"] in selections]
+
+    def standard(self, major, year):
+        try:
+            return self.standards[(major, int(year))]
+        except KeyError:
+            raise LookupError(f"No graduation standard for {major} / {year}")
+
+    def major(self, name):
+        try:
+            return self.majors[name]
+        except KeyError:
+            raise LookupError(f"Unknown major: {name}")
+
+    def stats(self):
+        return {
+            "version": self.version,
+            "digest": self.digest,
+            "loaded_at": self.loaded_at,
+            "lectures": len(self.lectures),
+            "new_lectures": len(self.new_lectures),
+            "subject_groups": len(self.subject_groups),
+            "changed_classifications": len(self.changed_classifications),
+            "standards": len(self.standards),
+            "majors": len(self.majors),
+        }
+
+
+def _select(cursor, table, order_by):
+    cursor.execute(f"SELECT * FROM {table} ORDER BY {order_by}")
+    return cursor.column_names, cursor.fetchall()
+
+
+def _as_tuples(name, columns, rows):
+    row_type = namedtuple(name, columns)
+    return [row_type(*row) for row in rows]
+
+
+def fetch_reference_data(version):
+    """
+    기준 테이블 6개를 한 커넥션에서 읽어 ReferenceData 를 만듭니다.
+    """
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            columns, rows = _select(cursor, REFERENCE_TABLES["lectures"], "subject_num")
+            lectures = {row["subject_num"]: row for row in (dict(zip(columns, r)) for r in rows)}
+
+            _, rows = _select(cursor, REFERENCE_TABLES["new_lectures"], "subject_num")
+            new_lectures = [s_num for (s_num,) in rows]
+
+            columns, rows = _select(cursor, REFERENCE_TABLES["subject_groups"], "subject_num")
+            subject_groups = {row.subject_num: row.group_num for row in _as_tuples("SubjectGroupRow", columns, rows)}
+
+            # 같은 (년도, 학수번호)가 여러 줄이면 먼저 들어간 행 기준 (기존 cc_qs[0])
+            columns, rows = _select(cursor, REFERENCE_TABLES["changed_classifications"], "`index`")
+            changed = {}
+            for row in _as_tuples("ChangedClassificationRow", columns, rows):
+                changed.setdefault((row.year, row.subject_num), row.classification)
+
+            columns, rows = _select(cursor, REFERENCE_TABLES["standards"], "`index`")
+            standards = {}
+            for row in _as_tuples("StandardRow", columns, rows):
+                standards.setdefault((row.user_dep, row.user_year), row)
+
+            columns, rows = _select(cursor, REFERENCE_TABLES["majors"], "`index`")
+            majors = {}
+            for row in _as_tuples("MajorRow", columns, rows):
+                majors.setdefault(row.major, row)
+        finally:
+            cursor.close()
+
+    return ReferenceData(version, lectures, new_lectures, subject_groups, changed, standards, majors)
+
+
+class ReferenceDataStore:
+    """
+    현재 ReferenceData 를 들고 있다가 reload() 때 새로 읽은 것으로 통째로 교체합니다.
+    검사 도중에 교체돼도 이미 get() 한 스냅샷은 그대로라서 한 검사 안에서는 항상 같은 버전을 봅니다.
+    """
+
+    def __init__(self, load=fetch_reference_data):
+        self.load = load
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._version = 0
+
+    def get(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._swap()
+                snapshot = self._snapshot
+        return snapshot
+
+    def reload(self):
+        with self._lock:
+            return self._swap()
+
+    def _swap(self):
+        snapshot = self.load(self._version + 1)
+        self._version = snapshot.version
+        self._snapshot = snapshot
+        return snapshot
+
+
+reference_data = ReferenceDataStore()
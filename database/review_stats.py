@@ -0,0 +1,116 @@
+"""
+Course 테이블의 리뷰 누적값(rating_sum, rating_count, assignment_sum, group_work_sum, grading_sum) 관리
+
+리뷰 1건마다 AVG()로 전체 리뷰를 다시 훑는 대신 누적값을 같은 트랜잭션에서 증가시킵니다.
+배포 전에 컬럼 추가 + 기존 데이터 재계산을 한 번 실행해야 합니다.
+
+    python -m database.review_stats --migrate --backfill
+
+누적값이 어긋났다고 의심될 때도 --backfill 만 다시 실행하면 Course_Review 기준으로 복구됩니다.
+"""
+import argparse
+
+from database.connect import pooled_connection
+
+# 이 모듈이 Course 에 추가하는 누적값 컬럼 (내부용이라 API 응답에는 싣지 않음)
+AGGREGATE_COLUMNS = ("rating_sum", "rating_count", "assignment_sum", "group_work_sum", "grading_sum")
+
+# 리뷰 1건은 네 항목을 모두 가지므로 개수는 rating_count 하나로 공유
+MIGRATE_SQL = """
+    ALTER TABLE Course
+        ADD COLUMN rating_sum INT NOT NULL DEFAULT 0,
+        ADD COLUMN rating_count INT NOT NULL DEFAULT 0,
+        ADD COLUMN assignment_sum INT NOT NULL DEFAULT 0,
+        ADD COLUMN group_work_sum INT NOT NULL DEFAULT 0,
+        ADD COLUMN grading_sum INT NOT NULL DEFAULT 0
+"""
+
+# 리뷰 1건 추가. MySQL의 단일 테이블 UPDATE는 SET 을 왼쪽부터 평가하고
+# 앞에서 바뀐 값을 뒤에서 보므로 avg_rating 은 증가된 누적값으로 계산된다.
+ADD_REVIEW_SQL = """
+    UPDATE Course
+    SET rating_sum = rating_sum + %s,
+        rating_count = rating_count + 1,
+        assignment_sum = assignment_sum + %s,
+        group_work_sum = group_work_sum + %s,
+        grading_sum = grading_sum + %s,
+        avg_rating = rating_sum / rating_count
+    WHERE course_id = %s
+"""
+
+# Course_Review 전체를 한 번 GROUP BY 해서 모든 강의의 누적값을 덮어쓴다
+BACKFILL_SQL = """
+    UPDATE Course c
+    LEFT JOIN (
+        SELECT course_id,
+               SUM(rating) AS rating_sum,
+               COUNT(*) AS rating_count,
+               SUM(assignment) AS assignment_sum,
+               SUM(group_work) AS group_work_sum,
+               SUM(grading) AS grading_sum
+        FROM Course_Review
+        GROUP BY course_id
+    ) r ON r.course_id = c.course_id
+    SET c.rating_sum = COALESCE(r.rating_sum, 0),
+        c.rating_count = COALESCE(r.rating_count, 0),
+        c.assignment_sum = COALESCE(r.assignment_sum, 0),
+        c.group_work_sum = COALESCE(r.group_work_sum, 0),
+        c.grading_sum = COALESCE(r.grading_sum, 0),
+        c.avg_rating = r.rating_sum / r.rating_count
+"""
+
+
+def add_review(cursor, review):
+    """
+    create_review 트랜잭션 안에서 호출. 리뷰 수와 무관하게 Course 행 하나만 갱신합니다.
+    """
+    cursor.execute(
+        ADD_REVIEW_SQL,
+        (review.rating, review.assignment, review.group_work, review.grading, review.course_id),
+    )
+
+
+def migrate(connection):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(MIGRATE_SQL)
+        connection.commit()
+    finally:
+        cursor.close()
+
+
+def backfill(connection):
+    """
+    Course_Review 로부터 모든 강의의 누적값과 avg_rating 을 다시 계산합니다. 갱신된 행 수 반환
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(BACKFILL_SQL)
+        connection.commit()
+        return cursor.rowcount
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--migrate", action="store_true", help="Course 테이블에 누적값 컬럼 추가")
+    parser.add_argument("--backfill", action="store_true", help="Course_Review 기준으로 누적값 재계산")
+    args = parser.parse_args()
+    if not (args.migrate or args.backfill):
+        parser.error("--migrate 또는 --backfill 중 하나 이상을 지정하세요.")
+
+    with pooled_connection() as connection:
+        if args.migrate:
+            migrate(connection)
+            print("Course 테이블에 누적값 컬럼을 추가했습니다.")
+        if args.backfill:
+            updated = backfill(connection)
+            print(f"{updated}개 강의의 누적값을 다시 계산했습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from database.connect import pooled_connection
+
+# 학생별 이수 과목 집합을 메모리에 두는 시간(초)과 최대 학생 수
+TAKEN_COURSES_TTL = float(os.getenv("TAKEN_COURSES_TTL", 600))
+TAKEN_COURSES_MAX_STUDENTS = int(os.getenv("TAKEN_COURSES_MAX_STUDENTS", 5000))
+
+# 성적등급(grade_detail)이 이 값이면 이수하지 못한 것으로 보고 재수강 후보에 남김
+FAILING_GRADES = ("F", "NP")
+
+SELECT_PASSED_SQL = f"""
+    SELECT course_name FROM course_data
+    WHERE user_id = %s
+      AND (grade_detail IS NULL OR grade_detail NOT IN ({", ".join(["%s"] * len(FAILING_GRADES))}))
+"""
+
+
+def normalize_course_name(name):
+    # 성적표와 course.txt 의 띄어쓰기 차이를 무시
+    return "".join(str(name).split())
+
+
+def fetch_taken_courses(student_id):
+    """
+    /upload-excel 로 저장된 course_data 에서 학생이 이수한(F/NP 가 아닌) 과목명 집합을 읽습니다.
+    """
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(SELECT_PASSED_SQL, (str(student_id),) + FAILING_GRADES)
+            return frozenset(normalize_course_name(name) for (name,) in cursor.fetchall())
+        finally:
+            cursor.close()
+
+
+class TakenCoursesCache:
+    """
+    학번 -> 이수 과목명 frozenset. TTL 이 지나거나 성적표를 새로 올리면 다시 읽습니다.
+    """
+
+    def __init__(self, ttl=TAKEN_COURSES_TTL, max_students=TAKEN_COURSES_MAX_STUDENTS, load=fetch_taken_courses):
+        self.ttl = ttl
+        self.max_students = max_students
+        self.load = load
+        self._entries = OrderedDict()  # 학번 -> (읽은 시각, 과목명 집합)
+        self._lock = threading.Lock()
+
+    def get(self, student_id):
+        key = str(student_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        names = self.load(key)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), names)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_students:
+                self._entries.popitem(last=False)
+        return names
+
+    def invalidate(self, student_id):
+        with self._lock:
+            self._entries.pop(str(student_id), None)
+
+
+taken_courses = TakenCoursesCache()
@@ -0,0 +1,105 @@
+import os
+import threading
+from collections import defaultdict
+
+# 시간표 생성에 쓰는 강의 데이터 파일
+COURSE_FILE = os.getenv("COURSE_FILE", "txt/course.txt")
+
+
+def parse_course_line(line):
+    """
+    "학과,강의명,이수구분,학점,시간,강의실,교수" 한 줄을 강의 dict 로 변환. 형식이 맞지 않으면 None
+    """
+    parts = line.split(",")
+    if len(parts) < 7:  # 최소 데이터 검증 ("대양휴머니티칼리지 : " 같은 제목 줄 포함)
+        return None
+    try:
+        credits = float(parts[3].strip())
+    except ValueError:
+        return None  # 학점이 비어 있는 경우 스킵
+    return {
+        "department": parts[0].strip(),
+        "course_name": parts[1].strip(),
+        "type": parts[2].strip(),
+        "credits": credits,
+        "time": parts[4].strip(),
+        "location": parts[5].strip(),
+        "professor": parts[6].strip()
+    }
+
+
+class CourseCatalog:
+    """
+    course.txt 를 한 번만 읽어 학과/이수구분/요일별로 색인해 두는 강의 목록.
+    파일 수정 시각(mtime)이 바뀌면 다음 조회 때 자동으로 다시 읽고 version 을 올립니다.
+    """
+
+    def __init__(self, file_path=COURSE_FILE):
+        self.file_path = file_path
+        self.version = 0
+        self.courses = []
+        self.by_department = {}
+        self.by_type = {}
+        self.by_weekday = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """
+        파일이 바뀌었으면 다시 읽습니다. 바뀌지 않았으면 stat 한 번으로 끝납니다.
+        """
+        mtime = os.stat(self.file_path).st_mtime_ns
+        if mtime == self._mtime:
+            return self
+        with self._lock:
+            if mtime != self._mtime:
+                self._load(mtime)
+        return self
+
+    def _load(self, mtime):
+        with open(self.file_path, 'r', encoding='utf-8') as file:
+            courses = [course for course in map(parse_course_line, file) if course is not None]
+
+        by_department = defaultdict(list)
+        by_type = defaultdict(list)
+        by_weekday = defaultdict(list)
+        for course in courses:
+            by_department[course["department"]].append(course)
+            by_type[course["type"]].append(course)
+            # "화 목 10:30~12:00" -> "화", "목" (마지막 토큰은 시간대)
+            for day in dict.fromkeys(course["time"].split()[:-1]):
+                by_weekday[day].append(course)
+
+        # 색인을 다 만든 뒤 한꺼번에 교체 (읽는 쪽은 락 없이 이전/새 색인 중 하나를 봄)
+        self.courses = courses
+        self.by_department = dict(by_department)
+        self.by_type = dict(by_type)
+        self.by_weekday = dict(by_weekday)
+        self._mtime = mtime
+        self.version += 1
+
+    def department(self, name):
+        return self.refresh().by_department.get(name, [])
+
+    def course_type(self, name):
+        return self.refresh().by_type.get(name, [])
+
+    def weekday(self, day):
+        return self.refresh().by_weekday.get(day, [])
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(file_path=COURSE_FILE):
+    """
+    파일 경로별로 하나씩만 만들어지는 CourseCatalog
+    """
+    catalog = _catalogs.get(file_path)
+    if catalog is None:
+        with _catalogs_lock:
+            catalog = _catalogs.get(file_path)
+            if catalog is None:
+                catalog = _catalogs[file_path] = CourseCatalog(file_path)
+    return catalog.refresh()
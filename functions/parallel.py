@@ -0,0 +1,113 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi.concurrency import run_in_threadpool
+
+from functions.catalog import get_catalog
+from functions.scoring import recommend_timetables, top_distinct
+
+# 시간표 탐색에 쓸 프로세스 수. 0 또는 1이면 프로세스 풀 없이 요청 스레드에서 탐색
+TIMETABLE_WORKERS = int(os.getenv("TIMETABLE_WORKERS", 0))
+# 이 개수 이상 요청할 때만 여러 프로세스로 나눠 탐색 (작은 요청은 IPC 비용이 더 큼)
+PARALLEL_MIN_COUNT = int(os.getenv("TIMETABLE_PARALLEL_MIN_COUNT", 10))
+
+# 워커 프로세스마다 initializer 에서 한 번 정해지는 강의 파일 경로
+_worker_file = None
+
+
+def _init_worker(file_path):
+    # 강의 목록은 워커가 시작할 때 한 번 파싱해 두고 작업마다 다시 보내지 않음
+    global _worker_file
+    _worker_file = file_path
+    get_catalog(file_path)
+
+
+def _catalog_version():
+    return get_catalog(_worker_file).version
+
+
+def _search_shard(shard, shards, count, answers, review_stats, seed, exclude_names):
+    return recommend_timetables(
+        _worker_file, count, answers, review_stats, seed=seed,
+        exclude_names=exclude_names, shard=(shard, shards),
+    )
+
+
+class TimetableWorkers:
+    """
+    시간표 탐색 공간을 첫 번째로 고르는 강의 기준으로 workers 개로 나눠 프로세스마다 탐색하고,
+    각 조각에서 서로 충분히 다른 상위 count개를 찾아 합친 뒤 같은 기준(top_distinct)으로 다시 count개를 고릅니다.
+
+    seed 가 같으면 조각들의 탐색 공간이 겹치지 않으므로 결과도 항상 같습니다.
+    조각마다 탐색 노드 한도(max_nodes)가 따로라서 조각 수가 다르면 결과가 달라질 수 있으므로,
+    캐시 키(generation_id)에는 shards(count) 를 넣습니다.
+    """
+
+    def __init__(self, file_path, workers=TIMETABLE_WORKERS, min_count=PARALLEL_MIN_COUNT):
+        self.file_path = file_path
+        self.workers = workers
+        self.min_count = min_count
+        self._executor = None
+
+    @property
+    def enabled(self):
+        return self.workers > 1
+
+    def shards(self, count):
+        """
+        count 개를 요청할 때 탐색 공간을 나누는 조각 수 (프로세스 풀을 안 쓰면 1)
+        """
+        if not self.enabled or count < self.min_count:
+            return 1
+        return self.workers
+
+    def _get_executor(self):
+        if self._executor is None:
+            # 요청 스레드가 여럿 도는 서버 프로세스를 fork 하지 않도록 spawn
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.file_path,),
+            )
+        return self._executor
+
+    def start(self):
+        """
+        워커 프로세스를 미리 띄워 첫 요청이 프로세스 시작/파싱 시간을 기다리지 않게 합니다.
+        """
+        if self.enabled:
+            executor = self._get_executor()
+            for future in [executor.submit(_catalog_version) for _ in range(self.workers)]:
+                future.result()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def recommend(self, count, answers=None, review_stats=None, seed=None,
+                        exclude_names=frozenset()):
+        """
+        recommend_timetables 와 같은 결과 형식. 프로세스 풀을 쓰지 않으면 스레드풀에서 그대로 실행합니다.
+        """
+        if self.shards(count) == 1:
+            # run_in_threadpool 은 요청의 contextvars(지표, 쿼리 탐지기)를 함께 넘김
+            return await run_in_threadpool(
+                recommend_timetables, self.file_path, count, answers, review_stats, seed=seed,
+                exclude_names=exclude_names,
+            )
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        parts = await asyncio.gather(*[
+            loop.run_in_executor(
+                executor, _search_shard, shard, self.workers, count, answers,
+                review_stats, seed, exclude_names,
+            )
+            for shard in range(self.workers)
+        ])
+        # 조각 순서대로 이어 붙인 뒤 정렬하므로 같은 점수면 앞 조각이 우선 (결정적)
+        return top_distinct([entry for part in parts for entry in part], count)
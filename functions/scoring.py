@@ -0,0 +1,161 @@
+import math
+import os
+
+import numpy as np
+
+from functions.catalog import get_catalog
+from functions.solver import course_key, solve_timetables
+
+# 추천 시간표끼리 최소 이만큼 강의(과목명)가 달라야 함 (1이면 분반만 다른 시간표만 제외)
+MIN_DIFFERENT_COURSES = int(os.getenv("TIMETABLE_MIN_DIFFERENT_COURSES", 2))
+
+# Questions 테이블의 10개 문항(firstQ…tenthQ)과 1:1로 대응하는 강의 특성
+#  1 팀플 많음        -> group_work     (리뷰 팀플 평균)
+#  2 시험보다 과제    -> assignment     (리뷰 과제 평균)
+#  3 실무에 도움      -> practical      (강의명에 프로젝트/산학/캡스톤 등)
+#  4 실습 위주        -> hands_on       (강의명에 실습/실험)
+#  5 영어 수업        -> english        (강의명에 영어/English)
+#  6 후기가 많은 과목 -> review_count   (리뷰 수, 로그 스케일)
+#  7 졸업 필수 과목   -> required       (이수구분에 필수)
+#  8 교양             -> liberal_arts   (대양휴머니티칼리지 / 교양)
+#  9 어려운 시험      -> grading_strict (리뷰 성적 평균이 낮을수록 높음)
+# 10 소통 중시        -> rating         (리뷰 평점 평균)
+FEATURES = (
+    "group_work", "assignment", "practical", "hands_on", "english",
+    "review_count", "required", "liberal_arts", "grading_strict", "rating",
+)
+QUESTION_COLUMNS = (
+    "firstQ", "secondQ", "thirdQ", "fourthQ", "fifthQ",
+    "sixthQ", "seventhQ", "eighthQ", "ninthQ", "tenthQ",
+)
+
+# 답변과 상관없이 평점 좋은 강의를 약간 선호
+RATING_PRIOR = 0.25
+# 리뷰 수가 이 정도면 review_count 특성이 최대(1.0)
+REVIEW_COUNT_SATURATION = 50
+
+_PRACTICAL_WORDS = ("프로젝트", "산학", "캡스톤", "실무", "창업")
+_HANDS_ON_WORDS = ("실습", "실험")
+_ENGLISH_WORDS = ("영어", "English")
+
+
+def preference_weights(answers):
+    """
+    1~5 답변 10개를 [-1, 1] 가중치 벡터로 변환 (3은 무관심 = 0). 답변이 없으면 0 벡터
+    """
+    weights = np.zeros(len(FEATURES))
+    if answers:
+        weights[:] = (np.asarray(answers, dtype=float) - 3.0) / 2.0
+    weights[FEATURES.index("rating")] += RATING_PRIOR
+    return weights
+
+
+def review_stats_from_rows(course_rows):
+    """
+    Course 행(rating_sum, rating_count, assignment_sum, group_work_sum, grading_sum)에서
+    강의명 -> (리뷰 수, 평점 평균, 과제 평균, 팀플 평균, 성적 평균)
+    """
+    stats = {}
+    for row in course_rows:
+        count = row.get("rating_count") or 0
+        if not count or not row.get("course_name"):
+            continue
+        stats[row["course_name"]] = (
+            count,
+            float(row["rating_sum"]) / count,
+            float(row["assignment_sum"]) / count,
+            float(row["group_work_sum"]) / count,
+            float(row["grading_sum"]) / count,
+        )
+    return stats
+
+
+def course_features(course, review_stats):
+    name = course["course_name"]
+    features = np.zeros(len(FEATURES))
+    features[2] = any(word in name for word in _PRACTICAL_WORDS)
+    features[3] = any(word in name for word in _HANDS_ON_WORDS)
+    features[4] = any(word in name for word in _ENGLISH_WORDS)
+    features[6] = "필수" in course["type"]
+    features[7] = course["department"] == "대양휴머니티칼리지" or "교양" in course["type"]
+
+    stats = review_stats.get(name)
+    if stats is not None:
+        count, rating, assignment, group_work, grading = stats
+        # 리뷰 평균(1~5)은 3을 기준으로 [-1, 1]
+        features[0] = (group_work - 3.0) / 2.0
+        features[1] = (assignment - 3.0) / 2.0
+        features[5] = min(math.log1p(count) / math.log1p(REVIEW_COUNT_SATURATION), 1.0)
+        features[8] = (3.0 - grading) / 2.0
+        features[9] = (rating - 3.0) / 2.0
+    return features
+
+
+def score_timetables(timetables, weights, review_stats):
+    """
+    후보 시간표들의 점수(포함된 강의 점수의 평균)를 한 번에 계산해 numpy 배열로 반환
+    """
+    if not timetables:
+        return np.zeros(0)
+
+    # 후보에 등장하는 강의마다 특성 벡터 1줄, 마지막 줄은 빈 칸 채우기용 0
+    index = {}
+    rows = []
+    width = max(len(timetable) for timetable in timetables)
+    slots = np.empty((len(timetables), width), dtype=np.intp)
+    lengths = np.empty(len(timetables))
+    for i, timetable in enumerate(timetables):
+        for j, course in enumerate(timetable):
+            key = course_key(course)
+            position = index.get(key)
+            if position is None:
+                position = index[key] = len(rows)
+                rows.append(course_features(course, review_stats))
+            slots[i, j] = position
+        slots[i, len(timetable):] = -1
+        lengths[i] = len(timetable) or 1
+
+    course_scores = np.append(np.asarray(rows).reshape(len(rows), len(FEATURES)) @ weights, 0.0)
+    return course_scores[slots].sum(axis=1) / lengths
+
+
+def top_distinct(scored, count, min_difference=MIN_DIFFERENT_COURSES):
+    """
+    (시간표, 점수) 목록에서 점수 내림차순으로 count개. 같은 점수면 앞에 있던 시간표 우선.
+    이미 고른 시간표와 강의명이 min_difference 개 미만으로 다른 시간표는 건너뜀
+    """
+    best = []
+    seen = []
+    for timetable, score in sorted(scored, key=lambda entry: -entry[1]):
+        names = frozenset(course["course_name"] for course in timetable)
+        if any(len(names - other) < max(min_difference, 1) for other in seen):
+            continue
+        seen.append(names)
+        best.append((timetable, score))
+        if len(best) == count:
+            break
+    return best
+
+
+def recommend_timetables(file_path, count, answers=None, review_stats=None, seed=None,
+                         exclude_names=frozenset(), shard=None):
+    """
+    충돌 없는 시간표 중 학생 선호도 점수가 높고 서로 MIN_DIFFERENT_COURSES 과목 이상 다른 count개를
+    (시간표, 점수) 리스트로 반환합니다. exclude_names 의 강의(이미 들은 과목)는 후보에서 제외됩니다.
+    shard=(i, n) 이면 탐색 공간의 i번째 조각만 봅니다 (functions/parallel.py 참고).
+    """
+    weights = preference_weights(answers)
+    review_stats = review_stats or {}
+
+    def course_score(course):
+        return course_features(course, review_stats) @ weights
+
+    # 선호도 점수로 탐색하면서 앞서 고른 시간표와 비슷한 것은 탐색 중에 버림
+    # (점수 상위 후보를 모은 뒤 거르면 한두 과목만 다른 후보뿐이라 몇 개 남지 않음)
+    pool = solve_timetables(get_catalog(file_path), k=count, seed=seed, score=course_score,
+                            exclude_names=exclude_names, shard=shard, min_difference=MIN_DIFFERENT_COURSES)
+    scores = score_timetables(pool, weights, review_stats)
+    return top_distinct(
+        [(timetable, round(float(score), 4)) for timetable, score in zip(pool, scores)],
+        count,
+    )
@@ -0,0 +1,263 @@
+import random
+from collections import namedtuple
+from functools import lru_cache
+
+# 학과별 할당량: 과목 수와 최소 학점 (기존 select_courses 기준과 동일)
+Quota = namedtuple("Quota", ["department", "num_courses", "target_credits"])
+
+DEFAULT_QUOTAS = (
+    Quota("대양휴머니티칼리지", 3, 9.0),
+    Quota("컴퓨터공학과", 2, 6.0),
+    Quota("소프트웨어학과", 2, 6.0),
+)
+
+# 탐색 노드 수 상한. 벽시계 시간 대신 노드 수로 끊어서 같은 입력이면 항상 같은 결과가 나옴
+DEFAULT_MAX_NODES = 200_000
+
+# 합산 순서가 달라 생기는 부동소수점 오차는 같은 점수로 봄
+SCORE_EPSILON = 1e-9
+
+WEEKDAYS = "월화수목금토일"
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+
+def _slot(hhmm, round_up=False):
+    hours, minutes = hhmm.split(":")
+    total = int(hours) * 60 + int(minutes)
+    slot, rest = divmod(total, SLOT_MINUTES)
+    return slot + 1 if round_up and rest else slot
+
+
+@lru_cache(maxsize=None)
+def time_mask(time_text):
+    """
+    "화 목 10:30~12:00" 같은 강의 시간을 주간 30분 단위 비트마스크로 변환.
+    두 강의의 마스크 AND 가 0이 아니면 시간이 겹칩니다. 형식이 틀리면 ValueError
+    """
+    tokens = time_text.split()
+    if len(tokens) < 2:
+        raise ValueError(f"Invalid course time: {time_text!r}")
+    *days, span = tokens
+    start, end = span.split("~")
+    first, last = _slot(start), _slot(end, round_up=True)
+    if last <= first:
+        raise ValueError(f"Invalid course time: {time_text!r}")
+    day_bits = (1 << (last - first)) - 1
+    mask = 0
+    for day in days:
+        if day not in WEEKDAYS:
+            raise ValueError(f"Invalid weekday in course time: {time_text!r}")
+        mask |= day_bits << (WEEKDAYS.index(day) * SLOTS_PER_DAY + first)
+    return mask
+
+
+def course_key(course):
+    # 같은 분반이 여러 줄 중복돼 있어도 하나로 취급
+    return (course["course_name"], course["time"], course["professor"], course["location"])
+
+
+# value: score(course) (score 없이 탐색하면 0)
+_Option = namedtuple("_Option", ["course", "mask", "credits", "name", "key", "value"], defaults=(0.0,))
+
+
+class _Stop(Exception):
+    pass
+
+
+class _Found(Exception):
+    # score 없는 탐색에서 이번 재시작이 새 시간표를 하나 찾음
+    pass
+
+
+def _options(courses, rng, exclude_names):
+    seen = set()
+    options = []
+    for course in courses:
+        key = course_key(course)
+        if key in seen or "".join(course["course_name"].split()) in exclude_names:
+            continue
+        try:
+            mask = time_mask(course["time"])
+        except ValueError:
+            continue  # 시간을 모르는 강의는 충돌 검사를 할 수 없으므로 제외
+        seen.add(key)
+        options.append(_Option(course, mask, course["credits"], course["course_name"], key))
+    rng.shuffle(options)
+    return options
+
+
+def solve_timetables(catalog, quotas=DEFAULT_QUOTAS, k=3, seed=None, max_nodes=DEFAULT_MAX_NODES, score=None,
+                     exclude_names=frozenset(), shard=None, min_difference=0):
+    """
+    시간이 겹치지 않고 학과별 할당량(과목 수, 최소 학점)을 채우는 시간표를 최대 k개 찾습니다.
+
+    - 같은 강의명은 한 시간표에 한 번만 들어가고, 결과 시간표끼리는 서로 다릅니다.
+    - min_difference 를 주면 결과 시간표끼리 강의명이 최소 그만큼 달라야 합니다
+      (분반만 다른 시간표를 빼려면 1, 한 과목만 바꾼 시간표까지 빼려면 2).
+    - seed 가 같으면 결과도 같습니다. max_nodes 만큼 탐색하면 그때까지 찾은 것만 돌려줍니다.
+      score 탐색은 결과 하나마다 남은 예산을 나눠 쓰고, 몫을 다 쓰면 그때까지의 최선을 결과로 넣습니다.
+    - score(course) 를 주면 분기 한정(branch and bound)으로 시간표 점수(강의 점수의 합)가 가장 높은
+      시간표를 찾고, 그다음부터는 앞서 고른 시간표들과 충분히 다른 것 중 가장 높은 것을 하나씩
+      k개까지 찾습니다. 학과별 후보를 점수 내림차순으로 시도하고, 남은 자리를 가장 좋은 강의로
+      채워도 지금까지 찾은 최선보다 못한 가지는 버립니다. 결과는 점수 내림차순입니다.
+    - score 가 없으면 시간표 하나를 찾을 때마다 학과별 후보 순서를 seed 로 다시 섞어 처음부터
+      탐색합니다(재시작). 결과끼리 앞쪽 학과의 선택까지 골고루 달라지고, 새 시간표 없이
+      탐색 공간을 다 돌면 가능한 시간표를 모두 찾은 것이므로 멈춥니다.
+    - exclude_names(띄어쓰기 없는 강의명 집합)에 든 강의는 탐색 전에 후보에서 뺍니다.
+    - shard=(i, n) 이면 첫 번째로 고르는 강의의 순번 % n == i 인 부분 트리만 탐색합니다.
+      seed 가 같으면 n개 shard 의 탐색 공간은 (탐색마다) 서로 겹치지 않고 합치면 전체가 됩니다.
+
+    할당량을 채울 수 없으면 빈 리스트를 반환합니다 (무한 루프 없음).
+    """
+    rng = random.Random(seed)
+    groups = [_options(catalog.department(quota.department), rng, exclude_names) for quota in quotas]
+    # 후보가 적은 학과부터 채워야 가지치기가 빨리 됨
+    order = sorted(range(len(quotas)), key=lambda i: len(groups[i]))
+    size = sum(quota.num_courses for quota in quotas)
+
+    # best_rest[p]: order[p:] 학과들을 (충돌을 무시하고) 가장 점수 높은 강의로 채웠을 때의 합 (상한)
+    best_rest = [0.0] * (len(order) + 1)
+    if score is not None:
+        # 섞인 순서는 같은 점수끼리의 순서로만 남음 (stable sort)
+        groups = [
+            sorted((option._replace(value=float(score(option.course))) for option in options),
+                   key=lambda option: -option.value)
+            for options in groups
+        ]
+        for position in reversed(range(len(order))):
+            index = order[position]
+            top = groups[index][:quotas[index].num_courses]
+            best_rest[position] = best_rest[position + 1] + sum(option.value for option in top)
+
+    chosen = [[] for _ in quotas]
+    seen_timetables = set()
+    found = []           # 결과 시간표 (score 가 있으면 점수 내림차순)
+    found_names = []     # 결과 시간표별 강의명 집합 (min_difference 검사용)
+    found_scores = []    # score 탐색: 결과 시간표별 점수
+    best = None          # score 탐색: 이번 탐색에서 찾은 최선 (점수, 시간표, 강의명 집합, 키)
+    spare = []           # score 탐색: 앞선 탐색들에서 끝까지 간 시간표 (다음 탐색의 초기 최선 후보)
+    ceiling = None       # score 탐색: 직전 결과의 점수. 제약만 늘어나므로 이번 탐색의 최선도 이보다 높을 수 없음
+    nodes = 0
+    node_limit = max_nodes  # score 탐색은 남은 예산을 남은 결과 수로 나눠 탐색마다 따로 끊음
+
+    def emit(total, names):
+        nonlocal best
+        key = frozenset(option.key for group in chosen for option in group)
+        if key in seen_timetables:
+            return
+        # 출력은 할당량 순서(교양 → 컴공 → 소웨)
+        timetable = [option.course for group in chosen for option in group]
+        if score is None:
+            seen_timetables.add(key)
+            found.append(timetable)
+            found_names.append(names)
+            raise _Found
+        entry = (total, timetable, names, key)
+        spare.append(entry)
+        # 같은 점수면 먼저 찾은 시간표를 남김
+        if best is None or total > best[0]:
+            best = entry
+            if ceiling is not None and total >= ceiling - SCORE_EPSILON:
+                raise _Found  # 직전 결과와 같은 점수면 더 찾아볼 필요 없음
+
+    def search(position, start, credits, mask, names, total, overlaps):
+        nonlocal nodes
+        nodes += 1
+        if nodes > node_limit:
+            raise _Stop
+
+        index = order[position]
+        quota, options, picked = quotas[index], groups[index], chosen[index]
+        need = quota.num_courses - len(picked)
+
+        if need == 0:
+            if credits < quota.target_credits:
+                return
+            if position + 1 == len(order):
+                emit(total, names)
+            else:
+                search(position + 1, 0, 0.0, mask, names, total, overlaps)
+            return
+
+        # 전방 검사: 남은 후보 중 지금 시간표와 안 겹치는 것이 need 개 미만이면 포기
+        free = sum(1 for option in options[start:] if not option.mask & mask and option.name not in names)
+        if free < need:
+            return
+
+        step = 1
+        if shard is not None and position == 0 and not picked:
+            start, step = start + shard[0], shard[1]
+        for i in range(start, len(options) - need + 1, step):
+            option = options[i]
+            if best is not None:
+                # 점수순이라 i 부터 need 개가 이 학과에서 더 고를 수 있는 최선. 이것도 최선 이하면 뒤도 모두 이하
+                bound = total + sum(rest.value for rest in options[i:i + need]) + best_rest[position + 1]
+                if bound <= best[0]:
+                    break
+            if option.mask & mask or option.name in names:
+                continue
+            # overlaps[j]: 지금까지 고른 강의 중 j번째 결과에도 있는 강의 수. 남은 자리를 모두 다른 강의로
+            # 채워도 차이가 min_difference 보다 작으면 이 가지의 시간표는 j번째와 너무 비슷함
+            child_overlaps = tuple(
+                overlap + (option.name in other) for overlap, other in zip(overlaps, found_names)
+            )
+            if any(size - overlap < min_difference for overlap in child_overlaps):
+                continue
+            picked.append(option)
+            search(position, i + 1, credits + option.credits, mask | option.mask, names | {option.name},
+                   total + option.value, child_overlaps)
+            picked.pop()
+
+    def restart():
+        # 예외로 빠져나와 pop 되지 않은 선택을 비우고 처음부터 탐색
+        for picked in chosen:
+            picked.clear()
+        search(0, 0, 0.0, 0, frozenset(), 0.0, (0,) * len(found_names))
+
+    if quotas and k > 0 and score is None:
+        try:
+            while len(found) < k:
+                try:
+                    restart()
+                except _Found:
+                    # 다음 시간표는 다른 순서로 처음부터 찾음 (앞쪽 학과도 다른 강의부터 시도)
+                    for options in groups:
+                        rng.shuffle(options)
+                    continue
+                break  # 새 시간표 없이 전체를 다 돌았음
+        except _Stop:
+            pass
+
+    while quotas and score is not None and len(found) < k and nodes < max_nodes:
+        # 앞선 탐색에서 본 시간표 중 지금 결과들과도 충분히 다른 최선으로 시작하면
+        # 처음부터 그보다 못한 가지를 버릴 수 있음 (실제 시간표라서 결과는 그대로 최선)
+        best = None
+        for entry in spare:
+            if entry[3] in seen_timetables or (best is not None and entry[0] <= best[0]):
+                continue
+            if all(size - len(entry[2] & other) >= min_difference for other in found_names):
+                best = entry
+        # 1등은 가장 중요하니 예산의 절반까지, 나머지는 남은 예산을 남은 결과 수로 나눠서
+        if found or k == 1:
+            node_limit = nodes + (max_nodes - nodes) // (k - len(found))
+        else:
+            node_limit = max_nodes // 2
+        try:
+            if best is None or ceiling is None or best[0] < ceiling - SCORE_EPSILON:
+                restart()
+        except (_Found, _Stop):
+            pass  # 직전 결과와 같은 점수를 찾았거나 이번 몫의 예산을 다 씀
+        if best is None:
+            break  # 앞의 결과들과 충분히 다른 시간표가 없거나 예산 안에 못 찾음
+        _, timetable, names, key = best
+        seen_timetables.add(key)
+        found.append(timetable)
+        found_names.append(names)
+        found_scores.append(best[0])
+        ceiling = best[0]
+
+    if score is not None:
+        # 예산에 걸린 탐색이 있으면 순서가 어긋날 수 있어 점수순으로 정리 (같은 점수는 찾은 순서)
+        found = [timetable for _, timetable in sorted(zip(found_scores, found), key=lambda entry: -entry[0])]
+    return found
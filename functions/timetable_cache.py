@@ -0,0 +1,103 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# 생성한 시간표 묶음을 보관하는 시간(초)과 최대 개수
+TIMETABLE_CACHE_TTL = float(os.getenv("TIMETABLE_CACHE_TTL", 3600))
+TIMETABLE_CACHE_SIZE = int(os.getenv("TIMETABLE_CACHE_SIZE", 2000))
+
+
+def generation_id(student_id, answers, catalog_version, taken_names, count=3, shards=1):
+    """
+    (학번, 최근 Questions 답변, 강의 목록 버전, 이수 과목, 요청 개수, 탐색 조각 수)가 같으면 같은 id.
+    캐시 키이자 시간표 생성 seed 로 쓰이므로 프로세스가 달라도 같은 값이 나오게 sha1 로 만듭니다.
+    조각 수(TIMETABLE_WORKERS)가 다르면 같은 seed 라도 결과가 다를 수 있어서 키에 포함합니다.
+    """
+    text = "|".join([
+        str(student_id),
+        ",".join(map(str, answers)) if answers else "-",
+        str(catalog_version),
+        ",".join(sorted(taken_names)),
+        str(count),
+    ] + ([f"shards={shards}"] if shards != 1 else []))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def seed_for(generation):
+    return int(generation, 16)
+
+
+class TimetableCache:
+    """
+    generation_id -> [(시간표, 점수), ...] LRU + TTL 캐시.
+    학생별로 마지막에 생성한 묶음을 기억해 /save-timetable 이 choice_id 만으로 시간표를 찾게 합니다.
+    """
+
+    def __init__(self, ttl=TIMETABLE_CACHE_TTL, max_entries=TIMETABLE_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # generation_id -> (만든 시각, 결과, 학번)
+        self._latest = {}              # 학번 -> 마지막 generation_id
+        self._lock = threading.Lock()
+
+    def get(self, generation):
+        with self._lock:
+            entry = self._entries.get(generation)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self.ttl:
+                del self._entries[generation]
+                if self._latest.get(entry[2]) == generation:
+                    del self._latest[entry[2]]
+                return None
+            self._entries.move_to_end(generation)
+            return entry[1]
+
+    def put(self, student_id, generation, result):
+        with self._lock:
+            self._entries[generation] = (time.monotonic(), result, str(student_id))
+            self._entries.move_to_end(generation)
+            self._latest[str(student_id)] = generation
+            while len(self._entries) > self.max_entries:
+                evicted, (_, _, owner) = self._entries.popitem(last=False)
+                if self._latest.get(owner) == evicted:
+                    del self._latest[owner]
+
+    def touch(self, student_id, generation):
+        """
+        캐시에서 꺼내 쓴 묶음도 학생의 마지막 생성분으로 기록 (choice_id 만 보낸 /save-timetable 이 방금 본 묶음을 찾도록)
+        """
+        with self._lock:
+            entry = self._entries.get(generation)
+            if entry is not None and entry[2] == str(student_id):
+                self._latest[str(student_id)] = generation
+
+    def latest(self, student_id):
+        """
+        학생이 마지막으로 생성한 generation_id (없거나 만료됐으면 None)
+        """
+        generation = self._latest.get(str(student_id))
+        if generation is None or self.get(generation) is None:
+            return None
+        return generation
+
+    def choice(self, student_id, choice_id, generation=None):
+        """
+        generation(없으면 학생의 마지막 생성분)에서 choice_id 번째 시간표. 없거나 다른 학생의 묶음이면 None
+        """
+        generation = generation or self.latest(student_id)
+        result = self.get(generation) if generation else None
+        # 다른 학생의 generation_id 로는 꺼낼 수 없음
+        with self._lock:
+            entry = self._entries.get(generation) if generation else None
+            owner = entry[2] if entry is not None else None
+        if owner != str(student_id):
+            return None
+        if not result or not 1 <= choice_id <= len(result):
+            return None
+        return result[choice_id - 1][0]
+
+
+timetable_cache = TimetableCache()
@@ -1,16 +1,36 @@
-from fastapi import FastAPI, HTTPException, Form, UploadFile, File, Depends, Query
+from fastapi import FastAPI, HTTPException, Form, UploadFile, File, Depends, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
-from database.connect import get_db_connection
-from auth import create_jwt_token, verify_refresh_token
-from views.user_info import get_user_info, UserInfoResponse
-from views.get_csv import read_excel_from_file
+from database.connect import pooled_connection
+from database.executor import run_db
+from database.course_cache import course_cache
+from database import review_stats
+from database.course_data import insert_course_data
+from database.taken_courses import taken_courses
+from database.reference_data import reference_data
+from database import popularity
+from auth import create_jwt_token, verify_refresh_token, require_admin
+from metrics import MetricsMiddleware, render as render_metrics, timed_call
+from database.query_detector import QUERY_DETECTOR, QueryDetectorMiddleware
+from profiler import PROFILING_ENABLED, ProfilerMiddleware, profile_store
+from views.user_info import portal_logins, UserInfoResponse
+from views.get_csv import iter_transcript_rows
+from views.calculate import en_result as engineering_audit, result as graduation_audit
+from views.cohort import AUDIT_AREAS, CohortWorkers, iter_jsonl, load_cohort
 from fastapi import Header
 import jwt
 import mysql.connector
-from functions.test import generate_timetables
+from functions.scoring import QUESTION_COLUMNS, review_stats_from_rows
+from functions.parallel import TimetableWorkers
+from functions.timetable_cache import generation_id, seed_for, timetable_cache
+from functions.catalog import COURSE_FILE, get_catalog
+from contextlib import asynccontextmanager
+import asyncio
 import os
+import time
 import traceback
 from langchain.chat_models import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate 
@@ -18,7 +38,44 @@ from langchain.schema import SystemMessage, HumanMessage
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-app = FastAPI()
+# 시간표 탐색 (TIMETABLE_WORKERS > 1 이면 여러 프로세스로 나눠서 탐색)
+timetable_workers = TimetableWorkers(COURSE_FILE)
+# 코호트 일괄 검사 (큰 코호트만 프로세스 풀 사용, 풀은 처음 필요할 때 띄움)
+cohort_workers = CohortWorkers()
+
+async def refresh_popularity_periodically(interval):
+    # 추천용 수강 횟수(subject_popularity)를 주기적으로 user_grade 에 맞춤. 실패해도 다음 주기에 다시 시도
+    # 워커들이 같은 시각(interval 초 경계)에 깨어나므로 GET_LOCK 을 먼저 잡은 하나만 계산함
+    while True:
+        await asyncio.sleep(interval - time.time() % interval)
+        try:
+            await run_db(popularity.refresh)
+        except Exception:
+            traceback.print_exc()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 시간표 생성용 강의 목록은 시작할 때 한 번 파싱 (이후 파일이 바뀌면 자동으로 다시 읽음)
+    get_catalog(COURSE_FILE)
+    # 졸업요건 검사 기준 테이블 스냅샷. DB가 아직 안 떠 있으면 첫 검사 때 다시 읽음
+    try:
+        await run_db(reference_data.get)
+    except Exception:
+        traceback.print_exc()
+    await run_in_threadpool(timetable_workers.start)
+    popularity_refresher = None
+    if popularity.POPULARITY_REFRESH_INTERVAL > 0:
+        popularity_refresher = asyncio.create_task(
+            refresh_popularity_periodically(popularity.POPULARITY_REFRESH_INTERVAL)
+        )
+    yield
+    if popularity_refresher is not None:
+        popularity_refresher.cancel()
+    timetable_workers.shutdown()
+    cohort_workers.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -29,6 +86,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 개발/스테이징: 요청별 N+1 / 느린 쿼리 표시 (QUERY_DETECTOR=1)
+if QUERY_DETECTOR:
+    app.add_middleware(QueryDetectorMiddleware)
+
+# 관리자가 X-Profile: 1 헤더로 요청 하나를 프로파일링 (PROFILING_ENABLED=1)
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
+# 라우트별 응답 시간/쿼리 수 (가장 바깥 미들웨어라서 CORS 처리 시간까지 포함)
+app.add_middleware(MetricsMiddleware)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """
+    Prometheus 스크랩용 지표 (text exposition format)
+    """
+    return Response(content=render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # CourseReview 모델 정의
 class CourseReview(BaseModel):
     course_id: str
@@ -47,98 +123,112 @@ async def create_review(review: CourseReview):
     if not (1 <= review.rating <= 5):
         raise HTTPException(status_code=400, detail="Rating must be between 1 and 5.")
 
-    connection = get_db_connection()
-    cursor = connection.cursor()
+    def insert_review():
+        with pooled_connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+
+            try:
+                # 새로운 리뷰 삽입
+                cursor.execute(
+                    """
+                    INSERT INTO Course_Review (course_id, user_id, comment, rating, assignment, group_work, grading)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    (review.course_id, review.student_id, review.review_text, review.rating, review.assignment, review.group_work, review.grading),
+                )
 
-    try:
-        # 새로운 리뷰 삽입
-        cursor.execute(
-            """
-            INSERT INTO Course_Review (course_id, user_id, comment, rating, assignment, group_work, grading)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """,
-            (review.course_id, review.student_id, review.review_text, review.rating, review.assignment, review.group_work, review.grading),
-        )
+                # Course 행의 누적값(rating_sum/rating_count 등)과 avg_rating 을 같은 트랜잭션에서 갱신
+                review_stats.add_review(cursor, review)
 
-        # 평균 평점 계산
-        cursor.execute(
-            """
-            SELECT AVG(rating) AS avg_rating
-            FROM Course_Review
-            WHERE course_id = %s
-            """,
-            (review.course_id,)
-        )
-        avg_rating = cursor.fetchone()[0]
-
-        # Course 테이블의 avg_rating 필드 업데이트
-        cursor.execute(
-            """
-            UPDATE Course
-            SET avg_rating = %s
-            WHERE course_id = %s
-            """,
-            (avg_rating, review.course_id)
-        )
+                # 변경 사항 커밋
+                connection.commit()
 
-        # 변경 사항 커밋
-        connection.commit()
+                # 바뀐 Course 행을 강의 목록 캐시에 반영
+                cursor.execute("SELECT * FROM Course WHERE course_id = %s", (review.course_id,))
+                return cursor.fetchone()
 
-    except mysql.connector.Error as err:
-        connection.rollback()
-        raise HTTPException(status_code=500, detail=f"Database error: {err}")
-    finally:
-        cursor.close()
-        connection.close()
+            except mysql.connector.Error as err:
+                connection.rollback()
+                raise HTTPException(status_code=500, detail=f"Database error: {err}")
+            finally:
+                cursor.close()
+
+    course_row = await run_db(insert_review)
+    if course_row:
+        course_cache.patch(course_row)
+    else:
+        course_cache.invalidate()
 
     return {"status": "success", "message": "Review submitted successfully."}
 
 
-@app.get("/courses", tags=['Course'])
-async def get_all_courses():
-    connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)
+def fetch_courses():
+    """
+    Course 테이블 전체 조회 (course_cache 갱신용, DB 스레드에서 실행)
+    """
+    with pooled_connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+
+        try:
+            cursor.execute("SELECT * FROM Course")
+            return cursor.fetchall()
+        except mysql.connector.Error as err:
+            raise HTTPException(status_code=500, detail=f"Database error: {err}")
+        finally:
+            cursor.close()
 
-    try:
-        cursor.execute("SELECT * FROM Course")
-        courses = cursor.fetchall()
-    except mysql.connector.Error as err:
-        raise HTTPException(status_code=500, detail=f"Database error: {err}")
-    finally:
-        cursor.close()
-        connection.close()
 
-    if not courses:
+async def get_course_snapshot():
+    snapshot = course_cache.get()
+    if snapshot is None:
+        snapshot = await run_db(course_cache.refresh, fetch_courses)
+    return snapshot
+
+
+@app.get("/courses", tags=['Course'])
+async def get_all_courses(if_none_match: Optional[str] = Header(default=None)):
+    """
+    전체 강의 목록. 메모리 스냅샷(COURSE_CACHE_TTL 초)에서 미리 직렬화된 JSON을 그대로 반환
+    """
+    snapshot = await get_course_snapshot()
+
+    if not snapshot.count:
         raise HTTPException(status_code=404, detail="No courses found.")
 
-    return {"status": "success", "data": courses}
+    headers = {"ETag": snapshot.etag, "X-Catalog-Version": str(snapshot.version)}
+    if if_none_match == snapshot.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
 
 @app.get("/courses/{course_id}/comments", tags=["Course"])
 async def get_comments_by_course_id(course_id: int):
-    connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)
-
-    try:
-        # 댓글 데이터 가져오기
-        query_comments = "SELECT * FROM Course_Review WHERE course_id = %s"
-        cursor.execute(query_comments, (course_id,))
-        comments = cursor.fetchall()
-
-        # 평균 평점 가져오기 (DECIMAL/FLOAT 타입 유지)
-        query_avg_rating = """
-            SELECT avg_rating AS avg_rating 
-            FROM Course 
-            WHERE course_id = %s
-        """
-        cursor.execute(query_avg_rating, (course_id,))
-        avg_rating_row = cursor.fetchone()
-        avg_rating = float(avg_rating_row['avg_rating']) if avg_rating_row and avg_rating_row['avg_rating'] is not None else None
-        avg_rating = float(f"{avg_rating:.2f}")
-    except mysql.connector.Error as err:
-        raise HTTPException(status_code=500, detail=f"Database error: {err}")
-    finally:
-        cursor.close()
-        connection.close()
+    def fetch_comments():
+        with pooled_connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+
+            try:
+                # 댓글 데이터 가져오기
+                query_comments = "SELECT * FROM Course_Review WHERE course_id = %s"
+                cursor.execute(query_comments, (course_id,))
+                comments = cursor.fetchall()
+
+                # 평균 평점 가져오기 (DECIMAL/FLOAT 타입 유지)
+                query_avg_rating = """
+                    SELECT avg_rating AS avg_rating 
+                    FROM Course 
+                    WHERE course_id = %s
+                """
+                cursor.execute(query_avg_rating, (course_id,))
+                avg_rating_row = cursor.fetchone()
+                avg_rating = float(avg_rating_row['avg_rating']) if avg_rating_row and avg_rating_row['avg_rating'] is not None else None
+                avg_rating = float(f"{avg_rating:.2f}")
+                return comments, avg_rating
+            except mysql.connector.Error as err:
+                raise HTTPException(status_code=500, detail=f"Database error: {err}")
+            finally:
+                cursor.close()
+
+    comments, avg_rating = await run_db(fetch_comments)
 
     if not comments:
         raise HTTPException(status_code=404, detail="No comments found for the given course ID.")
@@ -153,12 +243,10 @@ async def login(student_id: str = Form(...), password: str = Form(...)):
     """
     로그인 API (Refresh Token만 반환)
     """
-    connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)
-    
     try:
-        # 사용자 정보 가져오기
-        user_info = get_user_info(id=student_id, pw=password)
+        # 사용자 정보 가져오기 (포털 로그인이 오래 걸리므로 DB 연결은 그 뒤에 빌림)
+        # PORTAL_CACHE_TTL 안에 같은 비밀번호로 로그인했으면 포털에 가지 않음
+        user_info = await portal_logins.login(student_id, password)
         if not user_info:
             raise HTTPException(status_code=401, detail="Invalid student ID or password.")
 
@@ -173,12 +261,20 @@ async def login(student_id: str = Form(...), password: str = Form(...)):
             username = VALUES(username),
             refresh_token = VALUES(refresh_token)
         """
-        cursor.execute(update_query, (
-            user_info['id'],
-            user_info['name'],
-            refresh_token
-        ))
-        connection.commit()
+        def save_refresh_token():
+            with pooled_connection() as connection:
+                cursor = connection.cursor(dictionary=True)
+                try:
+                    cursor.execute(update_query, (
+                        user_info['id'],
+                        user_info['name'],
+                        refresh_token
+                    ))
+                    connection.commit()
+                finally:
+                    cursor.close()
+
+        await run_db(save_refresh_token)
 
         return {
             "refresh_token": refresh_token,
@@ -189,9 +285,6 @@ async def login(student_id: str = Form(...), password: str = Form(...)):
         raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        cursor.close()
-        connection.close()
 
 @app.post("/token/refresh", tags=['Auth'])
 async def refresh_access_token(authorization: str = Header(default=None)):
@@ -205,35 +298,35 @@ async def refresh_access_token(authorization: str = Header(default=None)):
         refresh_token = authorization.split('Bearer ')[1]
         
         # DB에서 refresh token 확인
-        connection = get_db_connection()
-        cursor = connection.cursor(dictionary=True)
-        
-        try:
-            query = "SELECT user_id FROM User WHERE refresh_token = %s"
-            cursor.execute(query, (refresh_token,))
-            user = cursor.fetchone()
-            
-            if not user:
-                raise HTTPException(status_code=401, detail="Refresh token not found")
-                
-            # 토큰 검증
-            payload = verify_refresh_token(refresh_token)
-            student_id = payload.get("sub")
-            if not student_id:
-                raise HTTPException(status_code=401, detail="Invalid refresh token")
-
-            # 새로운 access token 생성
-            access_token = create_jwt_token(student_id, "access", expires_delta=1)
-            
-            return {
-                "access_token": access_token,
-                "token_type": "bearer",
-            }
-            
-        finally:
-            cursor.close()
-            connection.close()
+        def fetch_token_owner():
+            with pooled_connection() as connection:
+                cursor = connection.cursor(dictionary=True)
+                try:
+                    query = "SELECT user_id FROM User WHERE refresh_token = %s"
+                    cursor.execute(query, (refresh_token,))
+                    return cursor.fetchone()
+                finally:
+                    cursor.close()
+
+        user = await run_db(fetch_token_owner)
+
+        if not user:
+            raise HTTPException(status_code=401, detail="Refresh token not found")
             
+        # 토큰 검증
+        payload = verify_refresh_token(refresh_token)
+        student_id = payload.get("sub")
+        if not student_id:
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+        # 새로운 access token 생성
+        access_token = create_jwt_token(student_id, "access", expires_delta=1)
+        
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+        }
+
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Refresh token has expired")
     
@@ -247,7 +340,7 @@ async def get_user_info_endpoint(user_id: str, password: str):
     학번과 비밀번호를 입력하면 그거에 관련한 정보 반환 : 학번, 이름, 전공, 고전독서
     """
 
-    user_info = get_user_info(id=user_id, pw=password)
+    user_info = await portal_logins.login(user_id, password)
     if not user_info:
         raise HTTPException(status_code=404, detail="User not found.")
     return user_info
@@ -262,49 +355,32 @@ async def upload_excel(file: UploadFile = File(...), student_id: str = Query(...
     if not file.filename.endswith((".xls", ".xlsx")):
         raise HTTPException(status_code=400, detail="Invalid file format. Please upload an Excel file.")
     
-    data = read_excel_from_file(file)
+    def insert_transcript():
+        with pooled_connection() as connection:
+            cursor = connection.cursor()
 
-    connection = get_db_connection()
-    cursor = connection.cursor()
-    
+            try:
+                # 엑셀을 한 행씩 읽는 대로 한 트랜잭션 안에서 묶음 INSERT (파싱도 이 스레드에서 진행)
+                inserted = insert_course_data(cursor, student_id, iter_transcript_rows(file))
 
-    
-    try:
-        # 엑셀 파일의 각 행을 데이터베이스에 삽입
-        for i in range(3,len(data)) :
+                # 변경 사항 커밋
+                connection.commit()
+                return inserted
 
-            cursor.execute(
-                """
-                INSERT INTO course_data (
-                    user_id, year, semester, course_code, 
-                    course_name, course_type, credit, grade, choice, grade_detail
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    student_id, # request에서 받은 학번
-                    data[i]['년도'],
-                    data[i]['학기'],
-                    data[i]['과목코드'],
-                    data[i]['과목명'],
-                    data[i]['이수구분'],
-                    data[i]['학점'],
-                    data[i]['평점'],
-                    data[i]['비고2'],
-                    data[i]['성적등급']
-                )
-            )
-
-        # 변경 사항 커밋
-        connection.commit()
+            except HTTPException:
+                # 엑셀 검증 실패 시 이미 보낸 묶음도 취소
+                connection.rollback()
+                raise
+            except mysql.connector.Error as err:
+                connection.rollback()
+                raise HTTPException(status_code=500, detail=f"Database error: {err}")
+            finally:
+                cursor.close()
 
-    except mysql.connector.Error as err:
-        connection.rollback()
-        raise HTTPException(status_code=500, detail=f"Database error: {err}")
-    finally:
-        cursor.close()
-        connection.close()
+    inserted = await run_db(insert_transcript)
+    taken_courses.invalidate(student_id)
 
-    return {"status": "success", "message": "Data inserted successfully."}
+    return {"status": "success", "message": "Data inserted successfully.", "inserted": inserted}
 
 
 
@@ -315,35 +391,34 @@ async def get_course_data(student_id: str = Query(...)):
     학번을 넣고 수강한 과목 전부 반환
     """
 
-    connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)  # dictionary=True는 결과를 딕셔너리 형식으로 반환
-
-    try:
-        # student_id와 연관된 데이터를 조회하는 쿼리
-        cursor.execute(
-            """
-            SELECT *
-            FROM course_data
-            WHERE user_id = %s
-            """,
-            (student_id,)
-        )
-        
-        # 조회된 데이터 가져오기
-        result = cursor.fetchall()
-
-        # 데이터가 없을 경우
-        if not result:
-            raise HTTPException(status_code=404, detail="No data found for the provided student ID.")
-        
-        return {"status": "success", "data": result}
-    
-    except mysql.connector.Error as err:
-        raise HTTPException(status_code=500, detail=f"Database error: {err}")
+    def fetch_course_data():
+        with pooled_connection() as connection:
+            cursor = connection.cursor(dictionary=True)  # dictionary=True는 결과를 딕셔너리 형식으로 반환
+            try:
+                # student_id와 연관된 데이터를 조회하는 쿼리
+                cursor.execute(
+                    """
+                    SELECT *
+                    FROM course_data
+                    WHERE user_id = %s
+                    """,
+                    (student_id,)
+                )
+            
+                # 조회된 데이터 가져오기
+                return cursor.fetchall()
+            except mysql.connector.Error as err:
+                raise HTTPException(status_code=500, detail=f"Database error: {err}")
+            finally:
+                cursor.close()
+
+    result = await run_db(fetch_course_data)
+
+    # 데이터가 없을 경우
+    if not result:
+        raise HTTPException(status_code=404, detail="No data found for the provided student ID.")
     
-    finally:
-        cursor.close()
-        connection.close()
+    return {"status": "success", "data": result}
 
 
 class QuestionSelection(BaseModel):
@@ -410,57 +485,60 @@ async def submit_questions(selection: QuestionSelection):
         ]
         
         # LangChain 모델을 통해 응답 생성
-        response = ai_model(messages)
+        with timed_call("openai_chat"):
+            response = await run_in_threadpool(ai_model, messages)
         ai_comment = response.content.strip()
     except Exception as e:
         # 에러 처리
         error_details = traceback.format_exc()
         raise HTTPException(status_code=500, detail=f"Error communicating with GPT: {e}\nDetails: {error_details}")
     
-    # DB 저장
-    connection = get_db_connection()
-    cursor = connection.cursor()
+    # DB 저장 (GPT 응답을 받은 뒤에 연결을 빌림)
+    def insert_questions():
+        with pooled_connection() as connection:
+            cursor = connection.cursor()
     
-    try:
-        # Questions 테이블에 저장
-        cursor.execute(
-            """
-            INSERT INTO Questions (
-                user_id, firstQ, secondQ, thirdQ, fourthQ, fifthQ, sixthQ, seventhQ, eighthQ, ninthQ, tenthQ
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-            (
-                selection.student_id,
-                selection.selected_questions[0],
-                selection.selected_questions[1],
-                selection.selected_questions[2],
-                selection.selected_questions[3],
-                selection.selected_questions[4],
-                selection.selected_questions[5],
-                selection.selected_questions[6],
-                selection.selected_questions[7],
-                selection.selected_questions[8],
-                selection.selected_questions[9],
-            )
-        )
-        question_id = cursor.lastrowid
-        # ciffy_comment 테이블에 댓글 1개 저장
-        cursor.execute(
-            """
-            INSERT INTO ciffy_comment (question_id, comment)
-            VALUES (%s, %s)
-            """,
-            (question_id, ai_comment)
-        )
+            try:
+                # Questions 테이블에 저장
+                cursor.execute(
+                    """
+                    INSERT INTO Questions (
+                        user_id, firstQ, secondQ, thirdQ, fourthQ, fifthQ, sixthQ, seventhQ, eighthQ, ninthQ, tenthQ
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    (
+                        selection.student_id,
+                        selection.selected_questions[0],
+                        selection.selected_questions[1],
+                        selection.selected_questions[2],
+                        selection.selected_questions[3],
+                        selection.selected_questions[4],
+                        selection.selected_questions[5],
+                        selection.selected_questions[6],
+                        selection.selected_questions[7],
+                        selection.selected_questions[8],
+                        selection.selected_questions[9],
+                    )
+                )
+                question_id = cursor.lastrowid
+                # ciffy_comment 테이블에 댓글 1개 저장
+                cursor.execute(
+                    """
+                    INSERT INTO ciffy_comment (question_id, comment)
+                    VALUES (%s, %s)
+                    """,
+                    (question_id, ai_comment)
+                )
         
-        # 변경 사항 커밋
-        connection.commit()
-    except mysql.connector.Error as err:
-        connection.rollback()
-        raise HTTPException(status_code=500, detail=f"Database error: {err}")
-    finally:
-        cursor.close()
-        connection.close()
+                # 변경 사항 커밋
+                connection.commit()
+            except mysql.connector.Error as err:
+                connection.rollback()
+                raise HTTPException(status_code=500, detail=f"Database error: {err}")
+            finally:
+                cursor.close()
+
+    await run_db(insert_questions)
 
     return {
         "message": "Questions submitted successfully",
@@ -471,32 +549,79 @@ async def submit_questions(selection: QuestionSelection):
 
 
 @app.get("/generate-timetable/{student_id}", tags=["AI generate TimeTable"])
-async def generate_timetable_api(student_id: int):
+async def generate_timetable_api(student_id: int, count: int = Query(3, ge=1, le=50, description="추천받을 시간표 개수")):
     """
     학생 ID 던지면 그거에 맞는 테이블 DB 에 저장
     이거 먼저 쓰면 절대 안됨 위에 API 먼저 사용하고 이거 사용해야됨 둘이 햄버거와 콜라임
+    후보 시간표들을 학생의 질문 답변(Questions)과 강의 리뷰 누적값으로 점수 매겨 상위 count개(기본 3개)를 반환
     """
-    file_path = "txt/course.txt"  # 학생 ID별 강의 데이터 경로
+    file_path = COURSE_FILE  # 강의 데이터 경로
+
+    def fetch_answers():
+        with pooled_connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                # 가장 최근에 제출한 답변
+                cursor.execute(
+                    f"""
+                    SELECT {", ".join(QUESTION_COLUMNS)}
+                    FROM Questions
+                    WHERE user_id = %s
+                    ORDER BY question_id DESC
+                    LIMIT 1
+                    """,
+                    (student_id,)
+                )
+                row = cursor.fetchone()
+            except mysql.connector.Error as err:
+                raise HTTPException(status_code=500, detail=f"Database error: {err}")
+            finally:
+                cursor.close()
+        return [row[column] for column in QUESTION_COLUMNS] if row else None
 
     try:
-        # 3개의 시간표를 생성
-        timetables = generate_timetables(file_path, count=3)
+        answers = await run_db(fetch_answers)
+        course_review_stats = review_stats_from_rows((await get_course_snapshot()).rows)
+        # 이미 들은 과목(course_data)은 탐색 전에 후보에서 제외
+        taken = await run_db(taken_courses.get, student_id)
+
+        # 같은 (학번, 답변, 강의 목록 버전, 이수 과목, 개수, 조각 수)이면 같은 seed 로 같은 결과 -> 캐시 재사용
+        generation = generation_id(
+            student_id, answers, get_catalog(file_path).version, taken, count, timetable_workers.shards(count)
+        )
+        scored = timetable_cache.get(generation)
+        if scored is None:
+            # 시간이 겹치지 않는 후보들 중 선호도 점수 상위 count개
+            scored = await timetable_workers.recommend(
+                count, answers, course_review_stats, seed=seed_for(generation), exclude_names=taken
+            )
+            if scored:
+                timetable_cache.put(student_id, generation, scored)
+        else:
+            # 캐시에서 꺼낸 묶음도 이 학생의 마지막 생성분 (/save-timetable 의 choice_id 기준)
+            timetable_cache.touch(student_id, generation)
+        if not scored:
+            raise HTTPException(status_code=404, detail="No conflict-free timetable could be built from the course data.")
 
         # 각 시간표에 choice_id 추가
         timetables_with_choice_id = [
             {
                 "choice_id": idx + 1,
+                "score": score,
                 "timetable": timetable
             }
-            for idx, timetable in enumerate(timetables)
+            for idx, (timetable, score) in enumerate(scored)
         ]
 
         return {
             "student_id": student_id,
             "message": "success",
+            "generation_id": generation,
             "timetables": timetables_with_choice_id
         }
 
+    except HTTPException:
+        raise
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"No course data found for student_id {student_id}")
     except Exception as e:
@@ -528,7 +653,9 @@ class Course(BaseModel):
 class TimetableSaveRequest(BaseModel):
     student_id: int
     choice_id: int
-    timetable: List[Course]
+    # timetable 을 생략하면 /generate-timetable 이 캐시해 둔 결과에서 choice_id 로 찾음
+    timetable: Optional[List[Course]] = None
+    generation_id: Optional[str] = None
 
     class Config:
         schema_extra = {
@@ -554,54 +681,64 @@ class TimetableSaveRequest(BaseModel):
 async def save_timetable(payload: TimetableSaveRequest):
     """
     선택된 시간표를 DB에 저장하는 API. 동일한 course_set_id를 한 번에 부여.
+    timetable 없이 choice_id(+ generation_id)만 보내면 최근 생성된 시간표 중에서 골라 저장.
     """
     student_id = payload.student_id
     choice_id = payload.choice_id
     timetable = payload.timetable
+    if timetable is None:
+        cached = timetable_cache.choice(student_id, choice_id, payload.generation_id)
+        if cached is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Generated timetable not found or expired. Generate again or send the timetable."
+            )
+        timetable = [Course(**course) for course in cached]
 
-    # DB 연결
-    connection = get_db_connection()
-    cursor = connection.cursor()
+    def insert_timetable():
+        with pooled_connection() as connection:
+            cursor = connection.cursor()
 
-    try:
-        # 마지막 course_set_id 값을 가져옴
-        cursor.execute("SELECT IFNULL(MAX(course_set_id), 0) FROM timetables")
-        last_course_set_id = cursor.fetchone()[0]
-        print(last_course_set_id)
-        # 새로운 course_set_id 생성
-        new_course_set_id = last_course_set_id + 1
+            try:
+                # 마지막 course_set_id 값을 가져옴
+                cursor.execute("SELECT IFNULL(MAX(course_set_id), 0) FROM timetables")
+                last_course_set_id = cursor.fetchone()[0]
+                # 새로운 course_set_id 생성
+                new_course_set_id = last_course_set_id + 1
 
 
         
-        # 동일한 course_set_id로 모든 레코드 삽입
-        for course in timetable:
-            cursor.execute(
-                """
-                INSERT INTO timetables (
-                    course_set_id, student_id, choice_id, department, course_name, type, credits, time, location, professor
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    new_course_set_id,  # 동일한 course_set_id
-                    student_id,
-                    choice_id,
-                    course.department,
-                    course.course_name,
-                    course.type,
-                    course.credits,
-                    course.time,
-                    course.location,
-                    course.professor
-                )
-            )
-        connection.commit()
-
-    except Exception as e:
-        connection.rollback()
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-    finally:
-        cursor.close()
-        connection.close()
+                # 동일한 course_set_id로 모든 레코드 삽입
+                for course in timetable:
+                    cursor.execute(
+                        """
+                        INSERT INTO timetables (
+                            course_set_id, student_id, choice_id, department, course_name, type, credits, time, location, professor
+                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        """,
+                        (
+                            new_course_set_id,  # 동일한 course_set_id
+                            student_id,
+                            choice_id,
+                            course.department,
+                            course.course_name,
+                            course.type,
+                            course.credits,
+                            course.time,
+                            course.location,
+                            course.professor
+                        )
+                    )
+                connection.commit()
+                return new_course_set_id
+
+            except Exception as e:
+                connection.rollback()
+                raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+            finally:
+                cursor.close()
+
+    new_course_set_id = await run_db(insert_timetable)
 
     return {
         "message": "Timetable saved successfully",
@@ -621,41 +758,40 @@ async def get_comments(course_set_id: int):
     """
     course_set_id에 해당하는 ciffy_comment 테이블의 댓글을 가져오는 API.
     """
-    # DB 연결
-    connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)
-
-    try:
-        # ciffy_comment 테이블에서 댓글 검색
-        cursor.execute(
-            """
-            SELECT comment
-            FROM ciffy_comment
-            WHERE question_id = %s
-            """,
-            (course_set_id,)
-        )
-        comments = cursor.fetchall()
+    def fetch_comments():
+        with pooled_connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                # ciffy_comment 테이블에서 댓글 검색
+                cursor.execute(
+                    """
+                    SELECT comment
+                    FROM ciffy_comment
+                    WHERE question_id = %s
+                    """,
+                    (course_set_id,)
+                )
+                return cursor.fetchall()
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+            finally:
+                cursor.close()
 
-        if not comments:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No comments found for course_set_id {course_set_id}"
-            )
+    comments = await run_db(fetch_comments)
 
-        # 댓글 리스트 생성
-        comment_list = [comment["comment"] for comment in comments]
+    if not comments:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No comments found for course_set_id {course_set_id}"
+        )
 
-        return {
-            "course_set_id": course_set_id,
-            "comments": comment_list
-        }
+    # 댓글 리스트 생성
+    comment_list = [comment["comment"] for comment in comments]
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-    finally:
-        cursor.close()
-        connection.close()
+    return {
+        "course_set_id": course_set_id,
+        "comments": comment_list
+    }
 
 class TimetableEntry(BaseModel):
     course_set_id: int
@@ -677,36 +813,124 @@ async def get_timetables(student_id: int):
     """
     student_id에 해당하는 모든 시간표를 가져오는 API.
     """
-    # DB 연결
-    connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)
+    def fetch_timetables():
+        with pooled_connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                # timetables 테이블에서 student_id와 연관된 데이터 검색
+                cursor.execute(
+                    """
+                    SELECT *
+                    FROM timetables
+                    WHERE student_id = %s
+                    ORDER BY course_set_id
+                    """,
+                    (student_id,)
+                )
+                return cursor.fetchall()
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+            finally:
+                cursor.close()
 
-    try:
-        # timetables 테이블에서 student_id와 연관된 데이터 검색
-        cursor.execute(
-            """
-            SELECT *
-            FROM timetables
-            WHERE student_id = %s
-            ORDER BY course_set_id
-            """,
-            (student_id,)
+    timetables = await run_db(fetch_timetables)
+
+    if not timetables:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No timetables found for student_id {student_id}"
         )
-        timetables = cursor.fetchall()
 
-        if not timetables:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No timetables found for student_id {student_id}"
-            )
+    # 응답 데이터 형식 맞춤
+    return {
+        "timetables": timetables,
+    }
 
-        # 응답 데이터 형식 맞춤
-        return {
-            "timetables": timetables,
-        }
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-    finally:
-        cursor.close()
-        connection.close()
\ No newline at end of file
+async def run_audit(audit, student_id):
+    try:
+        return await run_db(audit, student_id)
+    except LookupError as err:
+        # 없는 학번 / 학과·학번 년도에 맞는 졸업 기준 없음
+        raise HTTPException(status_code=404, detail=str(err))
+    except mysql.connector.Error as err:
+        raise HTTPException(status_code=500, detail=f"Database error: {err}")
+
+
+@app.get("/graduation/{student_id}", tags=["Graduation"])
+async def get_graduation(student_id: str):
+    """
+    졸업요건 검사 결과 (전필/전선/교필/교선/균필/기교/영어/복수전공/총학점).
+    성적이나 기준 데이터가 바뀌지 않았으면 저장된 결과(result_json)를 그대로 반환
+    """
+    return await run_audit(graduation_audit, student_id)
+
+
+@app.get("/graduation/{student_id}/engineering", tags=["Graduation"])
+async def get_engineering_graduation(student_id: str):
+    """
+    공학인증 검사 결과 (전문교양/BSM/설계 과목). 저장 규칙은 /graduation/{student_id} 와 같음 (en_result_json)
+    """
+    return await run_audit(engineering_audit, student_id)
+
+
+@app.get("/admin/reference-data", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def get_reference_data():
+    """
+    졸업요건 검사 기준 테이블 스냅샷의 버전과 테이블별 행 수
+    """
+    snapshot = await run_db(reference_data.get)
+    return snapshot.stats()
+
+
+@app.post("/admin/reference-data/reload", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def reload_reference_data():
+    """
+    기준 테이블(AllLecture, NewLecture, SubjectGroup, ChangedClassification, Standard, Major)을 다시 읽어
+    스냅샷을 통째로 교체. 진행 중인 검사는 이전 스냅샷으로 끝까지 진행됨
+    """
+    try:
+        snapshot = await run_db(reference_data.reload)
+    except mysql.connector.Error as err:
+        raise HTTPException(status_code=500, detail=f"Database error: {err}")
+    return {"message": "reloaded", **snapshot.stats()}
+
+
+@app.get("/admin/cohort-audit", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def cohort_audit(major: str, year: int, short: Optional[str] = None):
+    """
+    학과/학번 코호트 전체의 학점 기준 졸업요건 검사 결과를 JSON lines 로 스트리밍.
+    short 를 주면 그 영역(major_essential, major_selection, multi_major_*, core_selection, la_balance, total)을
+    통과 못한 학생만
+    """
+    if short is not None and short not in AUDIT_AREAS:
+        raise HTTPException(status_code=400, detail=f"short must be one of {sorted(AUDIT_AREAS)}")
+    try:
+        frame, standard, changed = await run_db(load_cohort, major, year)
+    except LookupError as err:
+        raise HTTPException(status_code=404, detail=str(err))
+    except mysql.connector.Error as err:
+        raise HTTPException(status_code=500, detail=f"Database error: {err}")
+
+    # 동기 generator 라서 Starlette 가 스레드풀에서 한 줄씩 꺼내 보냄
+    return StreamingResponse(iter_jsonl(cohort_workers.audit(frame, standard, changed), short), media_type="application/x-ndjson")
+
+
+@app.get("/admin/profiles", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """
+    저장된 요청 프로파일 목록 (최신순). PROFILING_ENABLED=1 일 때 X-Profile: 1 헤더를 붙인 요청만 기록됨
+    """
+    return {"enabled": PROFILING_ENABLED, "profiles": await run_in_threadpool(profile_store.list)}
+
+
+@app.get("/admin/profiles/{profile_id}", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def download_profile(profile_id: str):
+    """
+    collapsed stack 파일 (flamegraph.pl / speedscope 에서 열기)
+    """
+    try:
+        path = profile_store.file(profile_id)
+    except LookupError as err:
+        raise HTTPException(status_code=404, detail=str(err))
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=f"{profile_id}.folded")
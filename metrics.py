@@ -0,0 +1,240 @@
+"""
+Prometheus 텍스트 형식 지표 (/metrics)
+
+- http_request_duration_seconds{method,route,status} : 라우트(경로 템플릿)별 응답 시간 히스토그램
+- http_requests_in_flight{method,route}              : 처리 중인 요청 수
+- db_queries_per_request{route}, db_query_time_per_request_seconds{route} : 요청 하나가 보낸 쿼리 수/시간
+- db_query_duration_seconds{statement}               : 쿼리 종류(SELECT/INSERT/...)별 시간
+- external_call_duration_seconds{service,outcome}    : 포털 로그인, GPT 같은 외부 호출 시간
+- db_pool_*                                          : 연결 풀 상태 (스크랩할 때 읽음)
+
+관측 한 번은 잠금 한 번 + 배열 한 칸 증가라서 요청 처리 비용에 비해 무시할 수준입니다.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from starlette.routing import Match
+
+from database import connect
+from database.instrumentation import add_query_observer
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+EXTERNAL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}  # 라벨 값 tuple -> [구간별 개수..., 합계]
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, label_values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, label_values)} {_number(values[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, label_values)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def add(self, amount, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            lines.append(f"{self.name}{_labels(self.labels, label_values)} {_number(value)}")
+        return lines
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status"))
+requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being handled.", ("method", "route"))
+queries_per_request = Histogram(
+    "db_queries_per_request", "Database queries issued by one HTTP request.", ("route",), QUERY_COUNT_BUCKETS)
+query_time_per_request = Histogram(
+    "db_query_time_per_request_seconds", "Total database query time of one HTTP request.", ("route",), QUERY_BUCKETS)
+query_duration = Histogram(
+    "db_query_duration_seconds", "Database query latency by statement type.", ("statement",), QUERY_BUCKETS)
+external_call_duration = Histogram(
+    "external_call_duration_seconds", "Latency of calls to external services.", ("service", "outcome"),
+    EXTERNAL_BUCKETS)
+
+METRICS = [request_duration, requests_in_flight, queries_per_request, query_time_per_request, query_duration,
+           external_call_duration]
+
+# 풀 stats() 키 -> (지표 이름, 종류)
+POOL_STATS = {
+    "size": ("db_pool_size", "gauge"),
+    "open": ("db_pool_open_connections", "gauge"),
+    "in_use": ("db_pool_in_use_connections", "gauge"),
+    "idle": ("db_pool_idle_connections", "gauge"),
+    "checkouts": ("db_pool_checkouts_total", "counter"),
+    "waits": ("db_pool_waits_total", "counter"),
+    "exhausted": ("db_pool_exhausted_total", "counter"),
+    "created": ("db_pool_connections_created_total", "counter"),
+    "discarded": ("db_pool_connections_discarded_total", "counter"),
+}
+
+
+def _pool_lines():
+    lines = []
+    stats = connect.pool.stats()
+    for key, (name, kind) in POOL_STATS.items():
+        if key in stats:
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {stats[key]}")
+    return lines
+
+
+def render():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    lines.extend(_pool_lines())
+    return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    """
+    요청 하나 동안 보낸 쿼리 수와 시간. contextvars 로 요청마다 하나씩 (run_db 스레드에도 전달됨)
+    """
+    __slots__ = ("queries", "query_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+current_request = contextvars.ContextVar("current_request", default=None)
+
+
+def _statement(sql):
+    sql = sql.decode("utf-8", "replace") if isinstance(sql, (bytes, bytearray)) else str(sql)
+    words = sql.split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+
+def observe_query(sql, seconds):
+    query_duration.observe(seconds, _statement(sql))
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += seconds
+
+
+add_query_observer(observe_query)
+
+
+@contextmanager
+def timed_call(service):
+    """
+    with timed_call("portal_auth"): ... 블록 시간을 outcome(ok/error)과 함께 기록
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        external_call_duration.observe(time.perf_counter() - started, service, outcome)
+
+
+def route_template(scope):
+    """
+    /graduation/20011234 -> /graduation/{student_id}. 라벨 종류가 학번 수만큼 늘지 않게 경로 템플릿으로 묶음
+    """
+    app = scope.get("app")
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", scope["path"])
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    요청마다 시간, 처리 중 개수, 쿼리 수/시간을 기록하는 ASGI 미들웨어 (스트리밍 응답은 끝까지 보낸 시점 기준)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        requests_in_flight.add(1, method, route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_duration.observe(time.perf_counter() - started, method, route, str(status))
+            requests_in_flight.add(-1, method, route)
+            queries_per_request.observe(stats.queries, route)
+            query_time_per_request.observe(stats.query_seconds, route)
+            current_request.reset(token)
@@ -0,0 +1,226 @@
+"""
+요청 하나를 골라서 프로파일링 (PROFILING_ENABLED=1 일 때만 미들웨어가 붙음)
+
+관리자가 X-Profile: 1 과 X-Admin-Token 헤더를 함께 보내면 그 요청이 끝날 때까지 PROFILE_INTERVAL_MS 마다
+모든 스레드의 스택을 샘플링합니다. 핸들러 일이 이벤트 루프, DB 스레드(run_db), anyio 워커(run_in_threadpool)에
+나뉘어 돌기 때문에 cProfile(현재 스레드만) 대신 샘플링을 씁니다. 대기 중인(쉬는) 스레드는 빼고 셉니다.
+같은 시간에 다른 요청이 돌고 있었다면 그 스택도 섞일 수 있습니다.
+
+결과는 PROFILE_DIR 에 collapsed stack 형식(<스레드>;<바깥 프레임>;...;<안쪽 프레임> <샘플 수>)으로 저장되고
+최근 PROFILE_KEEP 개만 남습니다. 응답의 X-Profile-Id 로 /admin/profiles/{id} 에서 내려받아
+flamegraph.pl / speedscope 로 볼 수 있습니다.
+"""
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+
+from fastapi.concurrency import run_in_threadpool
+
+from auth import is_admin_token
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "").lower() in ("1", "true", "yes", "on")
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "graduate_fastapi_profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", 50))                   # 보관할 프로파일 수 (오래된 것부터 삭제)
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", 5))   # 샘플링 간격
+
+PROFILE_ID = re.compile(r"^\d{13}-[0-9a-f]{8}$")
+
+_STDLIB = os.path.dirname(threading.__file__)
+# 표준 라이브러리 안에서 이 함수로 멈춰 있는 스레드는 쉬는 중 (풀 워커 대기, 이벤트 루프 select 등)
+_IDLE_FUNCTIONS = {"wait", "select", "poll", "epoll", "get", "accept", "_worker", "_wait_for_tstate_lock"}
+
+
+def _is_idle(frame):
+    code = frame.f_code
+    return code.co_name in _IDLE_FUNCTIONS and code.co_filename.startswith(_STDLIB)
+
+
+def _short_path(filename):
+    for prefix in sorted(sys.path, key=len, reverse=True):
+        if prefix and filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1:]
+    return filename
+
+
+def _frame_label(code):
+    # collapsed 형식에서 ';' 는 구분자라서 쓰지 않음
+    return f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+class StackSampler:
+    """
+    start() ~ stop() 동안 바쁜 스레드들의 스택을 세는 샘플러
+    """
+
+    def __init__(self, interval=PROFILE_INTERVAL_MS / 1000):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        labels = {}
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or _is_idle(frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = _frame_label(code)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """
+    PROFILE_DIR 안의 프로파일 링 버퍼. <id>.folded (스택) + <id>.json (요청 정보)
+    """
+
+    def __init__(self, directory=PROFILE_DIR, keep=PROFILE_KEEP):
+        self.directory = directory
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_id():
+        # 이름순 = 시간순
+        return f"{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}"
+
+    def path(self, profile_id, suffix=".folded"):
+        if not PROFILE_ID.match(profile_id):
+            raise LookupError(f"Invalid profile id: {profile_id}")
+        return os.path.join(self.directory, profile_id + suffix)
+
+    def save(self, profile_id, sampler, meta):
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path(profile_id), "w", encoding="utf-8") as file:
+                file.write(sampler.collapsed())
+            with open(self.path(profile_id, ".json"), "w", encoding="utf-8") as file:
+                json.dump({"id": profile_id, **meta}, file, ensure_ascii=False)
+            for old in self._ids()[:-self.keep or None]:
+                for suffix in (".folded", ".json"):
+                    try:
+                        os.remove(self.path(old, suffix))
+                    except FileNotFoundError:
+                        pass
+
+    def _ids(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-len(".folded")] for name in names
+                      if name.endswith(".folded") and PROFILE_ID.match(name[:-len(".folded")]))
+
+    def list(self):
+        """
+        최신순 프로파일 정보 목록
+        """
+        profiles = []
+        for profile_id in reversed(self._ids()):
+            try:
+                with open(self.path(profile_id, ".json"), encoding="utf-8") as file:
+                    profiles.append(json.load(file))
+            except (FileNotFoundError, ValueError):
+                profiles.append({"id": profile_id})
+        return profiles
+
+    def file(self, profile_id):
+        """
+        내려받을 .folded 경로. 없으면 LookupError
+        """
+        path = self.path(profile_id)
+        if not os.path.exists(path):
+            raise LookupError(f"No profile {profile_id}")
+        return path
+
+
+profile_store = ProfileStore()
+
+
+class ProfilerMiddleware:
+    """
+    X-Profile: 1 + 유효한 X-Admin-Token 인 요청만 샘플링. 한 번에 한 요청만 (이미 진행 중이면 X-Profile-Id: busy)
+    """
+
+    def __init__(self, app, store=profile_store):
+        self.app = app
+        self.store = store
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        if headers.get(b"x-profile") != b"1" or not is_admin_token(headers.get(b"x-admin-token", b"").decode("latin-1")):
+            await self.app(scope, receive, send)
+            return
+        if not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, self._with_header(send, b"busy"))
+            return
+
+        profile_id = self.store.new_id()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await self._with_header(send, profile_id.encode())(message)
+
+        sampler = StackSampler()
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            # 쿼리 문자열은 저장하지 않음 (/user-info 의 password 등)
+            meta = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                "samples": sampler.samples,
+                "interval_ms": sampler.interval * 1000,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            try:
+                await run_in_threadpool(self.store.save, profile_id, sampler, meta)
+            finally:
+                self._busy.release()
+
+    @staticmethod
+    def _with_header(send, value):
+        async def wrapped(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-profile-id", value)]}
+            await send(message)
+        return wrapped
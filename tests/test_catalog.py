@@ -0,0 +1,25 @@
+"""
+functions.catalog.CourseCatalog 색인 (임시 course.txt 로 확인)
+"""
+from functions.catalog import CourseCatalog
+
+
+def test_weekday_index_covers_every_meeting_day(tmp_path):
+    course_file = tmp_path / "course.txt"
+    course_file.write_text(
+        "대양휴머니티칼리지 : \n"
+        "컴퓨터공학과,자료구조,전필,3,화 목 10:30~12:00,율곡관 101,김교수\n"
+        "컴퓨터공학과,운영체제,전필,3,월 수 13:30~15:00,율곡관 102,이교수\n"
+        "소프트웨어학과,캡스톤,전선,2,목 18:00~19:00,대양AI센터 201,박교수\n",
+        encoding="utf-8",
+    )
+    catalog = CourseCatalog(str(course_file))
+
+    def names(day):
+        return [course["course_name"] for course in catalog.weekday(day)]
+
+    assert names("화") == ["자료구조"]
+    assert names("목") == ["자료구조", "캡스톤"]
+    assert names("월") == names("수") == ["운영체제"]
+    assert names("금") == []
+    assert "10:30~12:00" not in catalog.by_weekday
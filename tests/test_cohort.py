@@ -0,0 +1,74 @@
+"""
+views.cohort 학점 검사가 f_result 와 같은 숫자를 내는지, 프로세스 풀 경로가 바로 계산한 결과와 같은지 확인
+"""
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import SYNTHETIC_STANDARD, make_cohort_frame
+from views.cohort import CohortWorkers, summarize
+
+
+def cohort(*students):
+    records = []
+    for student_id, status, grades in students:
+        for number, (classification, credit) in enumerate(grades):
+            records.append((student_id, f"학생{student_id}", status, f"{student_id}-{number}", classification, credit))
+        if not grades:
+            records.append((student_id, f"학생{student_id}", status, None, None, 0.0))
+    return pd.DataFrame(records, columns=["student_id", "name", "major_status", "학수번호", "이수구분", "학점"])
+
+
+def audit(*students):
+    return {result["student_id"]: result for result in summarize(cohort(*students), SYNTHETIC_STANDARD, {})}
+
+
+def test_single_major_moves_extra_essential_to_selection():
+    result = audit(("1", "해당없음", [("전필", 12.0), ("전필", 9.0), ("전선", 42.0)]))["1"]
+    assert result["major_essential"] == {"standard_num": 18, "user_num": 18, "lack": 0, "pass": 1}
+    assert result["major_selection"] == {"standard_num": 45, "user_num": 42, "remain": 3, "lack": 0, "pass": 1}
+    assert "multi_major_essential" not in result
+
+
+def test_multi_major_matches_f_result():
+    # 전필 17: 학과 기준(18) 초과분 0 -> f_result 의 pass/lack 은 17 기준, user_num 은 복수전공 기준 15 로 넘긴 뒤
+    result = audit(("1", "복수전공", [("전필", 17.0), ("전선", 20.0), ("복필", 18.0), ("복선", 20.0)]))["1"]
+    assert result["major_essential"] == {"standard_num": 15, "user_num": 15, "lack": -2, "pass": 1}
+    assert result["major_selection"] == {"standard_num": 24, "user_num": 20, "remain": 2, "lack": 2, "pass": 0}
+    assert result["multi_major_essential"] == {"standard_num": 15, "user_num": 15, "pass": 1}
+    assert result["multi_major_selection"] == {"standard_num": 24, "user_num": 20, "remain": 3, "pass": 0}
+    assert result["total"]["pass"] == 0
+
+
+def test_linked_major_uses_its_own_classifications():
+    result = audit(("1", "연계전공", [("복필", 15.0), ("연필", 10.0), ("연선", 30.0)]))["1"]
+    assert result["multi_major_essential"] == {"standard_num": 15, "user_num": 10, "pass": 0}
+    assert result["multi_major_selection"] == {"standard_num": 24, "user_num": 30, "remain": 0, "pass": 1}
+
+
+def test_student_without_grades():
+    result = audit(("1", "해당없음", []))["1"]
+    assert result["total"] == {"standard_num": 130, "user_num": 0, "pass": 0}
+
+
+@pytest.fixture
+def pool():
+    workers = CohortWorkers(workers=2, chunk_size=7, min_students=0)
+    yield workers
+    workers.shutdown()
+
+
+def test_pool_matches_inline(pool):
+    frame = make_cohort_frame(40, rows_per_student=20)
+    inline = list(CohortWorkers(workers=1).audit(frame, SYNTHETIC_STANDARD, {}))
+    assert list(pool.audit(frame, SYNTHETIC_STANDARD, {})) == inline
+    # 두 번째 요청은 같은 풀을 재사용
+    executor = pool._executor
+    assert list(pool.audit(frame, SYNTHETIC_STANDARD, {})) == inline
+    assert pool._executor is executor
+
+
+def test_small_cohort_skips_pool():
+    workers = CohortWorkers(workers=2, chunk_size=7, min_students=100)
+    frame = make_cohort_frame(40, rows_per_student=5)
+    assert len(list(workers.audit(frame, SYNTHETIC_STANDARD, {}))) == 40
+    assert workers._executor is None
@@ -0,0 +1,91 @@
+"""
+database.connect.ConnectionPool 을 가짜 연결로 확인 (DB 없이)
+"""
+import threading
+import time
+
+import pytest
+
+from database.connect import ConnectionPool, PoolExhaustedError
+
+
+class FakeConnection:
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.in_transaction = False
+        self.pings = 0
+        self.closed = False
+
+    def ping(self, reconnect=True, attempts=1, delay=0):
+        self.pings += 1
+        if not self.alive:
+            raise ConnectionError("gone")
+
+    def rollback(self):
+        if not self.alive:
+            raise ConnectionError("gone")
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+def acquire_in_thread(pool):
+    result = {}
+
+    def run():
+        try:
+            result["connection"] = pool.acquire()
+        except Exception as err:
+            result["error"] = err
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, result
+
+
+def test_reuses_released_connection():
+    pool = ConnectionPool(factory=FakeConnection, size=2, timeout=1, recycle=60)
+    connection = pool.acquire()
+    pool.release(connection)
+    assert pool.acquire() is connection
+    assert pool.stats()["created"] == 1
+
+
+def test_exhausted_after_timeout():
+    pool = ConnectionPool(factory=FakeConnection, size=1, timeout=0.05, recycle=60)
+    pool.acquire()
+    with pytest.raises(PoolExhaustedError):
+        pool.acquire()
+    assert pool.stats()["exhausted"] == 1
+
+
+def test_discard_wakes_waiter_to_create_new_connection():
+    pool = ConnectionPool(factory=FakeConnection, size=1, timeout=5, recycle=60)
+    broken = pool.acquire()
+    thread, result = acquire_in_thread(pool)
+    time.sleep(0.05)
+    # 롤백에 실패한 연결은 반납되지 않고 버려짐 -> 기다리던 요청이 새 연결을 만듦
+    broken.alive = False
+    broken.in_transaction = True
+    started = time.monotonic()
+    pool.release(broken)
+    thread.join(2)
+    assert time.monotonic() - started < 1
+    assert result["connection"] is not broken and broken.closed
+    assert pool.stats()["open"] == 1
+
+
+def test_connection_handed_to_waiter_is_pinged_when_stale():
+    pool = ConnectionPool(factory=FakeConnection, size=1, timeout=5, recycle=0)
+    connection = pool.acquire()
+    thread, result = acquire_in_thread(pool)
+    time.sleep(0.05)
+    connection.alive = False
+    time.sleep(0.01)
+    pool.release(connection)
+    thread.join(2)
+    # 기다리다 받은 연결도 ping 에 실패하면 버리고 새로 만듦
+    assert connection.pings == 1 and connection.closed
+    assert result["connection"] is not connection
+    assert pool.stats()["discarded"] == 1
@@ -0,0 +1,32 @@
+"""
+database.course_cache 스냅샷 응답 본문 (DB 없이 load 를 바꿔서 확인)
+"""
+import json
+
+from database.course_cache import CourseCatalogCache
+
+ROW = {
+    "course_id": 1, "course_name": "자료구조", "professor": "김교수", "avg_rating": 4.5,
+    "rating_sum": 9, "rating_count": 2, "assignment_sum": 6, "group_work_sum": 4, "grading_sum": 8,
+}
+
+
+def test_body_hides_review_aggregates():
+    cache = CourseCatalogCache(ttl=60)
+    snapshot = cache.refresh(lambda: [ROW])
+    assert json.loads(snapshot.body)["data"] == [
+        {"course_id": 1, "course_name": "자료구조", "professor": "김교수", "avg_rating": 4.5}
+    ]
+    # 시간표 점수 계산은 rows 의 누적값을 그대로 씀
+    assert snapshot.rows[0]["rating_count"] == 2
+
+
+def test_patch_keeps_aggregates_out_of_body():
+    cache = CourseCatalogCache(ttl=60)
+    cache.refresh(lambda: [ROW])
+    cache.patch(dict(ROW, avg_rating=4.0, rating_sum=12, rating_count=3))
+    snapshot = cache.get()
+    assert json.loads(snapshot.body)["data"][0] == {
+        "course_id": 1, "course_name": "자료구조", "professor": "김교수", "avg_rating": 4.0
+    }
+    assert snapshot.rows[0]["rating_sum"] == 12
@@ -0,0 +1,34 @@
+"""
+views.get_csv.iter_transcript_rows 를 합성 성적표 xlsx 로 확인
+"""
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from benchmarks.synthetic import make_transcript_rows, write_transcript_xlsx
+from views.get_csv import iter_transcript_rows
+
+
+def upload(rows):
+    buffer = BytesIO()
+    write_transcript_xlsx(rows, buffer)
+    buffer.seek(0)
+    return SimpleNamespace(file=buffer, filename="transcript.xlsx")
+
+
+def test_blank_credit_is_stored_as_zero():
+    rows = make_transcript_rows(3)
+    rows[1]["학점"] = None
+    parsed = list(iter_transcript_rows(upload(rows)))
+    assert [row["학점"] for row in parsed] == [rows[0]["학점"], 0, rows[2]["학점"]]
+
+
+def test_non_numeric_credit_is_rejected():
+    rows = make_transcript_rows(2)
+    rows[1]["학점"] = "세 학점"
+    with pytest.raises(HTTPException) as error:
+        list(iter_transcript_rows(upload(rows)))
+    assert error.value.status_code == 400
+    assert "학점" in error.value.detail
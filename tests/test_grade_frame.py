@@ -0,0 +1,73 @@
+"""
+views.grade_frame 이 기존 f_result / f_en_result 코드(benchmarks 에 남겨 둔 원본 루프)와 같은 결과를 내는지 확인
+"""
+import random
+
+import pandas as pd
+import pytest
+
+from benchmarks.bench_design_window import BUILD_END, BUILD_START, legacy_design_window, make_case
+from benchmarks.bench_remap import make_changed, per_row_dict
+from benchmarks.synthetic import make_grade_frame
+from views.grade_frame import design_window, remap_classification
+
+COLUMNS = ["년도", "학기", "학수번호", "학점"]
+
+
+def frame(*rows):
+    return pd.DataFrame([dict(zip(COLUMNS, row)) for row in rows], columns=COLUMNS)
+
+
+DESIGN_CASES = {
+    "no design courses": frame(
+        ("2018", "1학기", "1001", 3.0), ("2020", "2학기", "1002", 3.0),
+    ),
+    "start only": frame(
+        ("2018", "2학기", "1001", 3.0), ("2019", "1학기", "1002", 3.0), ("2019", "2학기", BUILD_START, 3.0),
+        ("2019", "여름학기", "1003", 1.0), ("2021", "1학기", "1004", 3.0),
+    ),
+    "end only": frame(
+        ("2019", "1학기", "1001", 3.0), ("2021", "2학기", BUILD_END, 3.0), ("2022", "1학기", "1002", 3.0),
+    ),
+    "start and end": frame(
+        ("2017", "2학기", "1001", 3.0), ("2019", "1학기", "1002", 3.0), ("2019", "2학기", BUILD_START, 3.0),
+        ("2020", "겨울학기", "1003", 2.0), ("2021", "2학기", BUILD_END, 3.0), ("2022", "1학기", "1004", 3.0),
+    ),
+    "start retaken": frame(
+        ("2018", "2학기", BUILD_START, 3.0), ("2019", "2학기", BUILD_START, 3.0), ("2020", "1학기", "1001", 3.0),
+    ),
+    "design rows first": frame(
+        ("2019", "2학기", BUILD_START, 3.0), ("2021", "2학기", BUILD_END, 3.0), ("2016", "1학기", "1001", 3.0),
+        ("2023", "2학기", "1002", 3.0),
+    ),
+}
+
+
+@pytest.mark.parametrize("name", list(DESIGN_CASES))
+def test_design_window_matches_legacy(name):
+    data = DESIGN_CASES[name]
+    expected = legacy_design_window(data.copy(), BUILD_START, BUILD_END)
+    pd.testing.assert_frame_equal(design_window(data, BUILD_START, BUILD_END), expected, check_index_type=False)
+
+
+def test_design_window_matches_legacy_on_synthetic_transcripts():
+    rng = random.Random(0)
+    for case in range(300):
+        data = make_case(rng, rng.randint(1, 80))
+        expected = legacy_design_window(data.copy(), BUILD_START, BUILD_END)
+        actual = design_window(data, BUILD_START, BUILD_END)
+        pd.testing.assert_frame_equal(actual, expected, check_index_type=False, obj=f"case {case}")
+
+
+def test_design_window_empty_transcript():
+    # 기존 루프는 빈 성적표에서 끝나지 않아서 비교 대상이 없음
+    assert design_window(frame(), BUILD_START, BUILD_END).empty
+
+
+@pytest.mark.parametrize("ratio", [0.0, 0.2, 1.0])
+def test_remap_classification_matches_legacy(ratio):
+    for seed in range(20):
+        data = make_grade_frame(60, seed=seed)
+        changed = make_changed(data, ratio, seed=seed)
+        expected = per_row_dict(data.copy(), changed, 0)["이수구분"].tolist()
+        assert remap_classification(data, changed).tolist() == expected
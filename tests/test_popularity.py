@@ -0,0 +1,83 @@
+"""
+database.popularity.PopularityCache 순위 목록 (DB 없이 load 를 바꿔서 확인)
+"""
+from benchmarks import sqlite_db
+from database import connect, popularity as module
+from database.popularity import PopularityCache
+
+
+def test_top_keeps_every_ranked_subject():
+    # 상위 과목을 모두 이미 들은 학생도 아래 순위에서 추천을 받을 수 있어야 함
+    counts = {("컴퓨터공학과", "전선"): {f"{number:06d}": 1000 - number for number in range(500)}}
+    cache = PopularityCache(load=lambda: counts)
+    ranked = cache.top("컴퓨터공학과", "전선")
+    assert len(ranked) == 500
+    assert ranked[0] == ("000000", 1000) and ranked[-1] == ("000499", 501)
+
+
+def test_top_merges_majors_and_classifications():
+    counts = {
+        ("컴퓨터공학과", "교선1"): {"A": 3, "B": 1},
+        ("컴퓨터공학과", "중선"): {"B": 4},
+        ("소프트웨어학과", "교선1"): {"A": 5},
+    }
+    cache = PopularityCache(load=lambda: counts)
+    assert cache.top("컴퓨터공학과", "교선1", "중선") == [("B", 5), ("A", 3)]
+    assert cache.top(None, "교선1") == [("A", 8), ("B", 1)]
+
+
+def test_refresh_recounts_user_grade(monkeypatch):
+    # 업로드 뒤 주기 갱신(refresh)이 돌면 캐시된 순위도 새 성적을 반영해야 함 (SQLite 대역)
+    monkeypatch.setattr(connect, "pool", connect.pool)
+    monkeypatch.setattr(module, "popularity", PopularityCache())
+    keeper = sqlite_db.install(pool_size=1)
+    try:
+        keeper._connection.executescript(
+            "CREATE TABLE user_grade (student_id TEXT, major TEXT, year TEXT, classification TEXT, subject_num TEXT);"
+            + module.MIGRATE_SQL + ";"
+        )
+
+        def add_grades(rows):
+            keeper._connection.executemany("INSERT INTO user_grade VALUES (?, ?, ?, ?, ?)", rows)
+            keeper._connection.commit()
+
+        add_grades([("1", "컴퓨터공학과", "2021", "전선", "A"), ("2", "컴퓨터공학과", "커스텀", "전선", "B")])
+        module.refresh()
+        assert module.popularity.top("컴퓨터공학과", "전선") == [("A", 1)]
+
+        add_grades([("3", "컴퓨터공학과", "2022", "전선", "B"), ("4", "컴퓨터공학과", "2022", "전선", "B")])
+        module.refresh()
+        assert module.popularity.top("컴퓨터공학과", "전선") == [("B", 2), ("A", 1)]
+    finally:
+        keeper.close()
+
+
+def test_refresh_skips_while_another_worker_holds_the_lock(monkeypatch):
+    # 다른 워커가 GET_LOCK 을 잡고 계산 중이면 건너뛰고, 테이블은 이전 카운트 그대로
+    monkeypatch.setattr(connect, "pool", connect.pool)
+    monkeypatch.setattr(module, "popularity", PopularityCache())
+    keeper = sqlite_db.install(pool_size=1)
+    try:
+        keeper._connection.executescript(
+            "CREATE TABLE user_grade (student_id TEXT, major TEXT, year TEXT, classification TEXT, subject_num TEXT);"
+            + module.MIGRATE_SQL + ";"
+        )
+        keeper._connection.execute("INSERT INTO user_grade VALUES ('1', '컴퓨터공학과', '2021', '전선', 'A')")
+        keeper._connection.commit()
+        assert module.refresh() == 1
+
+        keeper._connection.execute("INSERT INTO user_grade VALUES ('2', '컴퓨터공학과', '2021', '전선', 'A')")
+        keeper._connection.commit()
+        cursor = keeper.cursor()
+        cursor.execute(module.GET_LOCK_SQL, (module.REFRESH_LOCK,))
+        assert cursor.fetchone() == (1,)
+        assert module.refresh() is None
+        assert module.popularity.top("컴퓨터공학과", "전선") == [("A", 1)]
+
+        cursor.execute(module.RELEASE_LOCK_SQL, (module.REFRESH_LOCK,))
+        cursor.fetchone()
+        cursor.close()
+        assert module.refresh() == 1
+        assert module.popularity.top("컴퓨터공학과", "전선") == [("A", 2)]
+    finally:
+        keeper.close()
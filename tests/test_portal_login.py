@@ -0,0 +1,118 @@
+"""
+views.user_info.PortalLoginCache 를 views/fake_portal.py 로 오프라인 확인
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from views import fake_portal, user_info
+from views.user_info import PortalLoginCache
+
+STUDENT_ID = "20011234"
+PASSWORD = fake_portal.DEFAULT_ACCOUNTS[STUDENT_ID]["password"]
+
+
+@pytest.fixture(autouse=True)
+def fake(monkeypatch):
+    monkeypatch.setattr(user_info, "PORTAL_FAKE", True)
+    monkeypatch.setattr(fake_portal, "PORTAL_FAKE_DELAY_MS", 0)
+    return monkeypatch
+
+
+def make_cache(**kwargs):
+    # 해시 반복 수를 줄여 테스트를 빠르게
+    kwargs.setdefault("iterations", 1000)
+    return PortalLoginCache(**kwargs)
+
+
+def portal_calls(coroutine):
+    before = fake_portal.calls
+    result = asyncio.run(coroutine)
+    return result, fake_portal.calls - before
+
+
+def test_ttl_hit_skips_portal():
+    cache = make_cache(ttl=60)
+
+    async def twice():
+        first = await cache.login(STUDENT_ID, PASSWORD)
+        second = await cache.login(STUDENT_ID, PASSWORD)
+        return first, second
+
+    (first, second), calls = portal_calls(twice())
+    assert calls == 1
+    assert first == second == {"id": STUDENT_ID, "name": "홍길동", "major": "컴퓨터공학과", "book": "4231"}
+
+
+def test_expired_entry_goes_back_to_portal():
+    cache = make_cache(ttl=0)
+
+    async def twice():
+        await cache.login(STUDENT_ID, PASSWORD)
+        await cache.login(STUDENT_ID, PASSWORD)
+
+    _, calls = portal_calls(twice())
+    assert calls == 2
+
+
+def test_wrong_password_falls_through_to_portal():
+    cache = make_cache(ttl=60)
+
+    async def scenario():
+        await cache.login(STUDENT_ID, PASSWORD)
+        with pytest.raises(HTTPException) as error:
+            await cache.login(STUDENT_ID, "wrong")
+        assert error.value.status_code == 401
+        # 틀린 시도가 캐시를 지우거나 바꾸지 않음
+        return await cache.login(STUDENT_ID, PASSWORD)
+
+    profile, calls = portal_calls(scenario())
+    assert calls == 2
+    assert profile["id"] == STUDENT_ID
+
+
+def test_concurrent_logins_share_one_portal_call(fake):
+    fake.setattr(fake_portal, "PORTAL_FAKE_DELAY_MS", 200)
+    cache = make_cache(ttl=60)
+
+    async def burst():
+        return await asyncio.gather(*[cache.login(STUDENT_ID, PASSWORD) for _ in range(8)])
+
+    profiles, calls = portal_calls(burst())
+    assert calls == 1
+    assert all(profile == profiles[0] for profile in profiles)
+
+
+def test_concurrent_logins_with_different_passwords_are_not_merged(fake):
+    fake.setattr(fake_portal, "PORTAL_FAKE_DELAY_MS", 100)
+    cache = make_cache(ttl=60)
+
+    async def burst():
+        return await asyncio.gather(
+            cache.login(STUDENT_ID, PASSWORD), cache.login(STUDENT_ID, "wrong"), return_exceptions=True)
+
+    (ok, failed), calls = portal_calls(burst())
+    assert calls == 2
+    assert ok["id"] == STUDENT_ID
+    assert isinstance(failed, HTTPException) and failed.status_code == 401
+
+
+def test_slow_portal_times_out_with_504_and_stuck_workers_give_503(fake):
+    fake.setattr(fake_portal, "PORTAL_FAKE_DELAY_MS", 300)
+    cache = make_cache(timeout=0.05, workers=1)
+
+    async def scenario():
+        with pytest.raises(HTTPException) as timeout:
+            await cache.login(STUDENT_ID, PASSWORD)
+        # 유일한 스레드가 아직 포털을 기다리는 중
+        with pytest.raises(HTTPException) as busy:
+            await cache.login(STUDENT_ID, PASSWORD)
+        await asyncio.sleep(0.4)
+        fake.setattr(fake_portal, "PORTAL_FAKE_DELAY_MS", 0)
+        profile = await cache.login(STUDENT_ID, PASSWORD)
+        return timeout.value.status_code, busy.value.status_code, profile
+
+    (timeout_status, busy_status, profile), _ = portal_calls(scenario())
+    assert (timeout_status, busy_status) == (504, 503)
+    assert profile["id"] == STUDENT_ID
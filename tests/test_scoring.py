@@ -0,0 +1,79 @@
+"""
+functions.scoring.recommend_timetables 가 학생 답변에 따라 다른 시간표를 고르는지 (합성 강의 목록 + 리뷰)
+"""
+from itertools import combinations
+
+import pytest
+
+from benchmarks.synthetic import make_review_rows, write_course_file
+from functions.catalog import get_catalog
+from functions.scoring import (
+    MIN_DIFFERENT_COURSES, course_features, preference_weights, recommend_timetables, review_stats_from_rows,
+    top_distinct,
+)
+from functions.solver import solve_timetables
+
+
+@pytest.fixture
+def course_file(tmp_path):
+    return write_course_file(str(tmp_path / "course.txt"))
+
+
+@pytest.fixture
+def review_stats(course_file):
+    names = sorted({course["course_name"] for course in get_catalog(course_file).courses})
+    courses, _ = make_review_rows(names)
+    return review_stats_from_rows(courses)
+
+
+def names(timetable):
+    return frozenset(course["course_name"] for course in timetable)
+
+
+def test_answers_change_the_top_timetable(course_file, review_stats):
+    likes_reviews = [3, 3, 3, 3, 3, 5, 3, 3, 1, 5]
+    dislikes_reviews = [3, 3, 3, 3, 3, 1, 3, 3, 5, 1]
+    first = recommend_timetables(course_file, 3, likes_reviews, review_stats, seed=0)
+    second = recommend_timetables(course_file, 3, dislikes_reviews, review_stats, seed=0)
+    assert names(first[0][0]) != names(second[0][0])
+    assert {names(t) for t, _ in first}.isdisjoint({names(t) for t, _ in second})
+
+
+def test_search_finds_the_best_scoring_timetable(course_file, review_stats):
+    # 분기 한정 탐색의 1등은 점수 없이 찾은 어떤 후보보다도 점수가 낮지 않아야 함
+    answers = [5, 1, 4, 2, 3, 5, 4, 1, 2, 5]
+    weights = preference_weights(answers)
+
+    def score(course):
+        return course_features(course, review_stats) @ weights
+
+    catalog = get_catalog(course_file)
+    best = solve_timetables(catalog, k=1, seed=0, score=score)[0]
+    unscored = solve_timetables(catalog, k=200, seed=0)
+    assert sum(map(score, best)) >= max(sum(map(score, timetable)) for timetable in unscored) - 1e-9
+
+    top, top_score = recommend_timetables(course_file, 1, answers, review_stats, seed=0)[0]
+    assert names(top) == names(best)
+    assert top_score == pytest.approx(sum(map(score, best)) / len(best), abs=1e-4)
+
+
+def test_recommendations_differ_by_min_courses(course_file, review_stats):
+    scored = recommend_timetables(course_file, 20, [5, 1, 4, 2, 3, 5, 4, 1, 2, 5], review_stats, seed=0)
+    assert len(scored) == 20
+    assert [score for _, score in scored] == sorted((score for _, score in scored), reverse=True)
+    for (first, _), (second, _) in combinations(scored, 2):
+        assert len(names(first) - names(second)) >= MIN_DIFFERENT_COURSES
+
+
+def test_top_distinct_skips_near_duplicates():
+    def timetable(*course_names):
+        return [{"course_name": name} for name in course_names]
+
+    scored = [
+        (timetable("a", "b", "c"), 3.0),
+        (timetable("a", "b", "d"), 2.5),   # a, b 가 같아 한 과목만 다름
+        (timetable("a", "e", "f"), 2.0),
+        (timetable("a", "b", "c"), 1.0),   # 분반만 다른 같은 구성
+    ]
+    assert [score for _, score in top_distinct(scored, 5, min_difference=2)] == [3.0, 2.0]
+    assert [score for _, score in top_distinct(scored, 5, min_difference=1)] == [3.0, 2.5, 2.0]
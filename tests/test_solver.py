@@ -0,0 +1,125 @@
+"""
+functions.solver.solve_timetables (합성 강의 목록으로 확인)
+"""
+from itertools import combinations
+
+from benchmarks.synthetic import write_course_file
+from functions.catalog import CourseCatalog
+from functions.solver import DEFAULT_QUOTAS, Quota, solve_timetables, time_mask
+
+
+class FakeCatalog:
+    def __init__(self, courses):
+        self.courses = courses
+
+    def department(self, name):
+        return [course for course in self.courses if course["department"] == name]
+
+
+def course(department, name, time, credits=3.0):
+    return {
+        "department": department, "course_name": name, "type": "전공선택", "credits": credits,
+        "time": time, "location": "율곡관", "professor": "교수",
+    }
+
+
+def synthetic_catalog(tmp_path):
+    return CourseCatalog(write_course_file(str(tmp_path / "course.txt"))).refresh()
+
+
+def assert_valid(timetable, quotas=DEFAULT_QUOTAS):
+    for quota in quotas:
+        picked = [c for c in timetable if c["department"] == quota.department]
+        assert len(picked) == quota.num_courses
+        assert sum(c["credits"] for c in picked) >= quota.target_credits
+    for first, second in combinations(timetable, 2):
+        assert not time_mask(first["time"]) & time_mask(second["time"])
+    names = [c["course_name"] for c in timetable]
+    assert len(names) == len(set(names))
+
+
+def test_timetables_meet_quotas_without_overlaps(tmp_path):
+    timetables = solve_timetables(synthetic_catalog(tmp_path), k=30, seed=7)
+    assert len(timetables) == 30
+    for timetable in timetables:
+        assert_valid(timetable)
+    assert len({frozenset(c["course_name"] for c in timetable) for timetable in timetables}) == 30
+
+
+def test_leading_groups_differ_between_results(tmp_path):
+    # 재시작마다 순서를 섞으므로 마지막 학과의 선택만 다른 시간표 묶음이 되지 않음
+    timetables = solve_timetables(synthetic_catalog(tmp_path), k=20, seed=3)
+    for quota in DEFAULT_QUOTAS:
+        picks = {frozenset(c["course_name"] for c in t if c["department"] == quota.department) for t in timetables}
+        assert len(picks) >= 10
+
+
+def test_same_seed_same_result(tmp_path):
+    catalog = synthetic_catalog(tmp_path)
+    assert solve_timetables(catalog, k=10, seed=5) == solve_timetables(catalog, k=10, seed=5)
+
+
+def test_small_space_returns_every_timetable():
+    quotas = (Quota("A", 1, 3.0), Quota("B", 1, 3.0))
+    catalog = FakeCatalog([
+        course("A", "a1", "월 09:00~10:30"), course("A", "a2", "화 09:00~10:30"),
+        course("B", "b1", "월 09:00~10:30"), course("B", "b2", "수 09:00~10:30"),
+    ])
+    timetables = solve_timetables(catalog, quotas=quotas, k=10, seed=0)
+    # a1+b1 은 시간이 겹침
+    assert sorted(sorted(c["course_name"] for c in t) for t in timetables) == [
+        ["a1", "b2"], ["a2", "b1"], ["a2", "b2"],
+    ]
+
+
+def test_unsatisfiable_quota_returns_empty():
+    quotas = (Quota("A", 2, 6.0),)
+    catalog = FakeCatalog([course("A", "a1", "월 09:00~10:30"), course("A", "a2", "월 10:00~11:00")])
+    assert solve_timetables(catalog, quotas=quotas, k=3, seed=0) == []
+
+
+def test_max_nodes_stops_search(tmp_path):
+    catalog = synthetic_catalog(tmp_path)
+    assert solve_timetables(catalog, k=50, seed=1, max_nodes=1) == []
+    partial = solve_timetables(catalog, k=1000, seed=1, max_nodes=200)
+    assert 0 < len(partial) < 1000
+    for timetable in partial:
+        assert_valid(timetable)
+
+
+def test_exclude_names_removes_courses(tmp_path):
+    catalog = synthetic_catalog(tmp_path)
+    first = solve_timetables(catalog, k=5, seed=2)
+    excluded = frozenset("".join(c["course_name"].split()) for t in first for c in t)
+    remaining = solve_timetables(catalog, k=5, seed=2, exclude_names=excluded)
+    assert remaining
+    for timetable in remaining:
+        assert not {c["course_name"] for c in timetable} & excluded
+        assert_valid(timetable)
+
+
+def test_min_difference_between_results(tmp_path):
+    catalog = synthetic_catalog(tmp_path)
+
+    def score(course):
+        return 1.0 if course["type"] == "전공필수" else 0.0
+
+    for kwargs in ({}, {"score": score}):
+        timetables = solve_timetables(catalog, k=15, seed=4, min_difference=3, **kwargs)
+        assert len(timetables) == 15
+        sets = [frozenset(c["course_name"] for c in timetable) for timetable in timetables]
+        for first, second in combinations(sets, 2):
+            assert len(first - second) >= 3
+
+
+def test_scored_results_are_best_first(tmp_path):
+    catalog = synthetic_catalog(tmp_path)
+
+    def score(course):
+        return (sum(map(ord, course["course_name"])) % 7) / 7
+
+    timetables = solve_timetables(catalog, k=10, seed=0, score=score, min_difference=2)
+    totals = [sum(map(score, timetable)) for timetable in timetables]
+    assert totals == sorted(totals, reverse=True)
+    # 1등은 제약 없이 찾은 최선과 같은 점수
+    assert totals[0] == sum(map(score, solve_timetables(catalog, k=1, seed=0, score=score)[0]))
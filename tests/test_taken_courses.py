@@ -0,0 +1,43 @@
+"""
+database.taken_courses.fetch_taken_courses 를 benchmarks/sqlite_db.py 의 SQLite 대역으로 확인 (MySQL 없이)
+"""
+import pytest
+
+from benchmarks import sqlite_db
+from database import connect
+from database.taken_courses import fetch_taken_courses
+
+STUDENT_ID = "20011234"
+
+
+@pytest.fixture
+def keeper(monkeypatch):
+    monkeypatch.setattr(connect, "pool", connect.pool)  # 테스트가 끝나면 원래 풀로 복구
+    keeper = sqlite_db.install(pool_size=1)
+    yield keeper
+    keeper.close()
+
+
+def add_rows(keeper, rows):
+    keeper._connection.executemany(
+        "INSERT INTO course_data (user_id, course_name, grade_detail) VALUES (?, ?, ?)", rows
+    )
+    keeper._connection.commit()
+
+
+def test_failed_courses_stay_in_candidate_pool(keeper):
+    add_rows(keeper, [
+        (STUDENT_ID, "자료 구조", "A+"),
+        (STUDENT_ID, "운영체제", "F"),
+        (STUDENT_ID, "글쓰기", "NP"),
+        (STUDENT_ID, "봉사활동", "P"),
+        (STUDENT_ID, "기존과목", None),
+        ("19990000", "알고리즘", "B0"),
+    ])
+    # 띄어쓰기는 정규화되고, F/NP 과목은 재수강할 수 있도록 빠짐
+    assert fetch_taken_courses(STUDENT_ID) == frozenset({"자료구조", "봉사활동", "기존과목"})
+
+
+def test_retake_after_failing_counts_as_taken(keeper):
+    add_rows(keeper, [(STUDENT_ID, "운영체제", "F"), (STUDENT_ID, "운영체제", "B+")])
+    assert fetch_taken_courses(STUDENT_ID) == frozenset({"운영체제"})
@@ -0,0 +1,74 @@
+"""
+functions.timetable_cache: generation_id 키 구성과 TimetableCache 의 TTL / LRU 동작
+"""
+import pytest
+
+from functions import timetable_cache as module
+from functions.timetable_cache import TimetableCache, generation_id
+
+ANSWERS = [5, 1, 4, 2, 3, 5, 4, 1, 2, 5]
+TAKEN = frozenset({"자료구조", "운영체제"})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(module.time, "monotonic", clock)
+    return clock
+
+
+def result(name):
+    return [([{"course_name": name}], 1.0)]
+
+
+def test_generation_id_covers_every_input():
+    base = generation_id("20011234", ANSWERS, 1, TAKEN, count=3)
+    assert base == generation_id("20011234", list(ANSWERS), 1, frozenset(sorted(TAKEN)), count=3)
+    variants = {
+        generation_id("20011235", ANSWERS, 1, TAKEN, count=3),
+        generation_id("20011234", ANSWERS[::-1], 1, TAKEN, count=3),
+        generation_id("20011234", None, 1, TAKEN, count=3),
+        generation_id("20011234", ANSWERS, 2, TAKEN, count=3),
+        generation_id("20011234", ANSWERS, 1, TAKEN | {"알고리즘"}, count=3),
+        generation_id("20011234", ANSWERS, 1, TAKEN, count=5),
+        generation_id("20011234", ANSWERS, 1, TAKEN, count=3, shards=4),
+    }
+    assert base not in variants and len(variants) == 7
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TimetableCache(ttl=60, max_entries=10)
+    cache.put("1", "g1", result("a"))
+    clock.now += 59
+    assert cache.get("g1") == result("a")
+    assert cache.latest("1") == "g1"
+    clock.now += 1
+    assert cache.get("g1") is None
+    assert cache.latest("1") is None
+    assert cache.choice("1", 1) is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TimetableCache(ttl=60, max_entries=2)
+    cache.put("1", "g1", result("a"))
+    cache.put("2", "g2", result("b"))
+    cache.get("g1")  # g1 을 최근 사용으로
+    cache.put("3", "g3", result("c"))
+    assert cache.get("g2") is None and cache.latest("2") is None
+    assert cache.get("g1") == result("a") and cache.get("g3") == result("c")
+
+
+def test_choice_is_limited_to_the_owner(clock):
+    cache = TimetableCache(ttl=60, max_entries=10)
+    cache.put("1", "g1", result("a") + result("b"))
+    assert cache.choice("1", 2) == [{"course_name": "b"}]
+    assert cache.choice("1", 3) is None
+    assert cache.choice("2", 1, "g1") is None
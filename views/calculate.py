@@ -1,11 +1,63 @@
 # 파이썬 라이브러리
 import json
 import random
-from collections import defaultdict
-from django_pandas.io import read_frame
-# 모델 참조
-from django.db.models import Count
-from ..models import *
+from collections import defaultdict, namedtuple
+import pandas as pd
+# 학생 정보/성적은 공용 커넥션 풀에서 직접 조회
+from database.connect import pooled_connection
+# 기준 테이블(AllLecture, NewLecture, SubjectGroup, ChangedClassification, Standard, Major)은 메모리 스냅샷에서 읽음
+from database.reference_data import reference_data
+# 이수구분별 많이 듣는 과목은 subject_popularity 집계 캐시에서 읽음
+from database.popularity import popularity
+# 검사 결과는 new_user_info.result_json / en_result_json 에 저장해 두고 재사용
+from database.audit_results import cached_audit
+from views.grade_frame import design_window, remap_classification
+
+# '커스텀' 년도는 사용자가 직접 추가한 과목 (공학인증 검사에서 제외)
+CUSTOM_YEAR = '커스텀'
+
+def fetch_user_info(user_id):
+    """
+    new_user_info 한 행 (속성 접근 가능한 namedtuple). 없으면 LookupError
+    """
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(
+                """
+                SELECT student_id, name, major, year, major_status, book, eng
+                FROM new_user_info
+                WHERE student_id = %s
+                """,
+                (str(user_id),)
+            )
+            row = cursor.fetchone()
+            columns = cursor.column_names
+        finally:
+            cursor.close()
+    if row is None:
+        raise LookupError(f"Unknown student: {user_id}")
+    return namedtuple("UserInfoRow", columns)(*row)
+
+def fetch_user_grades(user_id, columns, exclude_custom=False):
+    """
+    user_grade 에서 columns(영문 컬럼명 -> DataFrame 열 이름)만 읽은 DataFrame
+    exclude_custom 이면 '커스텀' 년도 제외 (Django exclude() 처럼 year 가 NULL 인 행은 포함)
+    """
+    sql = f"SELECT {', '.join(columns)} FROM user_grade WHERE student_id = %s"
+    params = [str(user_id)]
+    if exclude_custom:
+        sql += " AND (year IS NULL OR year <> %s)"
+        params.append(CUSTOM_YEAR)
+    sql += " ORDER BY `index`"
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    return pd.DataFrame(rows, columns=list(columns.values()))
 
 def to_zip_list(list_1, list_2):
     zip_list = []
@@ -13,22 +65,23 @@ def to_zip_list(list_1, list_2):
         zip_list.append([a,b])
     return zip_list
 
-def list_to_query(list_):
-    al = AllLecture.objects.filter(subject_num__in=list_)
-    return list(al.values())
+def list_to_query(list_, index):
+    return index.lecture_rows(list_)
+
+# 아래 함수들의 index 는 database.reference_data 의 ReferenceData 스냅샷
+# (subject_groups: 학수번호 -> 그룹번호, group_subjects: 그룹번호 -> 학수번호들, new_lectures: 개설 학수번호 집합)
 
-def make_dic(my_list):
+def make_dic(my_list, index):
     my_list.sort()
     dic = defaultdict(lambda:-1)
     for s_num in my_list:
         dic[s_num]
         # 필수과목의 동일과목은 sg 테이블에서 1:1로만 담겨잇어야함.
-        sg = SubjectGroup.objects.filter(subject_num = s_num)
-        if sg.exists():
-            dic[s_num] = sg[0].group_num
+        if s_num in index.subject_groups:
+            dic[s_num] = index.subject_groups[s_num]
     return dic
 
-def make_recommend_list(my_dic, dic):
+def make_recommend_list(my_dic, dic, index):
     my_dic_ = my_dic.copy()
     dic_ = dic.copy()
     check = dic.copy()
@@ -56,10 +109,9 @@ def make_recommend_list(my_dic, dic):
     # 추천 리스트 알고리즘
     recommend = []
     for s_num in dic_.keys():
-        nl = NewLecture.objects.filter(subject_num = s_num)
         # 부족 과목이 열리고 있다면
-        if nl.exists():
-            recommend.append(nl[0].subject_num)
+        if s_num in index.new_lectures:
+            recommend.append(s_num)
         # 더이상 열리지 않는다면 -> 그룹번호로 동일과목 찾은 후 열리는 것만 저장
         else:
             g_num = dic_[s_num]
@@ -68,25 +120,25 @@ def make_recommend_list(my_dic, dic):
                 recommend.append(s_num)
             # 아니면 동일과목중 열리고 있는 강의를 찾자
             else:
-                sg = SubjectGroup.objects.filter(group_num = g_num)
-                for s in sg:
-                    nl2 = NewLecture.objects.filter(subject_num = s.subject_num)
-                    if nl2.exists():
-                        recommend.append(nl2[0].subject_num)
+                for same in index.group_subjects.get(g_num, []):
+                    if same in index.new_lectures:
+                        recommend.append(same)
     return recommend, list(check.values())
 
-def add_same_lecture(list_):
+def add_same_lecture(list_, index):
+    # 순회 중에 추가된 과목의 동일과목도 이어서 추가됨
+    seen = set(list_)
     for s_num in list_:
-        sg = SubjectGroup.objects.filter(subject_num = s_num)
-        for s in sg:
-            rows = SubjectGroup.objects.filter(group_num = s.group_num)
-            for r in rows:
-                if r.subject_num not in list_:
-                    list_.append(r.subject_num)
+        if s_num not in index.subject_groups:
+            continue
+        for same in index.group_subjects[index.subject_groups[s_num]]:
+            if same not in seen:
+                seen.add(same)
+                list_.append(same)
     return list_
 
-def make_recommend_list_other(other_, user_lec_list):
-    # 쿼리셋을 리스트로 변환 -> 등장횟수에 따라 내림차순 정렬 
+def make_recommend_list_other(other_, user_lec_list, index):
+    # (학수번호, 등장횟수) 목록 -> 등장횟수에 따라 내림차순 정렬 
     other_ = sorted(list(other_), key = lambda x : x[1], reverse=True)
     # 10개만 추천하기 + 내가 들었던 과목은 제외하기
     recom = []
@@ -95,13 +147,12 @@ def make_recommend_list_other(other_, user_lec_list):
         if len(recom) >= 10:
             break
         # 뉴렉쳐에 있는 최신 학수번호 + 내가 안들은것만 담기 + 과목정보 - 등장횟수 순위 묶어서 저장
-        if NewLecture.objects.filter(subject_num=s_num).exists() and (s_num not in user_lec_list):
+        if s_num in index.new_lectures and (s_num not in user_lec_list):
             # AllLecture에서 이수구분이 맞을때만 리스트에 추가함
-            al_qs = AllLecture.objects.filter(subject_num = s_num, classification__in = ['전필', '전선', '교선1', '교선'])
-            if al_qs.exists():
+            row_dic = index.lectures.get(s_num)
+            if row_dic and row_dic['classification'] in ['전필', '전선', '교선1', '교선']:
                 rank += 1
-                row_dic = list(al_qs.values())
-                recom.append( [row_dic[0], rank] )
+                recom.append( [row_dic, rank] )
     # 학수번호 -> 쿼리셋 -> 모든 정보 리스트로 변환 후 리턴
     return recom
 
@@ -117,24 +168,25 @@ def convert_selection(selection):
 
 # ---------------------------------------------------- (졸업요건 검사 파트) ----------------------------------------------------------------
 
-def f_result(user_id):
+def result(user_id):
+    """
+    저장된 졸업요건 검사 결과가 최신(같은 기준 데이터 + 같은 성적)이면 그대로, 아니면 f_result 로 다시 계산
+    """
+    return cached_audit(user_id, "graduation", f_result)[0]
+
+def f_result(user_id, index=None):
     # userinfo 테이블에서 행 추출
-    ui_row = NewUserInfo.objects.get(student_id = user_id)
+    ui_row = fetch_user_info(user_id)
+    # 기준 테이블 스냅샷 (검사 도중 교체돼도 이 검사는 같은 버전을 봄)
+    index = index or reference_data.get()
     # 사용자 학과정보 불러오기
-    user_major_row = Major.objects.filter(major = ui_row.major)[0]
+    user_major_row = index.major(ui_row.major)
     # user_grade 테이블에서 사용자의 성적표를 DF로 변환하기
-    user_qs = UserGrade.objects.filter(student_id = user_id)
-    data = read_frame(user_qs, fieldnames=['subject_num', 'subject_name', 'classification', 'selection', 'grade'])
-    data.rename(columns = {'subject_num' : '학수번호', 'subject_name' : '교과목명', 'classification' : '이수구분', 'selection' : '선택영역', 'grade' : '학점'}, inplace = True)
+    data = fetch_user_grades(user_id, {'subject_num' : '학수번호', 'subject_name' : '교과목명', 'classification' : '이수구분', 'selection' : '선택영역', 'grade' : '학점'})
     # 이수구분 변경 과목 검사
-    for i, row in data.iterrows():
-        cc_qs = ChangedClassification.objects.filter(year = ui_row.year, subject_num = row["학수번호"])
-        if cc_qs.exists():
-            changed_classifiaction = cc_qs[0].classification
-            if row["이수구분"] != changed_classifiaction:
-                data.at[i, "이수구분"] = changed_classifiaction # df의 해당 행-열 데이터 변경
+    data["이수구분"] = remap_classification(data, index.changed_by_year.get(ui_row.year))
     # 사용자에게 맞는 기준 row 뽑아내기
-    standard_row = Standard.objects.get(user_dep = ui_row.major, user_year = ui_row.year)
+    standard_row = index.standard(ui_row.major, ui_row.year)
 
     # 아래 로직을 거치며 채워질 데이터바인딩용 context 선언
     result_context = {}
@@ -232,7 +284,7 @@ def f_result(user_id):
     if standard_row.major_essential < df_me['학점'].sum() :
         remain = df_me['학점'].sum() - standard_row.major_essential
     # 내가들은 전필 + 전선의 동일과목 학수번호 추가한 리스트
-    user_major_lec = add_same_lecture(df_ms['학수번호'].tolist() + df_me['학수번호'].tolist())
+    user_major_lec = add_same_lecture(df_ms['학수번호'].tolist() + df_me['학수번호'].tolist(), index)
 
     ################################################
     ################### 전필 영역 ###################
@@ -242,8 +294,8 @@ def f_result(user_id):
     user_num_me = df_me['학점'].sum() - remain
     lack_me = standard_num_me - user_num_me
     # 선택추천과목 리스트 생성
-    other_me = UserGrade.objects.exclude(year = '커스텀').filter(major = ui_row.major, classification = '전필').values_list('subject_num').annotate(count=Count('subject_num'))
-    recom_selection_me = make_recommend_list_other(other_me, user_major_lec)
+    other_me = popularity.top(ui_row.major, '전필')
+    recom_selection_me = make_recommend_list_other(other_me, user_major_lec, index)
     # 패스여부 검사
     pass_me = 0
     if standard_num_me <= user_num_me:
@@ -267,8 +319,8 @@ def f_result(user_id):
     user_num_ms = df_ms['학점'].sum()
     lack_ms = standard_num_ms - user_num_ms - remain
     # 선택추천과목 리스트 생성
-    other_ms = UserGrade.objects.exclude(year = '커스텀').filter(major = ui_row.major, classification = '전선').values_list('subject_num').annotate(count=Count('subject_num'))
-    recom_selection_ms = make_recommend_list_other(other_ms, user_major_lec)
+    other_ms = popularity.top(ui_row.major, '전선')
+    recom_selection_ms = make_recommend_list_other(other_ms, user_major_lec, index)
     # 패스여부 검사
     pass_ms = 0
     if standard_num_ms <= user_num_ms + remain:
@@ -290,11 +342,11 @@ def f_result(user_id):
     ################################################
     if ce_exists :
         # 기준필수과목 & 사용자교필과목 추출 => 동일과목 매핑 dict 생성
-        dic_ce = make_dic([s_num for s_num in standard_row.ce_list.split('/')])
-        user_dic_ce = make_dic(data['학수번호'].tolist())  # * 수정 : 교필, 중필 영역만 비교하지 않고 전체를 대상으로 비교
+        dic_ce = make_dic([s_num for s_num in standard_row.ce_list.split('/')], index)
+        user_dic_ce = make_dic(data['학수번호'].tolist(), index)  # * 수정 : 교필, 중필 영역만 비교하지 않고 전체를 대상으로 비교
         # 기준필수과목+체크 & 추천과목 리스트 생성
-        recom_essential_ce, check_ce = make_recommend_list(user_dic_ce, dic_ce)
-        standard_essential_ce = to_zip_list(list_to_query(dic_ce.keys()), check_ce)
+        recom_essential_ce, check_ce = make_recommend_list(user_dic_ce, dic_ce, index)
+        standard_essential_ce = to_zip_list(list_to_query(dic_ce.keys(), index), check_ce)
         # 필수과목, 이수과목 개수 저장
         standard_num_ce = len(dic_ce)
         user_num_ce = sum(check_ce)
@@ -306,7 +358,7 @@ def f_result(user_id):
         context_core_essential = {
             'standard_num' : standard_num_ce,
             'user_num' : convert_to_int(user_num_ce),
-            'recom_essential' : list_to_query(recom_essential_ce),
+            'recom_essential' : list_to_query(recom_essential_ce, index),
             'standard_essential' : standard_essential_ce,
             'pass' : pass_ce,
         }
@@ -324,11 +376,11 @@ def f_result(user_id):
         standard_num_cs = standard_row.core_selection
         user_num_cs = df_cs['학점'].sum()
         # 기준필수과목 & 사용자과목 추출 => 동일과목 매핑 dict 생성
-        dic_cs = make_dic([s_num for s_num in standard_row.cs_list.split('/')])
-        user_dic_cs = make_dic(data['학수번호'].tolist())    # * 수정 : 필수과목은 교선1만 검사하지 않고 모든 학수번호를 대상으로 검사 
+        dic_cs = make_dic([s_num for s_num in standard_row.cs_list.split('/')], index)
+        user_dic_cs = make_dic(data['학수번호'].tolist(), index)    # * 수정 : 필수과목은 교선1만 검사하지 않고 모든 학수번호를 대상으로 검사 
         # 기준필수과목+체크 & 추천과목 리스트 생성
-        recom_essential_cs, check_cs = make_recommend_list(user_dic_cs, dic_cs)
-        standard_essential_cs = to_zip_list(list_to_query(dic_cs.keys()), check_cs)
+        recom_essential_cs, check_cs = make_recommend_list(user_dic_cs, dic_cs, index)
+        standard_essential_cs = to_zip_list(list_to_query(dic_cs.keys(), index), check_cs)
         
         # 인문/예체능대학의 16,17 학번의 소기코 대체과목은 컴기코로 바꿔줌
         if ui_row.year in [16, 17] \
@@ -345,10 +397,10 @@ def f_result(user_id):
             else:
                 recom_essential_cs.append('10528')
 
-        other_cs = UserGrade.objects.exclude(year = '커스텀').filter(classification__in = ['교선1', '중선'])
-        other_cs = other_cs.values_list('subject_num').annotate(count=Count('subject_num'))
+        # 교선은 전공 구분 없이 교선1 + 중선 합산
+        other_cs = popularity.top(None, '교선1', '중선')
         user_cs_lec = df_cs['학수번호'].tolist() + [s_num for s_num in standard_row.cs_list.split('/')]
-        recom_selection_cs = make_recommend_list_other(other_cs, user_cs_lec)
+        recom_selection_cs = make_recommend_list_other(other_cs, user_cs_lec, index)
         # 패스여부 검사 (기준학점, 필수과목, 전체)
         pass_cs_num, pass_cs_ess, pass_cs= 0, 0, 0
         if standard_num_cs <= user_num_cs:
@@ -362,7 +414,7 @@ def f_result(user_id):
         context_core_selection = {
             'standard_num' : standard_num_cs,
             'user_num' : convert_to_int(user_num_cs),
-            'recom_essential' : list_to_query(recom_essential_cs),
+            'recom_essential' : list_to_query(recom_essential_cs, index),
             'standard_essential' : standard_essential_cs,
             'recom_selection' : recom_selection_cs,
             'pass_ess' : pass_cs_ess,
@@ -412,11 +464,7 @@ def f_result(user_id):
         # 과목 추천리스트 생성 -> 부족영역이 있을때만 생성
         recom_la_balance = []
         if lack_la_balance_part:
-            al_qs = AllLecture.objects.filter(
-                classification = '균필', 
-                selection__in = lack_la_balance_part,
-            )
-            recom_la_balance = list(al_qs.values())
+            recom_la_balance = index.lectures_by_classification('균필', lack_la_balance_part)
 
         # 패스여부 검사 (선택영역, 기준학점, 전체)
         pass_la_balance_part, pass_la_balance_num, pass_la_balance= 0, 0, 0
@@ -445,11 +493,11 @@ def f_result(user_id):
     ################################################
     if b_exists :
         # 기준필수과목 & 사용자교필과목 추출 => 동일과목 매핑 dict 생성
-        dic_b = make_dic([s_num for s_num in standard_row.b_list.split('/')])
-        user_dic_b = make_dic(data['학수번호'].tolist())     # * 수정 : 기교 영역만 비교하지 않고 전체를 대상으로 비교
+        dic_b = make_dic([s_num for s_num in standard_row.b_list.split('/')], index)
+        user_dic_b = make_dic(data['학수번호'].tolist(), index)     # * 수정 : 기교 영역만 비교하지 않고 전체를 대상으로 비교
         # 기준필수과목+체크 & 추천과목 리스트 생성
-        recom_essential_b, check_b = make_recommend_list(user_dic_b, dic_b)
-        standard_essential_b = to_zip_list(list_to_query(dic_b.keys()), check_b)
+        recom_essential_b, check_b = make_recommend_list(user_dic_b, dic_b, index)
+        standard_essential_b = to_zip_list(list_to_query(dic_b.keys(), index), check_b)
         # 필수과목, 이수과목 개수 저장
         standard_num_b = len(dic_b)
         user_num_b = sum(check_b)
@@ -461,7 +509,7 @@ def f_result(user_id):
         context_basic = {
             'standard_num' : standard_num_b,
             'user_num' : convert_to_int(user_num_b),
-            'recom_essential' : list_to_query(recom_essential_b),
+            'recom_essential' : list_to_query(recom_essential_b, index),
             'standard_essential' : standard_essential_b,
             'pass' : pass_b,
         }
@@ -481,29 +529,29 @@ def f_result(user_id):
                 data_chemy_A = ['4082', '2647', '2657']     # 고미적1 / 일물실1 / 일생
                 data_chemy_B = ['4300', '2649']             # 고미적 2 / 일물실2
 
-            dic_chemy_A = make_dic(data_chemy_A)
-            recom_chemy_A, check_chemy_A = make_recommend_list(user_dic_b, dic_chemy_A)
-            standard_chemy_A = to_zip_list(list_to_query(dic_chemy_A.keys()), check_chemy_A)
+            dic_chemy_A = make_dic(data_chemy_A, index)
+            recom_chemy_A, check_chemy_A = make_recommend_list(user_dic_b, dic_chemy_A, index)
+            standard_chemy_A = to_zip_list(list_to_query(dic_chemy_A.keys(), index), check_chemy_A)
             pass_chemy_A = 0
             if 1 in check_chemy_A:
                 pass_chemy_A = 1
             else:
                 pass_chemy_all = 0
-                context_basic['recom_chemy_A'] = list_to_query(recom_chemy_A)
+                context_basic['recom_chemy_A'] = list_to_query(recom_chemy_A, index)
             context_basic['standard_chemy_A'] = standard_chemy_A
             context_basic['pass_chemy_A'] = pass_chemy_A
                 
             if data_chemy_B:
                 chemy_B_exists = 1
-                dic_chemy_B = make_dic(data_chemy_B)
-                recom_chemy_B, check_chemy_B = make_recommend_list(user_dic_b, dic_chemy_B)
-                standard_chemy_B = to_zip_list(list_to_query(dic_chemy_B.keys()), check_chemy_B)
+                dic_chemy_B = make_dic(data_chemy_B, index)
+                recom_chemy_B, check_chemy_B = make_recommend_list(user_dic_b, dic_chemy_B, index)
+                standard_chemy_B = to_zip_list(list_to_query(dic_chemy_B.keys(), index), check_chemy_B)
                 pass_chemy_B = 0
                 if 1 in check_chemy_B:
                     pass_chemy_B = 1
                 else:
                     pass_chemy_all = 0
-                    context_basic['recom_chemy_B'] =list_to_query(recom_chemy_B)
+                    context_basic['recom_chemy_B'] =list_to_query(recom_chemy_B, index)
                 context_basic['standard_chemy_B'] = standard_chemy_B
                 context_basic['pass_chemy_B'] = pass_chemy_B
 
@@ -670,9 +718,17 @@ def f_result(user_id):
 
 # ---------------------------------------------------- (공학인증 파트) ----------------------------------------------------------------
 
-def f_en_result(user_id):
+def en_result(user_id):
+    """
+    공학인증 검사 결과 (저장된 결과 재사용 규칙은 result 와 같음)
+    """
+    return cached_audit(user_id, "engineering", f_en_result)[0]
+
+def f_en_result(user_id, index=None):
     # userinfo 테이블에서 행 추출
-    ui_row = NewUserInfo.objects.get(student_id = user_id)
+    ui_row = fetch_user_info(user_id)
+    # 기준 테이블 스냅샷
+    index = index or reference_data.get()
 
     user_info = {
         'id' : ui_row.student_id,
@@ -680,87 +736,52 @@ def f_en_result(user_id):
     }
 
     # 기준 뽑아내기
-    s_row = Standard.objects.get(user_dep = ui_row.major, user_year=ui_row.year)
+    s_row = index.standard(ui_row.major, ui_row.year)
 
     # df 생성
     # user_grade 테이블에서 사용자의 성적표를 DF로 변환하기
-    user_qs = UserGrade.objects.exclude(year = '커스텀').filter(student_id = user_id)
-    data = read_frame(user_qs, fieldnames=['year', 'semester', 'subject_num', 'grade'])
-    data.rename(columns = {'year' : '년도', 'semester' : '학기', 'subject_num' : '학수번호', 'grade' : '학점'}, inplace = True)
+    data = fetch_user_grades(user_id, {'year' : '년도', 'semester' : '학기', 'subject_num' : '학수번호', 'grade' : '학점'}, exclude_custom=True)
 
     # 사용자가 들은 과목리스트 전부를 딕셔너리로.
-    my_engine_admit = make_dic(data['학수번호'].tolist())
+    my_engine_admit = make_dic(data['학수번호'].tolist(), index)
 
     # 1.전문 교양
-    dic_pro = make_dic([s_num for s_num in s_row.pro_ess_list.split('/')])
-    recom_pro, check_pro = make_recommend_list(my_engine_admit, dic_pro)
+    dic_pro = make_dic([s_num for s_num in s_row.pro_ess_list.split('/')], index)
+    recom_pro, check_pro = make_recommend_list(my_engine_admit, dic_pro, index)
     mynum_pro = data[data['학수번호'].isin(dic_pro.keys())]['학점'].sum()
 
     # 2. bsm 필수
-    dic_bsm_ess = make_dic([s_num for s_num in s_row.bsm_ess_list.split('/')])
-    recom_bsm_ess, check_bsm_ess = make_recommend_list(my_engine_admit, dic_bsm_ess)
+    dic_bsm_ess = make_dic([s_num for s_num in s_row.bsm_ess_list.split('/')], index)
+    recom_bsm_ess, check_bsm_ess = make_recommend_list(my_engine_admit, dic_bsm_ess, index)
     mynum_bsm_ess = data[data['학수번호'].isin(dic_bsm_ess.keys())]['학점'].sum()
 
     # 3. bsm 선택 (16학번일때만 해당)
     if s_row.bsm_sel_list:
-        dic_bsm_sel = make_dic([s_num for s_num in s_row.bsm_sel_list.split('/')])
+        dic_bsm_sel = make_dic([s_num for s_num in s_row.bsm_sel_list.split('/')], index)
         mynum_bsm_ess += data[data['학수번호'].isin(dic_bsm_sel.keys())]['학점'].sum()  # bsm 선택 이수학점을 더한다.
 
     # 4. 전공 영역
     # 4-1. 전공 전체 학점
-    dic_eng_major = make_dic([s_num for s_num in s_row.eng_major_list.split('/')])
-    recom_eng_major, check_eng_major =make_recommend_list(my_engine_admit,dic_eng_major)
+    dic_eng_major = make_dic([s_num for s_num in s_row.eng_major_list.split('/')], index)
+    recom_eng_major, check_eng_major =make_recommend_list(my_engine_admit, dic_eng_major, index)
     mynum_eng_major = data[data['학수번호'].isin(dic_eng_major.keys())]['학점'].sum()
 
-    # int화
-    df_e = data[data['학수번호'] == s_row.build_start ]
-    if not df_e.empty:
-        num_df_e = df_e['년도'].sum()
-        num_df_2 = int(df_e['학기'].sum().replace('학기', ''))
-    df_e2 = data[data['학수번호'] == s_row.build_end]
-    num_df_e2 = df_e2['년도'].sum()
-
     # 기초설계 ~ 종합설계 사이의 DF 추출
-    data2 = data
-    n = data2.shape[0]
-    flag = 0
-    while (True):
-        for i in range(n):
-            if i == n - 1:
-                flag = 1
-            if not df_e.empty:
-                if data2['년도'][i] < num_df_e:  # 소설기이전 학기 삭제
-                    data2 = data2.drop(data2.index[i])
-                    n -= 1
-                    data2.reset_index(inplace=True, drop=True)
-                    break
-                elif data2['년도'][i] == num_df_e and data2['학기'][i] == "1학기":
-                    data2 = data2.drop(data2.index[i])
-                    n -= 1
-                    data2.reset_index(inplace=True, drop=True)
-                    break
-            if not df_e2.empty:
-                if data2['년도'][i] > num_df_e2:  # 캡스톤 이후 학기 삭제
-                    data2 = data2.drop(data2.index[i])
-                    n -= 1
-                    data2.reset_index(inplace=True, drop=True)
-                    break
-        if flag == 1:
-            break
+    data2 = design_window(data, s_row.build_start, s_row.build_end)
     # 사용자가 소설기부터 들은 강의의 학수번호 리스트->딕셔너리
-    my_engine_admit2 = make_dic(data2['학수번호'].tolist())
+    my_engine_admit2 = make_dic(data2['학수번호'].tolist(), index)
 
     # 4-2. 기초설계 추천 뽑아내기
-    dic_build_start = make_dic([s_row.build_start])
-    recom_build_start, check_build_start = make_recommend_list(my_engine_admit2, dic_build_start)
+    dic_build_start = make_dic([s_row.build_start], index)
+    recom_build_start, check_build_start = make_recommend_list(my_engine_admit2, dic_build_start, index)
 
     # 4-3. 종합설계 추천 뽑아내기
-    dic_build_end = make_dic([s_row.build_end])
-    recom_build_end, check_build_end = make_recommend_list(my_engine_admit2, dic_build_end)
+    dic_build_end = make_dic([s_row.build_end], index)
+    recom_build_end, check_build_end = make_recommend_list(my_engine_admit2, dic_build_end, index)
 
     # 4-4. 요소설계 과목중 안들은 리스트
-    dic_build_sel = make_dic([s_num for s_num in s_row.build_sel_list.split('/')])
-    recom_build_sel, check_build_sel = make_recommend_list(my_engine_admit2, dic_build_sel)
+    dic_build_sel = make_dic([s_num for s_num in s_row.build_sel_list.split('/')], index)
+    recom_build_sel, check_build_sel = make_recommend_list(my_engine_admit2, dic_build_sel, index)
 
     standard_num ={
         'total' : s_row.sum_eng,                # 공학인증 총학점 기준 
@@ -779,12 +800,12 @@ def f_en_result(user_id):
     }
 
     standard_list = {
-        'pro' : to_zip_list(list_to_query(dic_pro.keys()),check_pro),
-        'bsm_ess' : to_zip_list(list_to_query(dic_bsm_ess.keys()), check_bsm_ess),
+        'pro' : to_zip_list(list_to_query(dic_pro.keys(), index),check_pro),
+        'bsm_ess' : to_zip_list(list_to_query(dic_bsm_ess.keys(), index), check_bsm_ess),
         'bsm_sel' : [],
-        'build_start' : to_zip_list(list_to_query(dic_build_start.keys()),check_build_start),
-        'build_end' : to_zip_list(list_to_query(dic_build_end.keys()),check_build_end),
-        'build_sel' : to_zip_list(list_to_query(dic_build_sel.keys()),check_build_sel),
+        'build_start' : to_zip_list(list_to_query(dic_build_start.keys(), index),check_build_start),
+        'build_end' : to_zip_list(list_to_query(dic_build_end.keys(), index),check_build_end),
+        'build_sel' : to_zip_list(list_to_query(dic_build_sel.keys(), index),check_build_sel),
     }
 
     # 전공영역 추천 과목 중 부족학점만큼 랜덤으로 골라주기
@@ -793,9 +814,9 @@ def f_en_result(user_id):
     recom_eng_major = recom_eng_major[:n//3+1]
 
     recommend = {
-        'pro' : list_to_query(recom_pro),
-        'bsm_ess' : list_to_query(recom_bsm_ess), # bsm 추천시 합쳐서 추천.
-        'eng_major' : list_to_query(recom_eng_major),
+        'pro' : list_to_query(recom_pro, index),
+        'bsm_ess' : list_to_query(recom_bsm_ess, index), # bsm 추천시 합쳐서 추천.
+        'eng_major' : list_to_query(recom_eng_major, index),
     }
 
     # 필수과목 패스 여부
@@ -826,7 +847,7 @@ def f_en_result(user_id):
         if len(recom_bsm_ess) <= 1:
             pass_bsm_sel = 1
         pass_obj['bsm_sel'] = pass_bsm_sel
-        standard_list['bsm_sel'] = list_to_query(dic_bsm_sel.keys())
+        standard_list['bsm_sel'] = list_to_query(dic_bsm_sel.keys(), index)
     
     en_result_context={
         'user_info' : user_info,
@@ -0,0 +1,270 @@
+"""
+학과/학번 단위 졸업요건 일괄 검사 ("컴퓨터공학과 20학번 중 전필 학점이 모자란 학생")
+
+코호트 전체의 성적을 쿼리 한 번으로 읽고, 학생×이수구분 학점 합계를 pandas groupby 한 번으로 구한 뒤
+f_result 와 같은 학점 규칙(전필 초과분은 전선으로, 복수/연계전공은 전필 15 / 전선 24 + 복필/복선(연필/연선) 15 / 24)으로
+영역별 통과 여부를 냅니다. 필수과목 목록 검사(교필/기교 과목 리스트), 고전독서, 영어, 기초교양은 포함하지 않는
+학점 기준 검사라서 total 의 pass 는 f_result 보다 너그러울 수 있습니다.
+
+    python -m views.cohort --major 컴퓨터공학과 --year 20 --short major_essential > short.jsonl
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from views.grade_frame import remap_classification
+
+# 일괄 검사에 쓸 프로세스 수와 프로세스 하나에 넘길 학생 수
+COHORT_WORKERS = int(os.getenv("COHORT_WORKERS", os.cpu_count() or 1))
+COHORT_CHUNK_SIZE = int(os.getenv("COHORT_CHUNK_SIZE", 500))
+# 학생 수가 이보다 적으면 프로세스 풀 없이 요청 스레드에서 바로 계산
+COHORT_PARALLEL_MIN_STUDENTS = int(os.getenv("COHORT_PARALLEL_MIN_STUDENTS", 1000))
+
+# 복수/연계전공 학생의 전공 기준 학점 (f_result 와 동일)
+MULTI_MAJOR_ESSENTIAL = 15
+MULTI_MAJOR_SELECTION = 24
+
+# 복수/연계전공 -> (X필, X선) 이수구분 (f_result 와 동일)
+MULTI_MAJOR_CLASSIFICATIONS = {
+    "복수전공": ("복필", "복선"),
+    "연계전공": ("연필", "연선"),
+}
+
+# 결과 영역 -> (이수구분 목록, Standard 기준 컬럼)
+CREDIT_AREAS = {
+    "core_selection": (("교선1", "중선"), "core_selection"),
+    "la_balance": (("균필",), "la_balance"),
+}
+# --short 로 고를 수 있는 영역
+AUDIT_AREAS = {"major_essential", "major_selection", "multi_major_essential", "multi_major_selection",
+               "total", *CREDIT_AREAS}
+
+COHORT_SQL = """
+    SELECT u.student_id, u.name, u.major_status,
+           g.subject_num, g.classification, g.grade
+    FROM new_user_info u
+    LEFT JOIN user_grade g ON g.student_id = u.student_id
+    WHERE u.major = %s AND u.year = %s
+    ORDER BY u.student_id
+"""
+COHORT_COLUMNS = ["student_id", "name", "major_status", "학수번호", "이수구분", "학점"]
+
+
+def fetch_cohort(major, year):
+    """
+    코호트 학생 정보 + 성적 전체를 한 번에 읽은 DataFrame (성적이 없는 학생은 학수번호가 NaN 인 한 줄)
+    """
+    from database.connect import pooled_connection
+
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(COHORT_SQL, (major, year))
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    frame = pd.DataFrame(rows, columns=COHORT_COLUMNS)
+    frame["학점"] = pd.to_numeric(frame["학점"], errors="coerce").fillna(0.0)
+    return frame
+
+
+def load_cohort(major, year):
+    """
+    (성적 DataFrame, Standard 행 dict, 이수구분 변경 dict). 기준이 없으면 LookupError
+    """
+    from database.reference_data import reference_data
+
+    reference = reference_data.get()
+    standard = reference.standard(major, year)._asdict()
+    changed = reference.changed_by_year.get(int(year), {})
+    return fetch_cohort(major, year), standard, changed
+
+
+def _num(value):
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def _area(standard_num, user_num, passed, **extra):
+    area = {"standard_num": _num(standard_num), "user_num": _num(user_num)}
+    area.update({key: _num(value) for key, value in extra.items()})
+    area["pass"] = int(passed)
+    return area
+
+
+def summarize(frame, standard, changed):
+    """
+    코호트(또는 그 일부) DataFrame 의 학생별 학점 검사 결과 dict 리스트 (student_id 순)
+    """
+    students = frame.drop_duplicates("student_id").set_index("student_id")[["name", "major_status"]]
+    grades = frame[frame["학수번호"].notna()].copy()
+    grades["이수구분"] = remap_classification(grades, changed)
+    credits = (
+        grades.groupby(["student_id", "이수구분"])["학점"].sum()
+        .unstack(fill_value=0.0)
+        .reindex(students.index, fill_value=0.0)
+    )
+
+    def total(*classifications):
+        present = [c for c in classifications if c in credits.columns]
+        return credits[present].sum(axis=1) if present else pd.Series(0.0, index=credits.index)
+
+    multi = (students["major_status"] != "해당없음").to_numpy()
+    standard_me = np.where(multi, MULTI_MAJOR_ESSENTIAL, standard["major_essential"])
+    standard_ms = np.where(multi, MULTI_MAJOR_SELECTION, standard["major_selection"])
+    me = total("전필").to_numpy()
+    ms = total("전선").to_numpy()
+    remain = np.clip(me - standard_me, 0, None)
+    user_me = me - remain
+    # f_result 는 복수/연계전공 학생도 전필 pass/lack 을 학과 기준(major_essential) 초과분만 뺀 전필 학점으로 계산함
+    checked_me = me - np.clip(me - standard["major_essential"], 0, None)
+    all_credits = credits.sum(axis=1).to_numpy()
+
+    area_sums = {
+        name: total(*classifications).to_numpy()
+        for name, (classifications, column) in CREDIT_AREAS.items()
+        if standard.get(column)
+    }
+    multi_sums = {
+        status: (total(essential).to_numpy(), total(selection).to_numpy())
+        for status, (essential, selection) in MULTI_MAJOR_CLASSIFICATIONS.items()
+    }
+
+    results = []
+    for i, (student_id, info) in enumerate(students.iterrows()):
+        result = {
+            "student_id": student_id,
+            "name": info["name"],
+            "major_status": info["major_status"],
+            "major_essential": _area(standard_me[i], user_me[i], standard_me[i] <= checked_me[i],
+                                     lack=standard_me[i] - checked_me[i]),
+            "major_selection": _area(standard_ms[i], ms[i], standard_ms[i] <= ms[i] + remain[i],
+                                     remain=remain[i], lack=standard_ms[i] - ms[i] - remain[i]),
+        }
+        if info["major_status"] in multi_sums:
+            # X필 초과분은 X선으로 (f_result 의 multi_major_essential / multi_major_selection)
+            multi_me, multi_ms = (sums[i] for sums in multi_sums[info["major_status"]])
+            multi_remain = max(multi_me - MULTI_MAJOR_ESSENTIAL, 0)
+            result["multi_major_essential"] = _area(MULTI_MAJOR_ESSENTIAL, multi_me - multi_remain,
+                                                    MULTI_MAJOR_ESSENTIAL <= multi_me - multi_remain)
+            result["multi_major_selection"] = _area(MULTI_MAJOR_SELECTION, multi_ms,
+                                                    MULTI_MAJOR_SELECTION <= multi_ms + multi_remain,
+                                                    remain=multi_remain)
+        for name, sums in area_sums.items():
+            standard_num = standard[CREDIT_AREAS[name][1]]
+            result[name] = _area(standard_num, sums[i], standard_num <= sums[i], lack=standard_num - sums[i])
+        credit_pass = all(area["pass"] for key, area in result.items() if isinstance(area, dict))
+        result["total"] = _area(standard["sum_score"], all_credits[i],
+                                credit_pass and standard["sum_score"] <= all_credits[i])
+        results.append(result)
+    return results
+
+
+def split_students(frame, chunk_size):
+    """
+    학생 단위로 자른 DataFrame 목록 (한 학생의 성적이 두 조각으로 나뉘지 않음)
+    """
+    ids = frame["student_id"].drop_duplicates().to_numpy()
+    chunks = []
+    for start in range(0, len(ids), chunk_size):
+        chunks.append(frame[frame["student_id"].isin(ids[start:start + chunk_size])])
+    return chunks
+
+
+def _summarize_chunk(frame, standard, changed):
+    return summarize(frame, standard, changed)
+
+
+class CohortWorkers:
+    """
+    코호트 검사용 프로세스 풀. 요청마다 프로세스를 띄우지 않도록 서버에서는 하나를 만들어 두고 lifespan 에서 닫습니다.
+    풀은 처음 필요할 때 띄우고, 학생 수가 min_students 보다 적으면 IPC 비용이 더 커서 풀 없이 바로 계산합니다.
+    기준(standard, changed)은 요청마다 다를 수 있어 조각과 함께 넘깁니다.
+    """
+
+    def __init__(self, workers=COHORT_WORKERS, chunk_size=COHORT_CHUNK_SIZE, min_students=COHORT_PARALLEL_MIN_STUDENTS):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.min_students = min_students
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # 요청 스레드가 여럿 도는 서버 프로세스를 fork 하지 않도록 spawn
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    def audit(self, frame, standard, changed):
+        """
+        학생별 결과를 student_id 순서로 하나씩 내보내는 generator
+        """
+        chunks = split_students(frame, self.chunk_size)
+        students = frame["student_id"].nunique()
+        if self.workers <= 1 or len(chunks) <= 1 or students < self.min_students:
+            for chunk in chunks:
+                yield from summarize(chunk, standard, changed)
+            return
+
+        parts = self._get_executor().map(
+            _summarize_chunk, chunks, itertools.repeat(standard), itertools.repeat(changed))
+        for part in parts:
+            yield from part
+
+
+def audit_cohort(frame, standard, changed, workers=COHORT_WORKERS, chunk_size=COHORT_CHUNK_SIZE, min_students=0):
+    """
+    한 번만 돌리는 스크립트용. 풀을 만들어 쓰고 끝나면 닫음 (서버는 CohortWorkers 를 재사용)
+    """
+    pool = CohortWorkers(workers, chunk_size, min_students)
+    try:
+        yield from pool.audit(frame, standard, changed)
+    finally:
+        pool.shutdown()
+
+
+def is_short(result, area):
+    return area in result and not result[area]["pass"]
+
+
+def iter_jsonl(results, short=None):
+    for result in results:
+        if short is None or is_short(result, short):
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--major", required=True)
+    parser.add_argument("--year", type=int, required=True, help="학번 년도 (예: 20)")
+    parser.add_argument("--short", help="이 영역을 통과하지 못한 학생만 출력 (major_essential, major_selection, ...)")
+    parser.add_argument("--workers", type=int, default=COHORT_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=COHORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    frame, standard, changed = load_cohort(args.major, args.year)
+    results = audit_cohort(frame, standard, changed, workers=args.workers, chunk_size=args.chunk_size)
+    for line in iter_jsonl(results, args.short):
+        sys.stdout.write(line)
+
+
+if __name__ == "__main__":
+    main()
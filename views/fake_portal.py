@@ -0,0 +1,71 @@
+"""
+오프라인 개발/테스트용 가짜 대양휴머니티칼리지 포털 (PORTAL_FAKE=1)
+
+sejong_univ_auth 의 auth(id=..., password=..., methods=ClassicSession) 와 같은 모양의 결과를 돌려줍니다.
+계정은 PORTAL_FAKE_ACCOUNTS (JSON 파일: {학번: {"password", "name", "major", "status", "read_certification"}})
+또는 아래 기본 계정을 쓰고, PORTAL_FAKE_DELAY_MS 로 포털 응답 지연을 흉내 낼 수 있습니다.
+"""
+import json
+import os
+import threading
+import time
+
+PORTAL_FAKE_ACCOUNTS = os.getenv("PORTAL_FAKE_ACCOUNTS")
+PORTAL_FAKE_DELAY_MS = float(os.getenv("PORTAL_FAKE_DELAY_MS", 0))
+
+DEFAULT_ACCOUNTS = {
+    "20011234": {
+        "password": "password",
+        "name": "홍길동",
+        "major": "컴퓨터공학과",
+        "status": "인증",
+        "read_certification": {"서양의 역사와 사상": "4 권", "동양의 역사와 사상": "2 권",
+                               "동·서양의 문학": "3 권", "과학 사상": "1 권"},
+    },
+    "19015678": {
+        "password": "password",
+        "name": "김세종",
+        "major": "소프트웨어학과",
+        "status": "대체이수",
+        "read_certification": {},
+    },
+}
+
+
+class ClassicSession:
+    pass
+
+
+class FakeAuthResult:
+    def __init__(self, status_code, is_auth, body):
+        self.status_code = status_code
+        self.is_auth = is_auth
+        self.body = body
+
+
+def load_accounts(path=PORTAL_FAKE_ACCOUNTS):
+    if not path:
+        return DEFAULT_ACCOUNTS
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+_accounts = None
+_lock = threading.Lock()
+calls = 0  # 포털 호출 횟수 (캐시/중복 제거 확인용)
+
+
+def auth(id, password, methods=ClassicSession):
+    global _accounts, calls
+    with _lock:
+        if _accounts is None:
+            _accounts = load_accounts()
+        calls += 1
+    if PORTAL_FAKE_DELAY_MS:
+        time.sleep(PORTAL_FAKE_DELAY_MS / 1000)
+
+    account = _accounts.get(str(id))
+    if account is None or account.get("password") != password:
+        return FakeAuthResult(200, False, {})
+    body = {key: value for key, value in account.items() if key != "password"}
+    return FakeAuthResult(200, True, body)
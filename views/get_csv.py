@@ -1,61 +1,130 @@
+import os
 import pandas as pd
 from fastapi import HTTPException
-from typing import Union
-from io import BytesIO
+from typing import Iterator, Union
 from fastapi import UploadFile
+from openpyxl import load_workbook
 
-def read_excel_from_file(file: UploadFile, sheet_name: Union[str, None] = None):
+# 업로드 가능한 엑셀 파일 최대 크기 (기본 5MB)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", 5 * 1024 * 1024))
+
+# 성적표 열 이름 (엑셀의 열 순서와 동일)
+TRANSCRIPT_COLUMNS = [
+    "학기순번",      # 기이수성적
+    "년도",          # Unnamed: 1
+    "학기",          # Unnamed: 2
+    "과목코드",       # Unnamed: 3
+    "과목명",        # Unnamed: 4
+    "이수구분",       # Unnamed: 5
+    "비고1",         # Unnamed: 6
+    "비고2",         # Unnamed: 7
+    "학점",          # Unnamed: 8
+    "성적유형",       # Unnamed: 9
+    "성적등급",       # Unnamed: 10
+    "평점",          # Unnamed: 11
+    "학과코드"       # Unnamed: 12
+]
+
+# 성적 행 앞의 행 수: 제목 1행(pandas 에서는 header) + 머리말 3행
+TRANSCRIPT_SKIP_ROWS = 1 + 3
+
+def _check_upload_size(file: UploadFile, max_bytes: int):
+    """
+    업로드 파일 크기가 max_bytes 를 넘으면 413
+    """
+    stream = file.file
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    if size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"File too large ({size} bytes). Limit is {max_bytes} bytes.")
+
+
+def _is_blank(value):
+    # openpyxl 은 빈 칸을 None, pandas(xlrd) 는 NaN 으로 줌
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _clean_cell(value):
+    # 예전 pandas 파서의 fillna('').replace(inf, 0) 과 같은 정리
+    if value is None:
+        return ''
+    if isinstance(value, float) and value in (float('inf'), float('-inf')):
+        return 0
+    return value
+
+
+def _xlsx_rows(file: UploadFile, sheet_name: Union[str, None]):
     """
-    업로드된 엑셀 파일을 읽어 지정된 시트를 처리한 후 JSON 형식으로 데이터를 반환합니다.
-    시트 이름이 지정되지 않은 경우 첫 번째 시트만 반환합니다.
+    .xlsx: openpyxl read-only 모드로 머리말 뒤의 행 값 tuple 을 하나씩
     """
     try:
-        # 엑셀 파일을 데이터프레임으로 읽기
-        excel_data = pd.read_excel(BytesIO(file.file.read()), sheet_name=sheet_name)
-        
-        # Excel 데이터를 DataFrame으로 로드했는지 확인
-        if isinstance(excel_data, dict):
-            # 여러 시트가 있는 경우 Excel 데이터는 dict로 반환될 수 있음
-            if sheet_name is not None:
-                # 특정 시트를 지정한 경우, 해당 시트의 DataFrame을 가져오기
-                df = excel_data.get(sheet_name)
-                if df is None:
-                    raise ValueError("지정한 시트 이름을 찾을 수 없습니다.")
-            else:
-                # 시트 이름을 지정하지 않은 경우 첫 번째 시트를 선택
-                first_sheet_name = list(excel_data.keys())[0]
-                df = excel_data[first_sheet_name]
+        workbook = load_workbook(file.file, read_only=True, data_only=True)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Unreadable Excel file: {e}")
+
+    try:
+        if sheet_name is not None:
+            if sheet_name not in workbook.sheetnames:
+                raise HTTPException(status_code=400, detail="지정한 시트 이름을 찾을 수 없습니다.")
+            sheet = workbook[sheet_name]
         else:
-            # 단일 시트만 있는 경우 직접 DataFrame으로 반환됨
-            df = excel_data
-
-        # 컬럼 이름 변경
-        df.columns = [
-            "학기순번",      # 기이수성적
-            "년도",          # Unnamed: 1
-            "학기",          # Unnamed: 2
-            "과목코드",       # Unnamed: 3
-            "과목명",        # Unnamed: 4
-            "이수구분",       # Unnamed: 5
-            "비고1",         # Unnamed: 6
-            "비고2",         # Unnamed: 7
-            "학점",          # Unnamed: 8
-            "성적유형",       # Unnamed: 9
-            "성적등급",       # Unnamed: 10
-            "평점",          # Unnamed: 11
-            "학과코드"       # Unnamed: 12
-        ]
-        
-        # NaN 및 무한대 값을 처리
-        df = df.fillna('').replace([float('inf'), float('-inf')], 0)
-        
-        # JSON으로 변환
-        data = df.to_dict(orient="records")
-        print(data)
-        return data
+            sheet = workbook.worksheets[0]
+        yield from sheet.iter_rows(min_row=TRANSCRIPT_SKIP_ROWS + 1, values_only=True)
+    finally:
+        workbook.close()
+
 
+def _xls_rows(file: UploadFile, sheet_name: Union[str, None]):
+    """
+    .xls (BIFF): openpyxl 이 읽지 못하므로 이전처럼 pandas + xlrd 로 읽어 같은 모양의 tuple 로
+    """
+    try:
+        frame = pd.read_excel(
+            file.file, sheet_name=sheet_name or 0, header=None, skiprows=TRANSCRIPT_SKIP_ROWS,
+            dtype=object, engine="xlrd",
+        )
+    except ImportError:
+        raise HTTPException(status_code=400, detail=".xls files need the xlrd package on the server. Please upload .xlsx.")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=400, detail=f"Unreadable Excel file: {e}")
+    yield from frame.astype(object).itertuples(index=False, name=None)
+
+
+def iter_transcript_rows(file: UploadFile, sheet_name: Union[str, None] = None,
+                         max_bytes: int = MAX_UPLOAD_BYTES) -> Iterator[dict]:
+    """
+    업로드된 성적표 엑셀을 한 행씩 읽어 검증된 dict 로 돌려줍니다.
+    .xlsx 는 openpyxl read-only 모드로 파일 전체를 DataFrame 이나 리스트로 만들지 않고, .xls 는 xlrd 로 읽습니다.
+    제목/머리말 행은 건너뛰고, 시트 이름이 지정되지 않은 경우 첫 번째 시트를 읽습니다.
+    """
+    _check_upload_size(file, max_bytes)
+    if (getattr(file, "filename", None) or "").lower().endswith(".xls"):
+        rows = _xls_rows(file, sheet_name)
+    else:
+        rows = _xlsx_rows(file, sheet_name)
+
+    width = len(TRANSCRIPT_COLUMNS)
+    for row_number, values in enumerate(rows, start=TRANSCRIPT_SKIP_ROWS + 1):
+        values = tuple(None if _is_blank(v) else v for v in values)
+        # 빈 행은 건너뜀
+        if all(v is None for v in values):
+            continue
+        if any(v is not None for v in values[width:]):
+            raise HTTPException(status_code=400, detail=f"Row {row_number}: expected {width} columns.")
+        values = tuple(values[:width]) + (None,) * (width - len(values))
 
+        row = {column: _clean_cell(value) for column, value in zip(TRANSCRIPT_COLUMNS, values)}
+        if row["과목코드"] == '' or row["과목명"] == '':
+            raise HTTPException(status_code=400, detail=f"Row {row_number}: 과목코드/과목명 is empty.")
+        if isinstance(row["학점"], str) and not row["학점"].strip():
+            # 학점 칸이 비어 있으면 예전 pandas 파서처럼 0 으로 저장
+            row["학점"] = 0
+        elif not isinstance(row["학점"], (int, float)):
+            try:
+                row["학점"] = float(row["학점"])
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Row {row_number}: 학점 must be a number.")
+        yield row
@@ -0,0 +1,36 @@
+"""
+졸업요건 검사에서 쓰는 성적표 DataFrame 가공 함수 (ORM 없이 pandas 만 사용)
+"""
+import pandas as pd
+
+
+def remap_classification(data, changed):
+    """
+    이수구분이 바뀐 과목(changed: 학수번호 -> 바뀐 이수구분)을 반영한 이수구분 Series 반환.
+    changed 에 없는 과목은 원래 이수구분 그대로
+    """
+    if not changed:
+        return data["이수구분"]
+    return data["학수번호"].map(changed).fillna(data["이수구분"])
+
+
+def design_window(data, build_start, build_end):
+    """
+    공학인증 설계 과목 검사용: 기초설계(build_start)부터 종합설계(build_end)까지 들은 행만 남긴 DataFrame.
+
+    - 기초설계를 들은 년도보다 앞 학기, 그리고 같은 년도의 1학기는 제외
+    - 종합설계를 들은 년도보다 뒤 학기는 제외
+    - 성적표에 없는 과목 쪽 조건은 적용하지 않음
+
+    (년도, 학기) 조건을 한 번에 마스크로 만들어 거르므로 행 수에 선형입니다.
+    재수강으로 같은 과목이 여러 번 있으면 기존 코드처럼 년도 값을 sum() 한 것과 비교합니다.
+    """
+    keep = pd.Series(True, index=data.index)
+    start = data[data['학수번호'] == build_start]
+    if not start.empty:
+        start_year = start['년도'].sum()
+        keep &= ~((data['년도'] < start_year) | ((data['년도'] == start_year) & (data['학기'] == "1학기")))
+    end = data[data['학수번호'] == build_end]
+    if not end.empty:
+        keep &= ~(data['년도'] > end['년도'].sum())
+    return data[keep].reset_index(drop=True)
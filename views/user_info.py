@@ -1,7 +1,29 @@
-from sejong_univ_auth import auth, ClassicSession
+import asyncio
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel
 from fastapi import HTTPException
-from database.connect import get_db_connection
+from fastapi.concurrency import run_in_threadpool
+from metrics import timed_call
+
+# 포털 로그인 결과(이름/전공/고전독서)를 메모리에 두는 시간(초)과 최대 학생 수
+PORTAL_CACHE_TTL = float(os.getenv("PORTAL_CACHE_TTL", 600))
+PORTAL_CACHE_MAX_USERS = int(os.getenv("PORTAL_CACHE_MAX_USERS", 5000))
+# 포털 응답을 기다리는 최대 시간(초)과 포털 호출 전용 스레드 수
+PORTAL_TIMEOUT = float(os.getenv("PORTAL_TIMEOUT", 10))
+PORTAL_WORKERS = int(os.getenv("PORTAL_WORKERS", 8))
+# 캐시에 저장하는 비밀번호 해시(PBKDF2-SHA256) 반복 횟수
+PORTAL_HASH_ITERATIONS = int(os.getenv("PORTAL_HASH_ITERATIONS", 200_000))
+# 1 이면 실제 포털 대신 views/fake_portal.py 사용 (오프라인 개발/테스트)
+PORTAL_FAKE = os.getenv("PORTAL_FAKE", "").lower() in ("1", "true", "yes", "on")
+
+
 # Pydantic 모델 정의
 class UserInfoResponse(BaseModel):
     id: str
@@ -9,11 +31,20 @@ class UserInfoResponse(BaseModel):
     major: str
     book: str
 
+
+def _portal():
+    if PORTAL_FAKE:
+        from views import fake_portal as portal
+    else:
+        import sejong_univ_auth as portal
+    return portal
+
+
 # 사용자 정보를 반환하는 함수
 def get_user_info(id: str, pw: str) -> dict:
-    connection = get_db_connection()
-    cursor = connection.cursor()
-    res = auth(id=id, password=pw, methods=ClassicSession)
+    portal = _portal()
+    with timed_call("portal_auth"):
+        res = portal.auth(id=id, password=pw, methods=portal.ClassicSession)
 
     # 대휴칼 사이트 오류
     if res.status_code != 200:
@@ -26,7 +57,7 @@ def get_user_info(id: str, pw: str) -> dict:
     # 사용자 정보
     name = res.body["name"]
     major = res.body["major"]
-    
+
     # 고전독서 인증현황
     status = res.body["status"]
     if status == "대체이수":
@@ -44,3 +75,107 @@ def get_user_info(id: str, pw: str) -> dict:
         "book": book
     }
 
+
+def hash_password(password, salt, iterations=PORTAL_HASH_ITERATIONS):
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+
+
+class PortalLoginCache:
+    """
+    학번 -> (저장 시각, salt, 비밀번호 해시, 사용자 정보).
+    TTL 안에 같은 비밀번호로 다시 로그인하면 포털에 가지 않고 해시만 비교합니다.
+    비밀번호가 다르거나 TTL 이 지났으면 포털에 다시 로그인하고, 같은 학번+비밀번호로 동시에 들어온 로그인은
+    포털 호출 한 번을 같이 기다립니다. 포털 호출은 전용 스레드에서 돌고 PORTAL_TIMEOUT 이 지나면 504.
+
+    sejong_univ_auth 호출은 중간에 멈출 수 없어서, 504 를 돌려준 뒤에도 그 스레드는 포털이 응답할 때까지 붙잡혀
+    있습니다. 스레드 수는 workers 개로 고정이고, 붙잡힌 스레드가 workers 개가 되면 새 로그인은 줄 서서 기다리지 않고
+    바로 503 을 받습니다 (포털이 응답하면 자동으로 풀림).
+    """
+
+    def __init__(self, ttl=PORTAL_CACHE_TTL, max_users=PORTAL_CACHE_MAX_USERS, timeout=PORTAL_TIMEOUT,
+                 iterations=PORTAL_HASH_ITERATIONS, fetch=get_user_info, workers=PORTAL_WORKERS):
+        self.ttl = ttl
+        self.max_users = max_users
+        self.timeout = timeout
+        self.iterations = iterations
+        self.fetch = fetch
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="portal")
+        self._abandoned = 0  # 시간 초과로 504 를 돌려줬지만 아직 포털을 기다리는 스레드 수
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight = {}  # (학번, 비밀번호 HMAC) -> asyncio.Task (이벤트 루프 스레드에서만 사용)
+        self._key_secret = secrets.token_bytes(32)
+
+    def _lookup(self, student_id):
+        with self._lock:
+            entry = self._entries.get(student_id)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(student_id)
+                return entry
+            return None
+
+    def _store(self, student_id, salt, digest, profile):
+        with self._lock:
+            self._entries[student_id] = (time.monotonic(), salt, digest, profile)
+            self._entries.move_to_end(student_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def _matches(self, entry, password):
+        _, salt, digest, _ = entry
+        return hmac.compare_digest(hash_password(password, salt, self.iterations), digest)
+
+    async def login(self, student_id, password):
+        """
+        포털 로그인 결과 dict (get_user_info 와 같음). 실패하면 get_user_info 와 같은 HTTPException
+        """
+        student_id = str(student_id)
+        entry = self._lookup(student_id)
+        if entry is not None and await run_in_threadpool(self._matches, entry, password):
+            return dict(entry[3])
+
+        key = (student_id, hmac.new(self._key_secret, password.encode("utf-8"), hashlib.sha256).digest())
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._login_portal(student_id, password))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        # 기다리던 요청 하나가 취소돼도 같이 기다리는 다른 요청의 포털 호출은 계속
+        return dict(await asyncio.shield(task))
+
+    def _finish(self, key, task):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # 기다리는 요청이 모두 끊긴 경우 "never retrieved" 경고 방지
+
+    def _release_abandoned(self, future):
+        with self._lock:
+            self._abandoned -= 1
+
+    async def _login_portal(self, student_id, password):
+        with self._lock:
+            stuck = self._abandoned >= self.workers
+        if stuck:
+            raise HTTPException(status_code=503, detail="University portal is not responding. Try again later.")
+
+        future = self._executor.submit(self.fetch, student_id, password)
+        try:
+            profile = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            # 아직 시작 전이면 취소되고(바로 풀림), 돌고 있으면 포털이 응답할 때 풀림
+            with self._lock:
+                self._abandoned += 1
+            future.add_done_callback(self._release_abandoned)
+            raise HTTPException(status_code=504, detail="University portal did not respond in time")
+        salt = os.urandom(16)
+        digest = await run_in_threadpool(hash_password, password, salt, self.iterations)
+        self._store(student_id, salt, digest, profile)
+        return profile
+
+    def invalidate(self, student_id):
+        with self._lock:
+            self._entries.pop(str(student_id), None)
+
+
+portal_logins = PortalLoginCache()